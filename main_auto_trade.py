@@ -22,7 +22,6 @@ from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 import yaml
-from pymongo import MongoClient
 import pandas as pd
 import json
 
@@ -35,10 +34,12 @@ project_root = Path(__file__).parent
 sys.path.append(str(project_root))
 
 # Project Layer imports
+from project.database.symbol_directory import get_symbol_directory, DEFAULT_REFRESH_INTERVAL
 from project.indicator.data_frame_generator import DataFrameGenerator
 from project.strategy.signal_generation_service import SignalGenerationService
 from project.strategy.position_manager import PositionManager  # 포지션 관리 (손절가, 트레일링 스탑)
 from project.service.daily_backtest_service import DailyBacktestService, BacktestConfig
+from project.service.backtest_profiler import format_profile
 from project.service.staged_pipeline_service import StagedPipelineService
 from project.service.live_price_service import LivePriceService
 from project.ui.realtime_display import RealTimeDisplay
@@ -384,39 +385,27 @@ async def get_symbols_from_mongodb(config: dict, mode: str = 'FULL', randomize:
     Returns:
         심볼 리스트
     """
-    from pymongo import MongoClient
     import random
 
-    mongodb_config = {
-        'host': config.get('MONGODB_LOCAL', 'localhost'),
-        'port': config.get('MONGODB_PORT', 27017),
-        'username': config.get('MONGODB_ID', 'admin'),
-        'password': config.get('MONGODB_PW', 'wlsaud07')
-    }
-
-    client = MongoClient(
-        f"mongodb://{mongodb_config['username']}:{mongodb_config['password']}@"
-        f"{mongodb_config['host']}:{mongodb_config['port']}/"
-    )
-
-    # NASDAQ + NYSE 종목 (컬렉션 이름 = 심볼)
+    # NASDAQ + NYSE 일봉 보유 종목 (종목 디렉토리 파일, 갱신은 symbol_directory refresh CLI 담당)
     print(f"\nLoading symbols in {mode} mode...")
-    nasdaq_collections = client['NasDataBase_D'].list_collection_names()
-    nyse_collections = client['NysDataBase_D'].list_collection_names()
-
-    # 컬렉션 이름 = 심볼 (A prefix 없음)
-    # 빈 문자열과 시스템 컬렉션 제외
-    nasdaq_symbols = [col for col in nasdaq_collections if col and not col.startswith('_')]
-    nyse_symbols = [col for col in nyse_collections if col and not col.startswith('_')]
-
-    all_symbols = list(set(nasdaq_symbols + nyse_symbols))
+    directory = get_symbol_directory()
+    if directory.refreshed_at is None:
+        # 디렉토리 파일이 아직 없으면 한 번 생성
+        directory.refresh()
+    elif directory.age() > DEFAULT_REFRESH_INTERVAL:
+        print(f"  [WARNING] Symbol directory is {directory.age() / 3600:.1f}h old - "
+              f"run 'python -m project.database.symbol_directory refresh'")
+    nasdaq_symbols = directory.symbols(exchanges=['NAS'])
+    nyse_symbols = directory.symbols(exchanges=['NYS'])
+
+    # 종목마다 거래소 하나 → 중복 없음, 정렬 순서라 seed 샘플링이 재현 가능
+    all_symbols = nasdaq_symbols + nyse_symbols
 
     print(f"  NASDAQ: {len(nasdaq_symbols)} symbols")
     print(f"  NYSE: {len(nyse_symbols)} symbols")
     print(f"  Total unique: {len(all_symbols)} symbols")
 
-    client.close()
-
     if mode == 'LIMITED':
         limited_count = 500
 
@@ -879,6 +868,10 @@ async def run_backtest_staged(
             backtest_config.slippage = 0.002
             backtest_config.message_output = True  # 날짜별 상세 출력 활성화
             backtest_config.enable_whipsaw = False  # WHIPSAW 비활성화 (테스트용)
+            # 단계별 실행 시간 계측 (BACKTEST_PROFILE_ALLOCATIONS: 할당 블록 수도 기록)
+            global_settings = config.get('global_settings', {})
+            backtest_config.enable_profiling = global_settings.get('BACKTEST_PROFILE', False)
+            backtest_config.profile_allocations = global_settings.get('BACKTEST_PROFILE_ALLOCATIONS', False)
 
             print(f"\n백테스트 설정:")
             print(f"  - 초기 자본: ${initial_cash:,.0f} = ${backtest_config.initial_cash:.2f}M")
@@ -934,6 +927,10 @@ async def run_backtest_staged(
         print(f"\n[실행 정보]")
         print(f"  실행 시간: {backtest_results.execution_time:.2f}초")
 
+        if backtest_results.profile:
+            print("\n[단계별 실행 시간]")
+            print(format_profile(backtest_results.profile, backtest_results.execution_time))
+
         # Report Agent를 통한 백테스트 대시보드 생성 (Option 1)
         try:
             print("\n[Report Agent] 백테스트 대시보드 생성 중...")
@@ -1146,33 +1143,20 @@ async def check_single_symbol_signal(symbol: str, config: dict):
         # 1. MongoDB에서 종목이 어느 마켓에 있는지 확인
         print(f"\n[1/4] {symbol} 마켓 확인 중...")
 
-        mongodb_config = {
-            'host': config.get('MONGODB_LOCAL', 'localhost'),
-            'port': config.get('MONGODB_PORT', 27017),
-            'username': config.get('MONGODB_ID', 'admin'),
-            'password': config.get('MONGODB_PW', 'wlsaud07')
-        }
-
-        client = MongoClient(
-            f"mongodb://{mongodb_config['username']}:{mongodb_config['password']}@"
-            f"{mongodb_config['host']}:{mongodb_config['port']}/"
-        )
-
-        # NASDAQ과 NYSE에서 종목 검색
+        # 종목 디렉토리에서 NASDAQ/NYSE 일봉 DB 확인
         market_found = None
         market_code = None
 
-        if symbol in client['NasDataBase_D'].list_collection_names():
+        daily_database = get_symbol_directory().database(symbol, 'D')
+        if daily_database == 'NasDataBase_D':
             market_found = 'NASDAQ'
             market_code = 'NAS'  # Correct market code for database queries
             print(f"   -> {symbol} found in NASDAQ market")
-        elif symbol in client['NysDataBase_D'].list_collection_names():
+        elif daily_database == 'NysDataBase_D':
             market_found = 'NYSE'
             market_code = 'NYS'  # Correct market code for database queries
             print(f"   -> {symbol} found in NYSE market")
 
-        client.close()
-
         if not market_found:
             print(f"[ERROR] {symbol} not found in NASDAQ or NYSE databases")
             return None
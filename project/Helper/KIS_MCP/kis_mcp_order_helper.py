@@ -13,6 +13,11 @@ import requests
 from typing import Dict, Any, Optional
 from datetime import datetime
 
+try:
+    from project.database.symbol_directory import lookup_kis_exchange
+except ImportError:
+    lookup_kis_exchange = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -80,8 +85,13 @@ class KISMCPOrderHelper:
             NYSE: 뉴욕증권거래소
             AMEX: 아멕스
         """
-        # TODO: 실제로는 종목 마스터 파일에서 조회해야 함
-        # 간단한 휴리스틱으로 추정
+        # 종목 디렉토리(로컬 파일)에서 조회
+        if lookup_kis_exchange is not None:
+            exchange = lookup_kis_exchange(symbol)
+            if exchange:
+                return exchange
+
+        # 디렉토리에 없는 종목은 간단한 휴리스틱으로 추정
         nasdaq_symbols = ['AAPL', 'MSFT', 'GOOGL', 'GOOG', 'AMZN', 'TSLA', 'META', 'NVDA']
 
         if symbol in nasdaq_symbols:
@@ -14,6 +14,11 @@ import yaml
 import pandas as pd
 from typing import Dict, Any, List, Optional
 
+try:
+    from project.database.symbol_directory import lookup_kis_exchange
+except ImportError:
+    lookup_kis_exchange = None
+
 logger = logging.getLogger(__name__)
 
 class KISUSHelper:
@@ -623,7 +628,15 @@ class KISUSHelper:
             return 0.0
     
     def get_market_code_us(self, stock_code: str) -> str:
-        """Automatically detect exchange for stock code - from reference GetMarketCodeUS"""
+        """Automatically detect exchange for stock code - from reference GetMarketCodeUS
+
+        Uses the local symbol directory first; probes exchanges over HTTP only for unknown symbols.
+        """
+        if lookup_kis_exchange is not None:
+            exchange = lookup_kis_exchange(stock_code)
+            if exchange:
+                return exchange
+
         try:
             exchanges = ["NASD", "NYSE", "AMEX", "HKS"]
             
@@ -0,0 +1,24 @@
+"""
+Benchmark Package
+
+백테스트/Staged 파이프라인 핫패스 성능 측정 (오프라인, MongoDB 불필요)
+
+모듈 구성:
+- backtest_benchmark: 합성 데이터 기반 벤치마크 실행/JSON 기록/기준선 비교
+
+사용법:
+    python -m project.benchmark.backtest_benchmark --scales 100 1000 5000
+    python -m project.benchmark.backtest_benchmark --baseline outputs/benchmarks/baseline.json
+"""
+
+try:
+    from .backtest_benchmark import (
+        BENCHMARKS,
+        BenchmarkFixtures,
+        run_benchmarks,
+        compare_to_baseline,
+        save_results,
+        load_results
+    )
+except ImportError:
+    pass
@@ -0,0 +1,454 @@
+"""
+Backtest Benchmark - Offline Performance Suite
+
+백테스트/Staged 파이프라인 핫패스의 반복 가능한 성능 측정.
+
+측정 대상 (BENCHMARKS):
+- daily_backtest: DailyBacktestService.run_backtest (engine_mode='dataframe')
+- daily_backtest_columnar: DailyBacktestService.run_backtest (engine_mode='columnar')
+- minute_backtest: MinuteBacktestService.run_backtest (단일 프로세스, 분봉 저장소 없음)
+- technical_indicators: TechnicalIndicatorGenerator (W/RS/F/D 지표 생성 + 기간 필터)
+- staged_signals: StagedSignalService.generate_staged_signals (E → F → W → RS → D)
+
+고정 합성 데이터:
+- create_sample_data / create_minute_sample_data 로 scale(종목 수)별 데이터 생성
+- 두 함수는 hash(ticker)로 시드를 정하므로 CLI는 PYTHONHASHSEED=0 으로 재실행하여 고정
+- 지표/시그널 입력(D/W/RS/E/F)은 signal_days 길이의 일봉 합성 데이터에서 파생 (MongoDB 불필요)
+  (Weekly 단계의 1년/2년 고저가 조건이 의미 있도록 백테스트 기간보다 길게 생성)
+
+결과:
+- 케이스별 최소/평균 실행 시간, tracemalloc 최대 메모리(MB)를 JSON으로 기록
+- compare_to_baseline(): 저장된 기준선 대비 threshold 이상 느려지거나 메모리가 늘면 회귀
+
+사용법:
+    python -m project.benchmark.backtest_benchmark
+    python -m project.benchmark.backtest_benchmark --scales 100 1000 --benchmarks daily_backtest
+    python -m project.benchmark.backtest_benchmark --baseline outputs/benchmarks/baseline.json --threshold 0.1
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from functools import cached_property
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+import logging
+
+from project.service.backtest_models import BacktestConfig
+from project.service.daily_backtest_service import DailyBacktestService, create_sample_data
+from project.service.minute_backtest_service import (
+    MinuteBacktestService, MinuteBacktestConfig, create_minute_sample_data
+)
+from project.indicator.technical_indicators import TechnicalIndicatorGenerator
+from project.strategy.staged_signal_service import StagedSignalService
+
+logger = logging.getLogger(__name__)
+
+RESULT_VERSION = 1
+DEFAULT_SCALES = (100, 1000, 5000)
+DEFAULT_OUTPUT_DIR = os.path.join('outputs', 'benchmarks')
+
+
+# ===== FIXTURES =====
+class BenchmarkFixtures:
+    """
+    scale(종목 수)별 고정 합성 데이터
+
+    각 데이터는 처음 사용할 때 한 번 생성되어 같은 scale의 모든 벤치마크가 공유한다.
+    벤치마크는 실행 전에 복사본을 만들어 쓰므로 원본은 변경되지 않는다.
+    """
+
+    def __init__(self, n_symbols: int, days: int = 250, minute_days: int = 1, signal_days: int = 500):
+        self.n_symbols = n_symbols
+        self.days = days
+        self.minute_days = minute_days
+        self.signal_days = signal_days
+        self.universe = [f"B{i:05d}" for i in range(n_symbols)]
+
+    @cached_property
+    def daily(self) -> Dict[str, pd.DataFrame]:
+        """일봉 백테스트 입력 (create_sample_data)"""
+        return create_sample_data(self.universe, days=self.days)
+
+    @cached_property
+    def minute(self) -> Dict[str, pd.DataFrame]:
+        """분봉 백테스트 입력 (create_minute_sample_data)"""
+        return create_minute_sample_data(self.universe, days=self.minute_days)
+
+    @cached_property
+    def signal_daily(self) -> Dict[str, pd.DataFrame]:
+        """지표/시그널 입력용 일봉 (signal_days)"""
+        if self.signal_days == self.days:
+            return self.daily
+        return create_sample_data(self.universe, days=self.signal_days)
+
+    @cached_property
+    def indicator_inputs(self) -> Dict[str, Dict[str, pd.DataFrame]]:
+        """
+        TechnicalIndicatorGenerator 원본 입력 {'D', 'W', 'RS', 'E', 'F'}
+
+        signal_daily에서 주봉(W-FRI), 분기 실적(E), 분기 재무(F)를 파생한다.
+        """
+        inputs = {'D': {}, 'W': {}, 'RS': {}, 'E': {}, 'F': {}}
+        for i, ticker in enumerate(self.universe):
+            df = self.signal_daily[ticker]
+            rng = np.random.default_rng(i)
+            volume = pd.Series(rng.integers(100_000, 5_000_000, len(df)), index=df.index, dtype=np.float64)
+
+            inputs['D'][ticker] = df[['open', 'high', 'low', 'close']].assign(volume=volume)
+            inputs['W'][ticker] = inputs['D'][ticker].resample('W-FRI').agg(
+                {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+            ).dropna()
+            inputs['RS'][ticker] = df[['RS_4W']].copy()
+
+            # 분기 시작일 라벨 (기간 필터에서 잘리지 않도록), YoY는 비율(0.05 = 5%)
+            quarterly = df[['close', 'Rev_Yoy_Growth', 'Eps_Yoy_Growth']].resample('QS').last()
+            rev_yoy = quarterly['Rev_Yoy_Growth'] / 100
+            eps_yoy = quarterly['Eps_Yoy_Growth'] / 100
+            inputs['E'][ticker] = pd.DataFrame({'rev_yoy': rev_yoy, 'eps_yoy': eps_yoy}, index=quarterly.index)
+
+            shares = rng.uniform(1e7, 1e9)
+            revenue = rng.uniform(1e8, 1e11, len(quarterly))
+            assets = revenue * rng.uniform(1.0, 3.0, len(quarterly))
+            inputs['F'][ticker] = pd.DataFrame({
+                'close': quarterly['close'],
+                'commonStockSharesOutstanding': shares,
+                'totalRevenue': revenue,
+                'grossProfit': revenue * rng.uniform(0.2, 0.6, len(quarterly)),
+                'operatingIncome': revenue * rng.uniform(-0.05, 0.3, len(quarterly)),
+                'netIncome': revenue * rng.uniform(-0.1, 0.2, len(quarterly)),
+                'depreciationAndAmortization': revenue * 0.03,
+                'totalAssets': assets,
+                'totalLiabilities': assets * rng.uniform(0.2, 0.7, len(quarterly)),
+                'totalShareholderEquity': assets * rng.uniform(0.2, 0.6, len(quarterly)),
+                'cashAndCashEquivalentsAtCarryingValue': assets * 0.1,
+                'revenue': revenue,
+                'REV_YOY': rev_yoy,
+                'EPS_YOY': eps_yoy,
+            }, index=quarterly.index)
+        return inputs
+
+    @cached_property
+    def staged_inputs(self) -> Dict[str, Dict[str, pd.DataFrame]]:
+        """StagedSignalService 입력 - indicator_inputs에 TechnicalIndicatorGenerator를 적용한 결과"""
+        generator = self._indicator_generator()
+        df_D, df_W, df_RS, df_E, df_F = generator.return_processed_data()
+        return {'D': df_D, 'W': df_W, 'RS': df_RS, 'E': df_E, 'F': df_F}
+
+    def _indicator_generator(self) -> TechnicalIndicatorGenerator:
+        inputs = {key: dict(frames) for key, frames in self.indicator_inputs.items()}
+        dates = self.signal_daily[self.universe[0]].index
+        return TechnicalIndicatorGenerator(
+            self.universe, 'US', inputs['W'], inputs['D'], inputs['RS'], inputs['E'], inputs['F'],
+            start_day=dates[0], end_day=dates[-1], trading=False
+        )
+
+
+# ===== BENCHMARK CASES =====
+# 각 함수는 측정 제외 준비(복사 등)를 마치고 측정 대상 호출 함수를 반환한다.
+def _daily_backtest(fixtures: BenchmarkFixtures, engine_mode: str = 'dataframe') -> Callable[[], Dict]:
+    data = {ticker: df.copy() for ticker, df in fixtures.daily.items()}
+    service = DailyBacktestService(BacktestConfig(engine_mode=engine_mode))
+
+    def run() -> Dict:
+        result = service.run_backtest(fixtures.universe, data)
+        return {'trades': len(result.trades), 'steps': len(result.daily_results)}
+    return run
+
+
+def _daily_backtest_columnar(fixtures: BenchmarkFixtures) -> Callable[[], Dict]:
+    return _daily_backtest(fixtures, engine_mode='columnar')
+
+
+def _minute_backtest(fixtures: BenchmarkFixtures) -> Callable[[], Dict]:
+    data = {ticker: df.copy() for ticker, df in fixtures.minute.items()}
+    service = MinuteBacktestService(MinuteBacktestConfig(enable_multiprocessing=False))
+
+    def run() -> Dict:
+        result = service.run_backtest(fixtures.universe, data)
+        return {'trades': len(result.trades), 'steps': len(result.daily_results)}
+    return run
+
+
+def _technical_indicators(fixtures: BenchmarkFixtures) -> Callable[[], Dict]:
+    fixtures.indicator_inputs  # 입력 생성은 측정에서 제외
+
+    def run() -> Dict:
+        generator = fixtures._indicator_generator()
+        return {'symbols_processed': len(generator.df_D)}
+    return run
+
+
+def _staged_signals(fixtures: BenchmarkFixtures) -> Callable[[], Dict]:
+    frames = {key: {ticker: df.copy() for ticker, df in data.items()}
+              for key, data in fixtures.staged_inputs.items()}
+    service = StagedSignalService(execution_mode='analysis')
+
+    def run() -> Dict:
+        results = service.generate_staged_signals(
+            fixtures.universe, frames['E'], frames['F'], frames['W'], frames['RS'], frames['D']
+        )
+        return {'final_candidates': results['total_candidates']}
+    return run
+
+
+BENCHMARKS: Dict[str, Callable[[BenchmarkFixtures], Callable[[], Dict]]] = {
+    'daily_backtest': _daily_backtest,
+    'daily_backtest_columnar': _daily_backtest_columnar,
+    'minute_backtest': _minute_backtest,
+    'technical_indicators': _technical_indicators,
+    'staged_signals': _staged_signals,
+}
+
+
+# ===== RUNNER =====
+def case_key(benchmark: str, n_symbols: int) -> str:
+    """결과/기준선 비교 키"""
+    return f"{benchmark}@{n_symbols}"
+
+
+def run_case(benchmark: str, fixtures: BenchmarkFixtures, repeat: int = 1,
+             measure_memory: bool = True) -> Dict[str, Any]:
+    """
+    벤치마크 한 케이스 실행
+
+    시간 측정 실행(repeat회)과 메모리 측정 실행(tracemalloc, 1회)을 분리하여
+    tracemalloc 오버헤드가 실행 시간에 섞이지 않게 한다.
+    서비스의 stdout 출력은 버린다.
+    """
+    factory = BENCHMARKS[benchmark]
+    runs, info = [], {}
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(max(repeat, 1)):
+            run = factory(fixtures)
+            gc.collect()
+            start = time.perf_counter()
+            info = run()
+            runs.append(time.perf_counter() - start)
+
+        peak_memory_mb = None
+        if measure_memory:
+            run = factory(fixtures)
+            gc.collect()
+            tracemalloc.start()
+            try:
+                run()
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            peak_memory_mb = peak / 1024 ** 2
+
+    return {
+        'key': case_key(benchmark, fixtures.n_symbols),
+        'benchmark': benchmark,
+        'n_symbols': fixtures.n_symbols,
+        'seconds': min(runs),
+        'mean_seconds': float(np.mean(runs)),
+        'runs': runs,
+        'peak_memory_mb': peak_memory_mb,
+        'info': info,
+    }
+
+
+def run_benchmarks(scales: Iterable[int] = DEFAULT_SCALES, benchmarks: Optional[Iterable[str]] = None,
+                   days: int = 250, minute_days: int = 1, signal_days: int = 500, repeat: int = 1,
+                   measure_memory: bool = True) -> Dict[str, Any]:
+    """
+    scale x benchmark 전체 실행
+
+    Returns:
+        {'meta': 실행 환경/설정, 'results': [run_case 결과, ...]}
+    """
+    benchmarks = list(benchmarks or BENCHMARKS)
+    unknown = [name for name in benchmarks if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {unknown} (available: {list(BENCHMARKS)})")
+
+    results = []
+    for n_symbols in scales:
+        fixtures = BenchmarkFixtures(n_symbols, days=days, minute_days=minute_days, signal_days=signal_days)
+        for benchmark in benchmarks:
+            # 진행 상황은 stderr로 (main은 서비스 INFO 로그를 끈 상태)
+            print(f"[Benchmark] {case_key(benchmark, n_symbols)} ...", file=sys.stderr, flush=True)
+            result = run_case(benchmark, fixtures, repeat=repeat, measure_memory=measure_memory)
+            print(f"[Benchmark] {result['key']}: {result['seconds']:.3f}s"
+                  + (f", peak {result['peak_memory_mb']:.1f} MB"
+                     if result['peak_memory_mb'] is not None else ""), file=sys.stderr, flush=True)
+            results.append(result)
+        del fixtures
+        gc.collect()
+
+    return {
+        'meta': {
+            'version': RESULT_VERSION,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'hash_seed': os.environ.get('PYTHONHASHSEED'),
+            'settings': {'scales': list(scales), 'days': days, 'minute_days': minute_days,
+                         'signal_days': signal_days, 'repeat': repeat, 'measure_memory': measure_memory},
+        },
+        'results': results,
+    }
+
+
+# ===== RESULTS / BASELINE =====
+def save_results(results: Dict[str, Any], path: str):
+    """벤치마크 결과 JSON 저장"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    """벤치마크 결과 JSON 로드"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_to_baseline(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.10,
+                        memory_threshold: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    기준선 대비 비교
+
+    Args:
+        current: run_benchmarks 결과
+        baseline: 저장된 기준선 결과
+        threshold: 허용 실행 시간 증가율 (0.10 = 10% 초과 시 회귀)
+        memory_threshold: 허용 최대 메모리 증가율 (None이면 threshold와 동일)
+
+    Returns:
+        양쪽에 모두 있는 케이스별 비교 행 (regression=True면 회귀)
+    """
+    memory_threshold = threshold if memory_threshold is None else memory_threshold
+    baseline_by_key = {result['key']: result for result in baseline.get('results', [])}
+
+    rows = []
+    for result in current.get('results', []):
+        base = baseline_by_key.get(result['key'])
+        if base is None:
+            continue
+
+        time_ratio = result['seconds'] / base['seconds'] if base['seconds'] > 0 else float('inf')
+        memory_ratio = None
+        if result.get('peak_memory_mb') and base.get('peak_memory_mb'):
+            memory_ratio = result['peak_memory_mb'] / base['peak_memory_mb']
+
+        time_regression = time_ratio > 1 + threshold
+        memory_regression = memory_ratio is not None and memory_ratio > 1 + memory_threshold
+        rows.append({
+            'key': result['key'],
+            'baseline_seconds': base['seconds'],
+            'seconds': result['seconds'],
+            'time_ratio': time_ratio,
+            'baseline_peak_memory_mb': base.get('peak_memory_mb'),
+            'peak_memory_mb': result.get('peak_memory_mb'),
+            'memory_ratio': memory_ratio,
+            'time_regression': time_regression,
+            'memory_regression': memory_regression,
+            'regression': time_regression or memory_regression,
+        })
+    return rows
+
+
+def format_results(results: Dict[str, Any]) -> str:
+    """결과 텍스트 표"""
+    header = f"{'Case':<36}{'Seconds':>10}{'Mean':>10}{'Peak MB':>10}  Info"
+    lines = [header, '-' * len(header)]
+    for result in results['results']:
+        peak = result['peak_memory_mb']
+        lines.append(f"{result['key']:<36}{result['seconds']:>10.3f}{result['mean_seconds']:>10.3f}"
+                     f"{(f'{peak:.1f}' if peak is not None else '-'):>10}  {result['info']}")
+    return '\n'.join(lines)
+
+
+def format_comparison(rows: List[Dict[str, Any]], threshold: float) -> str:
+    """기준선 비교 텍스트 표"""
+    header = f"{'Case':<36}{'Base s':>10}{'Now s':>10}{'Time':>9}{'Memory':>9}  Status"
+    lines = [header, '-' * len(header)]
+    for row in rows:
+        memory = f"{row['memory_ratio']:.2f}x" if row['memory_ratio'] is not None else '-'
+        status = 'REGRESSION' if row['regression'] else 'ok'
+        lines.append(f"{row['key']:<36}{row['baseline_seconds']:>10.3f}{row['seconds']:>10.3f}"
+                     f"{row['time_ratio']:>8.2f}x{memory:>9}  {status}")
+    lines.append(f"threshold: +{threshold:.0%}")
+    return '\n'.join(lines)
+
+
+# ===== CLI =====
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline backtest / staged pipeline benchmark suite")
+    parser.add_argument('--scales', type=int, nargs='+', default=list(DEFAULT_SCALES),
+                        help="종목 수 scale 목록 (기본: 100 1000 5000)")
+    parser.add_argument('--benchmarks', nargs='+', choices=list(BENCHMARKS), default=None,
+                        help="실행할 벤치마크 (기본: 전체)")
+    parser.add_argument('--days', type=int, default=250, help="일봉 합성 데이터 일수")
+    parser.add_argument('--minute-days', type=int, default=1, help="분봉 합성 데이터 일수")
+    parser.add_argument('--signal-days', type=int, default=500, help="지표/시그널 합성 일봉 데이터 일수")
+    parser.add_argument('--repeat', type=int, default=1, help="케이스별 시간 측정 반복 횟수 (최소값 기록)")
+    parser.add_argument('--no-memory', action='store_true', help="tracemalloc 최대 메모리 측정 생략")
+    parser.add_argument('--output', default=None, help="결과 JSON 경로 (기본: outputs/benchmarks/benchmark_<시각>.json)")
+    parser.add_argument('--baseline', default=None, help="비교할 기준선 JSON")
+    parser.add_argument('--threshold', type=float, default=0.10, help="허용 실행 시간 증가율 (기본 0.10)")
+    parser.add_argument('--memory-threshold', type=float, default=None, help="허용 메모리 증가율 (기본: --threshold)")
+    parser.add_argument('--update-baseline', action='store_true', help="실행 결과로 --baseline 파일을 갱신")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    # create_sample_data는 hash(ticker)로 시드를 정하므로 해시 시드를 고정해 재실행
+    if argv is None and os.environ.get('PYTHONHASHSEED') != '0':
+        os.environ['PYTHONHASHSEED'] = '0'
+        if __spec__ is not None:
+            os.execv(sys.executable, [sys.executable, '-m', __spec__.name] + sys.argv[1:])
+        os.execv(sys.executable, [sys.executable] + sys.argv)
+
+    args = _parse_args(argv)
+    logging.disable(logging.INFO)
+
+    results = run_benchmarks(
+        scales=args.scales, benchmarks=args.benchmarks, days=args.days, minute_days=args.minute_days,
+        signal_days=args.signal_days, repeat=args.repeat, measure_memory=not args.no_memory
+    )
+
+    output = args.output or os.path.join(
+        DEFAULT_OUTPUT_DIR, f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    save_results(results, output)
+    print(format_results(results))
+    print(f"\nResults saved: {output}")
+
+    if not args.baseline:
+        return 0
+
+    if args.update_baseline or not os.path.exists(args.baseline):
+        save_results(results, args.baseline)
+        print(f"Baseline written: {args.baseline}")
+        return 0
+
+    rows = compare_to_baseline(results, load_results(args.baseline), args.threshold, args.memory_threshold)
+    print()
+    print(format_comparison(rows, args.threshold))
+    regressions = [row['key'] for row in rows if row['regression']]
+    if regressions:
+        print(f"\n[REGRESSION] {len(regressions)} case(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""
+MongoDB Connection Registry - Data Layer Implementation
+
+프로세스 전역 MongoClient 레지스트리.
+db_address(myStockInfo.yaml 키, 예: MONGODB_LOCAL / MONGODB_NAS)마다 클라이언트 하나를 만들어
+MongoDBOperations, HistoricalDataManager, USMarketDataManager, 서비스/메인 스크립트가 공유한다.
+
+- 풀 설정: DEFAULT_POOL_SETTINGS ← myStockInfo.yaml MONGODB_POOL ← configure_pool() 순으로 적용
+  (configure_pool은 해당 주소의 클라이언트가 만들어지기 전에 호출해야 반영됨)
+- health_check(): 주소별 ping 지연 시간/풀 설정
+- close_all(): 모든 클라이언트 종료 (프로세스 종료 시 atexit로 자동 호출)
+- fork된 자식 프로세스에서는 부모 클라이언트를 버리고 새로 연결한다 (pymongo는 fork-safe 아님)
+
+소비자는 공유 클라이언트를 close()하지 않는다.
+"""
+
+import os
+import time
+import atexit
+import threading
+from typing import Any, Dict, Optional
+
+import pymongo
+import yaml
+import logging
+
+logger = logging.getLogger(__name__)
+
+# MongoClient 풀/타임아웃 기본값 (병렬 bulk read + 단계별 로더가 같은 풀 사용)
+DEFAULT_POOL_SETTINGS = {
+    'maxPoolSize': 100,
+    'minPoolSize': 1,
+    'maxIdleTimeMS': 60000,
+    'connectTimeoutMS': 20000,
+    'serverSelectionTimeoutMS': 20000,
+    'waitQueueTimeoutMS': 10000,
+}
+
+_DEFAULT_STOCK_INFO = {
+    "MONGODB_LOCAL": "localhost",
+    "MONGODB_NAS": "localhost",
+    "MONGODB_PORT": 27017,
+    "MONGODB_ID": "admin",
+    "MONGODB_PW": "password"
+}
+
+_lock = threading.Lock()
+_clients: Dict[str, pymongo.MongoClient] = {}
+_pool_overrides: Dict[str, Dict[str, Any]] = {}
+_owner_pid = os.getpid()
+_stock_info: Optional[Dict[str, Any]] = None
+
+
+# ===== CONFIG =====
+def load_stock_info() -> Dict[str, Any]:
+    """myStockInfo.yaml 설정 (프로세스당 한 번 로드, 없으면 기본값)"""
+    global _stock_info
+    if _stock_info is not None:
+        return _stock_info
+
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    config_path = os.path.join(project_root, 'myStockInfo.yaml')
+    try:
+        if os.path.exists(config_path):
+            with open(config_path, 'r', encoding='UTF-8') as f:
+                _stock_info = yaml.load(f, Loader=yaml.FullLoader) or {}
+        else:
+            logger.warning(f"Configuration file not found at {config_path}")
+            _stock_info = dict(_DEFAULT_STOCK_INFO)
+    except Exception as e:
+        logger.error(f"Error loading configuration: {e}")
+        _stock_info = dict(_DEFAULT_STOCK_INFO)
+
+    return _stock_info
+
+
+def configure_pool(db_address: str, **settings):
+    """
+    주소별 MongoClient 옵션 지정 (예: maxPoolSize=50)
+
+    이미 연결된 주소는 close_client() 후 다음 get_client()부터 반영된다.
+    """
+    with _lock:
+        _pool_overrides.setdefault(db_address, {}).update(settings)
+        if db_address in _clients:
+            logger.warning(f"MongoDB client for {db_address} already open - "
+                           f"pool settings apply after close_client('{db_address}')")
+
+
+def pool_settings(db_address: str) -> Dict[str, Any]:
+    """주소에 적용될 MongoClient 옵션"""
+    settings = dict(DEFAULT_POOL_SETTINGS)
+    settings.update(load_stock_info().get('MONGODB_POOL') or {})
+    settings.update(_pool_overrides.get(db_address, {}))
+    return settings
+
+
+# ===== CLIENTS =====
+def get_client(db_address: str = "MONGODB_LOCAL") -> pymongo.MongoClient:
+    """
+    주소별 공유 MongoClient (없으면 생성)
+
+    Args:
+        db_address: myStockInfo.yaml의 호스트 키
+
+    Returns:
+        pymongo.MongoClient (thread-safe, 호출자가 close하지 않음)
+    """
+    global _owner_pid
+    with _lock:
+        if os.getpid() != _owner_pid:
+            # fork 이후: 부모 프로세스 소켓은 사용하지 않음
+            _clients.clear()
+            _owner_pid = os.getpid()
+
+        client = _clients.get(db_address)
+        if client is None:
+            stock_info = load_stock_info()
+            client = pymongo.MongoClient(
+                host=stock_info.get(db_address, "localhost"),
+                port=stock_info.get("MONGODB_PORT", 27017),
+                username=stock_info.get("MONGODB_ID"),
+                password=stock_info.get("MONGODB_PW"),
+                **pool_settings(db_address)
+            )
+            _clients[db_address] = client
+            logger.info(f"MongoDB connection established to {stock_info.get(db_address, 'localhost')} ({db_address})")
+        return client
+
+
+def health_check(db_address: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    연결 상태 확인 (ping)
+
+    Args:
+        db_address: 확인할 주소 (None이면 열린 모든 클라이언트)
+
+    Returns:
+        {db_address: {'connected', 'latency_ms', 'max_pool_size', 'error'}}
+    """
+    with _lock:
+        addresses = [db_address] if db_address else list(_clients)
+
+    report = {}
+    for address in addresses:
+        entry = {'connected': False, 'latency_ms': None,
+                 'max_pool_size': pool_settings(address)['maxPoolSize'], 'error': None}
+        try:
+            start = time.perf_counter()
+            get_client(address).admin.command('ping')
+            entry['connected'] = True
+            entry['latency_ms'] = (time.perf_counter() - start) * 1000
+        except Exception as e:
+            entry['error'] = str(e)
+        report[address] = entry
+    return report
+
+
+def close_client(db_address: str):
+    """주소의 공유 클라이언트 종료 (다음 get_client에서 다시 연결)"""
+    with _lock:
+        client = _clients.pop(db_address, None)
+    if client is not None:
+        client.close()
+        logger.info(f"MongoDB connection closed ({db_address})")
+
+
+def close_all():
+    """모든 공유 클라이언트 종료"""
+    with _lock:
+        clients = list(_clients.items())
+        _clients.clear()
+    for address, client in clients:
+        try:
+            client.close()
+        except Exception as e:
+            logger.debug(f"Error closing MongoDB client {address}: {e}")
+
+
+atexit.register(close_all)
@@ -0,0 +1,69 @@
+"""
+Data Versions - Data Layer Implementation
+
+시장별 데이터 버전 카운터. 종목 컬렉션에 쓰는 경로(MongoDBOperations)가 쓸 때마다 올리고,
+데이터에서 파생된 결과를 보관하는 캐시(BacktestResultCache)가 키에 포함한다.
+버전이 바뀌면 이전 키는 더 이상 조회되지 않는다.
+
+파일: outputs/cache/data_versions.json    {market: version}
+
+시장 키는 거래소 코드(NAS/NYS/AMX ...)와 지역 코드(US/KR ...)를 함께 쓴다.
+NasDataBase_D에 쓰면 'NAS'와 'US'가 모두 올라가므로 어느 쪽으로 키를 만들어도 무효화된다.
+"""
+
+import os
+import json
+import threading
+from typing import Dict, Iterable, Optional
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VERSIONS_PATH = os.path.join('outputs', 'cache', 'data_versions.json')
+
+_lock = threading.Lock()
+
+
+def load_data_versions(path: str = DEFAULT_VERSIONS_PATH) -> Dict[str, int]:
+    """{market: version} (파일이 없거나 읽을 수 없으면 빈 dict)"""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"Failed to read data versions {path}: {e}")
+        return {}
+
+
+def data_version(market: str, path: str = DEFAULT_VERSIONS_PATH) -> int:
+    """시장 데이터 버전 (갱신 기록이 없으면 0)"""
+    return load_data_versions(path).get(market, 0)
+
+
+def bump_data_versions(markets: Optional[Iterable[str]] = None,
+                       path: str = DEFAULT_VERSIONS_PATH) -> Dict[str, int]:
+    """
+    시장 데이터 버전 증가 (데이터를 쓴 뒤 호출)
+
+    Args:
+        markets: 시장 코드 목록 (None이면 기록된 모든 시장)
+        path: 버전 파일
+
+    Returns:
+        갱신된 {market: version}
+    """
+    with _lock:
+        versions = load_data_versions(path)
+        for market in (list(versions) if markets is None else dict.fromkeys(markets)):
+            versions[market] = versions.get(market, 0) + 1
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(versions, f, sort_keys=True)
+        os.replace(tmp_path, path)
+    return versions
@@ -150,6 +150,30 @@ def calculate_database_name(market: str, area: str, p_code: str, type: str = 'St
     
     return database_names.get(p_code, f"Unknown_{area}_{market}_{p_code}")
 
+_DATABASE_MARKETS = [
+    ('KR', 'KR'), ('HNX', 'VT'), ('HSX', 'VT'),
+    ('NAS', 'US'), ('NYS', 'US'), ('AMX', 'US'), ('HK', 'HK')
+]
+_DATABASE_P_CODES = ['M', 'D', 'AD', 'W', 'RS', 'F', 'E', 'O']
+
+
+def database_market(db_name: str) -> Optional[Tuple[str, str]]:
+    """
+    Reverse of calculate_database_name
+
+    Args:
+        db_name: Database name (e.g. 'NasDataBase_D', 'NysEtfDataBase_W')
+
+    Returns:
+        (market, area) tuple, or None if the name is not a known market database
+    """
+    for market, area in _DATABASE_MARKETS:
+        for security_type in ('Stock', 'ETF'):
+            for p_code in _DATABASE_P_CODES:
+                if calculate_database_name(market, area, p_code, security_type) == db_name:
+                    return market, area
+    return None
+
 def calculate_file_path(market: str, area: str, security_type: str) -> Tuple[Optional[str], Optional[str]]:
     """
     Calculate file paths for listing and delisting files
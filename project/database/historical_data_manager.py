@@ -13,6 +13,7 @@ from typing import Dict, Any, Optional
 import os
 
 from .mongodb_operations import MongoDBOperations
+from .connection_registry import get_client
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -59,17 +60,9 @@ class HistoricalDataManager:
             }
     
     def _get_connection(self, db_type: str = "MONGODB_NAS") -> pymongo.MongoClient:
-        """Get MongoDB connection for specified database type"""
+        """Get the shared MongoDB client for specified database type (do not close)"""
         try:
-            connection = pymongo.MongoClient(
-                host=self.stock_info[db_type],
-                port=self.stock_info["MONGODB_PORT"],
-                username=self.stock_info["MONGODB_ID"],
-                password=self.stock_info["MONGODB_PW"],
-                maxIdleTimeMS=120000,
-                serverSelectionTimeoutMS=30000
-            )
-            return connection
+            return get_client(db_type)
         except Exception as e:
             logger.error(f"Failed to connect to {db_type}: {e}")
             raise
@@ -139,7 +132,6 @@ class HistoricalDataManager:
                 collection.insert_one(account_dict)
                 logger.info(f"Created new account collection {mode} with data for {updated_date}")
             
-            conn.close()
             return True
             
         except Exception as e:
@@ -212,7 +204,6 @@ class HistoricalDataManager:
                 collection.insert_one(account_dict)
                 logger.info(f"Created new trade collection {mode} with data for {updated_date}")
             
-            conn.close()
             return True
             
         except Exception as e:
@@ -358,7 +349,6 @@ class HistoricalDataManager:
                 collection.drop()
                 logger.info(f"Deleted entire account collection for {mode}")
             
-            conn.close()
             return True
             
         except Exception as e:
@@ -0,0 +1,281 @@
+"""
+Index Manager - Data Layer Implementation
+
+종목별 컬렉션(NasDataBase_D/AAPL 등)의 Date 인덱스 점검/생성 도구.
+
+모든 조회는 {'Date': {'$gte', '$lte'}} 범위 + Date 정렬을 사용하므로
+Date 인덱스가 없으면 컬렉션 전체 스캔 + 메모리 정렬이 일어난다.
+
+- audit: DB별 모든 컬렉션의 Date 인덱스 존재/unique 여부, 대표 쿼리 실행 계획(IXSCAN/COLLSCAN)과 시간 기록
+- --create: 없는 Date 인덱스를 병렬 생성 (기본 unique, 중복 날짜가 있으면 일반 인덱스로 대체하고 중복 수 보고)
+
+사용법:
+    python -m project.database.index_manager                      # 모든 *DataBase_* 점검
+    python -m project.database.index_manager --databases NasDataBase_D NysDataBase_D --create
+    python -m project.database.index_manager --create --no-unique --workers 16 --json outputs/index_audit.json
+"""
+
+import re
+import json
+import time
+import argparse
+import dataclasses
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import pymongo
+from pymongo.errors import DuplicateKeyError, OperationFailure
+import logging
+
+from project.database.connection_registry import get_client
+
+logger = logging.getLogger(__name__)
+
+# 종목별 컬렉션을 가진 DB (NasDataBase_D, NysDataBase_W, KrDataBase_RS, ...)
+# time-series 레이아웃 DB(<name>_TS)는 제외
+STOCK_DATABASE_PATTERN = re.compile(r'^[A-Z][A-Za-z]*DataBase_(?![A-Za-z_]*_TS$)[A-Za-z_]+$')
+
+DATE_FIELD = 'Date'
+DATE_INDEX_NAME = 'Date_1'
+DEFAULT_WORKERS = 8
+
+# 실행 계획 점검용 대표 쿼리 기간 (DataFrameGenerator 기본 조회와 같은 최근 구간)
+EXPLAIN_LOOKBACK_DAYS = 365
+
+
+@dataclasses.dataclass
+class CollectionIndexReport:
+    """컬렉션 하나의 Date 인덱스 점검 결과"""
+    database: str
+    collection: str
+    documents: int = 0
+    date_index: bool = False
+    unique: bool = False
+    created: bool = False
+    duplicates: Optional[int] = None
+    plan: Optional[str] = None
+    docs_examined: Optional[int] = None
+    returned: Optional[int] = None
+    execution_ms: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def collection_scan(self) -> bool:
+        return self.plan is not None and 'COLLSCAN' in self.plan
+
+
+# ===== DISCOVERY =====
+def list_stock_databases(client: pymongo.MongoClient, pattern: re.Pattern = STOCK_DATABASE_PATTERN) -> List[str]:
+    """종목별 컬렉션 DB 목록"""
+    return sorted(name for name in client.list_database_names() if pattern.match(name))
+
+
+def _date_index(collection) -> Optional[Dict]:
+    """Date 단일 필드 인덱스 정보 (없으면 None)"""
+    for name, info in collection.index_information().items():
+        keys = [field for field, _ in info.get('key', [])]
+        if keys == [DATE_FIELD]:
+            return dict(info, name=name)
+    return None
+
+
+def _plan_stages(plan: Dict) -> List[str]:
+    """winningPlan 단계 이름 (바깥 → 안쪽 순서)"""
+    stages = []
+    while plan:
+        if 'queryPlan' in plan:  # SBE 엔진 형식
+            plan = plan['queryPlan']
+        stages.append(plan.get('stage', '?'))
+        plan = plan.get('inputStage') or (plan.get('inputStages') or [None])[0]
+    return stages
+
+
+# ===== AUDIT =====
+def audit_collection(db, database: str, collection_name: str, create: bool = False,
+                     unique: bool = True, explain: bool = True) -> CollectionIndexReport:
+    """
+    컬렉션 하나 점검 (+ 필요 시 Date 인덱스 생성)
+
+    Args:
+        db: pymongo Database
+        database: Database name (report)
+        collection_name: Collection name
+        create: Create a missing Date index
+        unique: Create it as unique (falls back to non-unique on duplicate dates)
+        explain: Explain/time the representative range query
+    """
+    report = CollectionIndexReport(database=database, collection=collection_name)
+    collection = db[collection_name]
+
+    try:
+        report.documents = collection.estimated_document_count()
+        index = _date_index(collection)
+
+        if index is None and create:
+            index = _create_date_index(collection, report, unique)
+
+        report.date_index = index is not None
+        report.unique = bool(index and index.get('unique'))
+
+        if explain and report.documents:
+            _explain_range_query(collection, report)
+
+    except Exception as e:
+        report.error = str(e)
+        logger.debug(f"Index audit failed for {database}.{collection_name}: {e}")
+
+    return report
+
+
+def _create_date_index(collection, report: CollectionIndexReport, unique: bool) -> Dict:
+    """Date 인덱스 생성 (unique 실패 시 중복 수 기록 후 일반 인덱스)"""
+    if unique:
+        try:
+            collection.create_index([(DATE_FIELD, pymongo.ASCENDING)], name=DATE_INDEX_NAME, unique=True)
+            report.created = True
+            return _date_index(collection)
+        except (DuplicateKeyError, OperationFailure) as e:
+            if not isinstance(e, DuplicateKeyError) and getattr(e, 'code', None) != 11000:
+                raise
+            report.duplicates = _count_duplicate_dates(collection)
+            logger.warning(f"{report.database}.{report.collection}: {report.duplicates} duplicate dates, "
+                           f"creating non-unique Date index")
+
+    collection.create_index([(DATE_FIELD, pymongo.ASCENDING)], name=DATE_INDEX_NAME)
+    report.created = True
+    return _date_index(collection)
+
+
+def _count_duplicate_dates(collection) -> int:
+    """같은 Date를 가진 추가 문서 수"""
+    pipeline = [
+        {'$group': {'_id': f'${DATE_FIELD}', 'count': {'$sum': 1}}},
+        {'$match': {'count': {'$gt': 1}}},
+        {'$group': {'_id': None, 'extra': {'$sum': {'$subtract': ['$count', 1]}}}},
+    ]
+    result = list(collection.aggregate(pipeline, allowDiskUse=True))
+    return int(result[0]['extra']) if result else 0
+
+
+def _explain_range_query(collection, report: CollectionIndexReport):
+    """대표 범위 쿼리(최근 EXPLAIN_LOOKBACK_DAYS일, Date 정렬) 실행 계획과 시간"""
+    query = {DATE_FIELD: {'$gte': datetime.now() - timedelta(days=EXPLAIN_LOOKBACK_DAYS)}}
+
+    explanation = collection.find(query).sort(DATE_FIELD, pymongo.ASCENDING).explain()
+    report.plan = '>'.join(_plan_stages(explanation.get('queryPlanner', {}).get('winningPlan', {})))
+
+    stats = explanation.get('executionStats', {})
+    report.docs_examined = stats.get('totalDocsExamined')
+    report.returned = stats.get('nReturned')
+
+    # explain 통계가 없는 서버/권한에서도 비교 가능하도록 실제 조회 시간 측정
+    start = time.perf_counter()
+    returned = sum(1 for _ in collection.find(query, {'_id': 0, DATE_FIELD: 1}).sort(DATE_FIELD, pymongo.ASCENDING))
+    report.execution_ms = (time.perf_counter() - start) * 1000
+    if report.returned is None:
+        report.returned = returned
+
+
+def audit_database(client: pymongo.MongoClient, database: str, collections: Optional[List[str]] = None,
+                   create: bool = False, unique: bool = True, explain: bool = True,
+                   max_workers: int = DEFAULT_WORKERS) -> List[CollectionIndexReport]:
+    """
+    DB의 모든 (또는 지정) 컬렉션 병렬 점검
+
+    Returns:
+        컬렉션별 CollectionIndexReport (컬렉션 이름 순)
+    """
+    db = client[database]
+    names = collections or sorted(name for name in db.list_collection_names() if not name.startswith('system.'))
+    if not names:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(names))),
+                            thread_name_prefix='index-audit') as executor:
+        reports = list(executor.map(
+            lambda name: audit_collection(db, database, name, create, unique, explain), names
+        ))
+
+    summary = summarize(reports)[database]
+    logger.info(f"{database}: {summary['collections']} collections, {summary['missing']} without Date index, "
+                f"{summary['created']} created, {summary['collection_scans']} collection scans")
+    return reports
+
+
+# ===== REPORT =====
+def summarize(reports: List[CollectionIndexReport]) -> Dict[str, Dict[str, float]]:
+    """DB별 집계"""
+    summary: Dict[str, Dict[str, float]] = {}
+    for report in reports:
+        entry = summary.setdefault(report.database, {
+            'collections': 0, 'missing': 0, 'created': 0, 'non_unique': 0,
+            'collection_scans': 0, 'errors': 0, 'total_ms': 0.0
+        })
+        entry['collections'] += 1
+        entry['missing'] += not report.date_index
+        entry['created'] += report.created
+        entry['non_unique'] += report.date_index and not report.unique
+        entry['collection_scans'] += report.collection_scan
+        entry['errors'] += report.error is not None
+        entry['total_ms'] += report.execution_ms or 0.0
+    return summary
+
+
+def format_report(reports: List[CollectionIndexReport], slowest: int = 10) -> str:
+    """DB별 요약 + 가장 느린 컬렉션 표"""
+    header = f"{'Database':<20}{'Colls':>8}{'Missing':>9}{'Created':>9}{'NonUniq':>9}{'COLLSCAN':>10}{'Errors':>8}{'Query s':>9}"
+    lines = [header, '-' * len(header)]
+    for database, entry in sorted(summarize(reports).items()):
+        lines.append(f"{database:<20}{entry['collections']:>8}{entry['missing']:>9}{entry['created']:>9}"
+                     f"{entry['non_unique']:>9}{entry['collection_scans']:>10}{entry['errors']:>8}"
+                     f"{entry['total_ms'] / 1000:>9.2f}")
+
+    timed = sorted((r for r in reports if r.execution_ms is not None), key=lambda r: -r.execution_ms)[:slowest]
+    if timed:
+        lines += ['', f"Slowest {len(timed)} range queries:",
+                  f"{'Collection':<32}{'Docs':>10}{'Examined':>10}{'Returned':>10}{'ms':>10}  Plan"]
+        for r in timed:
+            lines.append(f"{r.database + '.' + r.collection:<32}{r.documents:>10}{r.docs_examined or 0:>10}"
+                         f"{r.returned or 0:>10}{r.execution_ms:>10.1f}  {r.plan}")
+    return '\n'.join(lines)
+
+
+# ===== CLI =====
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Audit / create Date indexes on per-symbol collections")
+    parser.add_argument('--databases', nargs='+', help="Databases (default: every *DataBase_* database)")
+    parser.add_argument('--collections', nargs='+', help="Collections (default: all)")
+    parser.add_argument('--create', action='store_true', help="Create missing Date indexes")
+    parser.add_argument('--no-unique', action='store_true', help="Create non-unique indexes")
+    parser.add_argument('--no-explain', action='store_true', help="Skip query plans and timings")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="Concurrent collections")
+    parser.add_argument('--db-address', default='MONGODB_LOCAL', help="Address key in myStockInfo.yaml")
+    parser.add_argument('--json', metavar='PATH', help="Write per-collection reports as JSON")
+    args = parser.parse_args(argv)
+
+    client = get_client(args.db_address)
+    databases = args.databases or list_stock_databases(client)
+
+    reports: List[CollectionIndexReport] = []
+    for database in databases:
+        reports += audit_database(client, database, args.collections, create=args.create,
+                                  unique=not args.no_unique, explain=not args.no_explain,
+                                  max_workers=args.workers)
+
+    print(format_report(reports))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump([dataclasses.asdict(report) for report in reports], f, indent=2)
+        print(f"\n[IndexManager] Wrote {len(reports)} collection reports to {args.json}")
+
+    return 1 if any(report.error for report in reports) else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='[%(levelname)s] %(message)s'
+    )
+    raise SystemExit(main())
@@ -0,0 +1,425 @@
+"""
+Minute Bar Store - Data Layer Implementation
+
+분봉(1분) OHLCV 데이터를 종목/월 단위 파티션의 고정폭 컬럼 파일로 보관하고
+np.memmap으로 필요한 날짜 구간만 읽어오는 로컬 저장소.
+
+디렉토리 구조:
+    <root>/<SYMBOL>/<YYYY-MM>/timestamp.i8   int64  (datetime64[ns])
+    <root>/<SYMBOL>/<YYYY-MM>/open.f4        float32
+    <root>/<SYMBOL>/<YYYY-MM>/high.f4        float32
+    <root>/<SYMBOL>/<YYYY-MM>/low.f4         float32
+    <root>/<SYMBOL>/<YYYY-MM>/close.f4       float32
+    <root>/<SYMBOL>/<YYYY-MM>/volume.i8      int64
+    <root>/<SYMBOL>/<YYYY-MM>/days.i8        int64  (일자, epoch 기준 일수)
+    <root>/<SYMBOL>/<YYYY-MM>/offsets.i8     int64  (일자별 시작 행, 마지막 = 전체 행 수)
+
+일자 조회는 (종목, 월) 파티션 캐시 + 일자 dict로 O(1).
+
+대량 적재 (CSV / mongoexport JSON / MongoDB 분봉 DB):
+    python -m project.database.minute_bar_store ingest --root storage/minute_bars --csv data/*.csv
+    python -m project.database.minute_bar_store ingest --root storage/minute_bars --json exports/*.json
+    python -m project.database.minute_bar_store ingest --root storage/minute_bars --mongo-db NasDataBase_M
+"""
+
+import os
+import json
+import argparse
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# 컬럼명 -> (파일명, dtype)
+BAR_COLUMNS = {
+    'timestamp': ('timestamp.i8', np.int64),
+    'open': ('open.f4', np.float32),
+    'high': ('high.f4', np.float32),
+    'low': ('low.f4', np.float32),
+    'close': ('close.f4', np.float32),
+    'volume': ('volume.i8', np.int64),
+}
+
+NS_PER_DAY = 86_400_000_000_000
+
+# 원본 데이터의 시각 컬럼 후보 (CSV/Mongo export)
+TIMESTAMP_COLUMNS = ('timestamp', 'datetime', 'date', 'time')
+
+
+class MinuteBars(NamedTuple):
+    """하루치 분봉 (memmap 슬라이스, 읽기 전용)"""
+    timestamp: np.ndarray  # int64 ns
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def time_at(self, i: int) -> pd.Timestamp:
+        """i번째 분봉 시각"""
+        return pd.Timestamp(int(self.timestamp[i]))
+
+
+class _Partition:
+    """(종목, 월) 파티션 하나의 memmap 컬럼 + 일자 인덱스"""
+
+    def __init__(self, path: str):
+        self.columns = {}
+        for name, (filename, dtype) in BAR_COLUMNS.items():
+            file_path = os.path.join(path, filename)
+            if os.path.getsize(file_path) == 0:
+                self.columns[name] = np.empty(0, dtype=dtype)
+            else:
+                self.columns[name] = np.memmap(file_path, dtype=dtype, mode='r')
+
+        days = np.fromfile(os.path.join(path, 'days.i8'), dtype=np.int64)
+        self.offsets = np.fromfile(os.path.join(path, 'offsets.i8'), dtype=np.int64)
+        self.day_index: Dict[int, int] = {int(day): i for i, day in enumerate(days)}
+
+    def __len__(self) -> int:
+        return int(self.offsets[-1]) if len(self.offsets) else 0
+
+    def day_slice(self, day: int) -> Optional[slice]:
+        i = self.day_index.get(day)
+        if i is None:
+            return None
+        return slice(int(self.offsets[i]), int(self.offsets[i + 1]))
+
+
+def _ns_timestamps(index) -> np.ndarray:
+    """DatetimeIndex -> int64 ns (pandas 2+ 인덱스 단위가 us/s여도 ns로 변환)"""
+    return pd.DatetimeIndex(index).to_numpy(dtype='datetime64[ns]').view(np.int64)
+
+
+def _month_key(day: int) -> str:
+    """epoch 일수 -> 'YYYY-MM' 파티션 키"""
+    return str(np.datetime64(day, 'D').astype('datetime64[M]'))
+
+
+class MinuteBarStore:
+    """
+    memmap 기반 분봉 저장소
+
+    (종목, 월) 파티션은 처음 접근할 때 한 번만 열고(memmap) 이후에는
+    일자 인덱스로 해당 날짜 구간만 슬라이스하여 반환한다.
+    """
+
+    def __init__(self, root: str):
+        """
+        Args:
+            root: 저장소 루트 디렉토리
+        """
+        self.root = root
+        self._partitions: Dict[Tuple[str, str], Optional[_Partition]] = {}
+
+    # 프로세스 풀로 전달될 때 memmap 대신 경로만 전달
+    def __getstate__(self):
+        return {'root': self.root}
+
+    def __setstate__(self, state):
+        self.__init__(state['root'])
+
+    # ===== READ =====
+    def symbols(self) -> List[str]:
+        """저장된 종목 목록"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root) if self.months(name))
+
+    def months(self, symbol: str) -> List[str]:
+        """종목의 월 파티션 목록 ('YYYY-MM')"""
+        path = os.path.join(self.root, symbol)
+        if not os.path.isdir(path):
+            return []
+        return sorted(name for name in os.listdir(path)
+                      if os.path.isfile(os.path.join(path, name, 'offsets.i8')))
+
+    def has_symbol(self, symbol: str) -> bool:
+        return bool(self.months(symbol))
+
+    def day_bars(self, symbol: str, date) -> Optional[MinuteBars]:
+        """
+        특정 종목/일자의 분봉 조회
+
+        Args:
+            symbol: 종목 코드
+            date: 일자 (시간 부분은 무시)
+
+        Returns:
+            MinuteBars (없으면 None)
+        """
+        day = pd.Timestamp(date).value // NS_PER_DAY
+        partition = self._open(symbol, _month_key(day))
+        if partition is None:
+            return None
+
+        rows = partition.day_slice(day)
+        if rows is None or rows.start == rows.stop:
+            return None
+
+        columns = partition.columns
+        return MinuteBars(*(columns[name][rows] for name in BAR_COLUMNS))
+
+    def iter_days(self, symbol: str, start=None, end=None) -> Iterator[Tuple[pd.Timestamp, MinuteBars]]:
+        """
+        기간 내 일자별 분봉 순회 (라이브 가격 재생 등)
+
+        Args:
+            start/end: 포함 범위 (None이면 전체)
+        """
+        start_day = pd.Timestamp(start).value // NS_PER_DAY if start is not None else None
+        end_day = pd.Timestamp(end).value // NS_PER_DAY if end is not None else None
+
+        for month in self.months(symbol):
+            partition = self._open(symbol, month)
+            if partition is None:
+                continue
+            for day in sorted(partition.day_index):
+                if (start_day is not None and day < start_day) or (end_day is not None and day > end_day):
+                    continue
+                rows = partition.day_slice(day)
+                yield (pd.Timestamp(day * NS_PER_DAY),
+                       MinuteBars(*(partition.columns[name][rows] for name in BAR_COLUMNS)))
+
+    def _open(self, symbol: str, month: str) -> Optional[_Partition]:
+        key = (symbol, month)
+        if key in self._partitions:
+            return self._partitions[key]
+
+        path = os.path.join(self.root, symbol, month)
+        partition = None
+        if os.path.isfile(os.path.join(path, 'offsets.i8')):
+            try:
+                partition = _Partition(path)
+            except (OSError, ValueError) as e:
+                logger.error(f"[MinuteBarStore] Failed to open {symbol}/{month}: {e}")
+        self._partitions[key] = partition
+        return partition
+
+    # ===== WRITE =====
+    def write_symbol(self, symbol: str, bars: pd.DataFrame, merge: bool = True) -> int:
+        """
+        종목 분봉 저장 (월 파티션 단위로 기록)
+
+        Args:
+            symbol: 종목 코드
+            bars: DatetimeIndex + open/high/low/close/volume 컬럼 DataFrame
+            merge: True면 같은 월 파티션의 기존 분봉과 병합 (중복 시각은 새 값 우선)
+
+        Returns:
+            기록한 입력 분봉 수 (입력 내 중복 시각 제외, 기존 분봉 미포함)
+        """
+        if bars.empty:
+            return 0
+
+        bars = bars.sort_index()
+        bars = bars[~bars.index.duplicated(keep='last')]
+        timestamps = _ns_timestamps(bars.index)
+        months = (timestamps // NS_PER_DAY).astype('datetime64[D]').astype('datetime64[M]')
+
+        written = 0
+        for month in np.unique(months):
+            month_key = str(month)
+            part = bars[months == month]
+            written += len(part)
+            if merge:
+                existing = self._read_partition(symbol, month_key)
+                if existing is not None:
+                    part = pd.concat([existing, part])
+                    part = part[~part.index.duplicated(keep='last')].sort_index()
+            self._write_partition(symbol, month_key, part)
+
+        # 왕복 확인: 마지막 일자를 day_bars로 다시 읽을 수 있어야 함 (시각 단위 오류 감지)
+        last_day = timestamps[-1] // NS_PER_DAY
+        stored = self.day_bars(symbol, pd.Timestamp(int(last_day * NS_PER_DAY)))
+        if stored is None or int(stored.timestamp[-1]) != int(timestamps[-1]):
+            raise ValueError(f"{symbol}: bars written for {_month_key(int(last_day))} cannot be read back")
+
+        return written
+
+    def _read_partition(self, symbol: str, month: str) -> Optional[pd.DataFrame]:
+        """기존 파티션을 DataFrame으로 읽기 (병합용)"""
+        partition = self._open(symbol, month)
+        if partition is None or len(partition) == 0:
+            return None
+        columns = partition.columns
+        frame = pd.DataFrame({name: np.array(columns[name]) for name in BAR_COLUMNS if name != 'timestamp'},
+                             index=pd.DatetimeIndex(np.array(columns['timestamp']).view('datetime64[ns]')))
+        # 덮어쓰기 전에 memmap 해제
+        self._partitions.pop((symbol, month), None)
+        return frame
+
+    def _write_partition(self, symbol: str, month: str, bars: pd.DataFrame):
+        path = os.path.join(self.root, symbol, month)
+        os.makedirs(path, exist_ok=True)
+        self._partitions.pop((symbol, month), None)
+
+        timestamps = _ns_timestamps(bars.index)
+        for name, (filename, dtype) in BAR_COLUMNS.items():
+            if name == 'timestamp':
+                values = timestamps
+            elif name in bars.columns:
+                values = pd.to_numeric(bars[name], errors='coerce').fillna(0).to_numpy()
+            else:
+                values = np.zeros(len(bars))
+            np.ascontiguousarray(values, dtype=dtype).tofile(os.path.join(path, filename))
+
+        days, starts = np.unique(timestamps // NS_PER_DAY, return_index=True)
+        offsets = np.append(starts, len(timestamps)).astype(np.int64)
+        days.astype(np.int64).tofile(os.path.join(path, 'days.i8'))
+        offsets.tofile(os.path.join(path, 'offsets.i8'))
+
+        logger.debug(f"[MinuteBarStore] {symbol}/{month}: {len(timestamps)} bars / {len(days)} days written")
+
+
+# ===== INGEST =====
+def normalize_bars(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    CSV/Mongo export 원본을 DatetimeIndex + open/high/low/close/volume 형식으로 정규화
+    (컬럼명 대소문자 무시, Date/Datetime/Timestamp 컬럼 또는 인덱스 사용)
+    """
+    frame = frame.rename(columns={col: str(col).lower() for col in frame.columns})
+
+    if not isinstance(frame.index, pd.DatetimeIndex):
+        time_col = next((col for col in TIMESTAMP_COLUMNS if col in frame.columns), None)
+        if time_col is None:
+            raise ValueError("No timestamp column found (expected one of: "
+                             f"{', '.join(TIMESTAMP_COLUMNS)})")
+        values = frame[time_col]
+        # mongoexport 확장 JSON: {"$date": ...}
+        if len(values) and isinstance(values.iloc[0], dict):
+            values = values.map(lambda v: v.get('$date') if isinstance(v, dict) else v)
+        frame = frame.set_index(pd.to_datetime(values))
+
+    if frame.index.tz is not None:
+        frame.index = frame.index.tz_localize(None)
+
+    return frame[[col for col in BAR_COLUMNS if col != 'timestamp' and col in frame.columns]]
+
+
+def _symbol_from_path(path: str) -> str:
+    return os.path.splitext(os.path.basename(path))[0].upper()
+
+
+def _read_json_export(path: str) -> pd.DataFrame:
+    """mongoexport 결과 (JSON lines 또는 JSON 배열)"""
+    with open(path, 'r', encoding='UTF-8') as f:
+        head = f.read(1)
+        f.seek(0)
+        if head == '[':
+            records = json.load(f)
+        else:
+            records = [json.loads(line) for line in f if line.strip()]
+    return pd.DataFrame(records)
+
+
+def ingest_files(store: MinuteBarStore, paths: Iterable[str], file_format: str = 'csv',
+                 symbol: Optional[str] = None) -> Dict[str, int]:
+    """
+    CSV / mongoexport JSON 파일 대량 적재
+
+    Args:
+        store: 대상 저장소
+        paths: 파일 경로들 (종목 코드 = 파일명, symbol/ticker 컬럼이 있으면 컬럼 우선)
+        file_format: 'csv' 또는 'json'
+        symbol: 모든 파일에 적용할 종목 코드 (선택)
+
+    Returns:
+        {종목: 기록한 분봉 수}
+    """
+    counts: Dict[str, int] = {}
+    for path in paths:
+        try:
+            raw = pd.read_csv(path) if file_format == 'csv' else _read_json_export(path)
+            raw.columns = [str(col) for col in raw.columns]
+            lower = {col.lower(): col for col in raw.columns}
+            symbol_col = lower.get('symbol') or lower.get('ticker')
+
+            if symbol is None and symbol_col is not None:
+                groups = raw.groupby(raw[symbol_col].astype(str))
+            else:
+                groups = [(symbol or _symbol_from_path(path), raw)]
+
+            for ticker, frame in groups:
+                written = store.write_symbol(ticker, normalize_bars(frame))
+                counts[ticker] = counts.get(ticker, 0) + written
+        except Exception as e:
+            logger.error(f"[MinuteBarStore] Failed to ingest {path}: {e}")
+
+    return counts
+
+
+def ingest_mongodb(store: MinuteBarStore, db_name: str, symbols: Optional[List[str]] = None,
+                   db_address: str = "MONGODB_LOCAL") -> Dict[str, int]:
+    """
+    MongoDB 분봉 DB (종목별 컬렉션) 대량 적재
+
+    Args:
+        db_name: 분봉 DB 이름 (예: NasDataBase_M)
+        symbols: 적재할 종목 (None이면 전체 컬렉션)
+    """
+    from .mongodb_operations import MongoDBOperations
+
+    mongo = MongoDBOperations(db_address)
+    try:
+        symbols = symbols or mongo.get_collection_names(db_name)
+        counts: Dict[str, int] = {}
+        projection = {'_id': 0, 'Date': 1, 'open': 1, 'high': 1, 'low': 1, 'close': 1, 'volume': 1}
+        for ticker in symbols:
+            frame = mongo.execute_query(db_name, ticker, projection=projection)
+            if frame.empty:
+                continue
+            frame.index = pd.to_datetime(frame.index)
+            counts[ticker] = store.write_symbol(ticker, normalize_bars(frame))
+        return counts
+    finally:
+        mongo.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Minute bar store tools")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    ingest = sub.add_parser('ingest', help="Bulk ingest CSV / mongoexport JSON / MongoDB minute bars")
+    ingest.add_argument('--root', required=True, help="Store root directory")
+    source = ingest.add_mutually_exclusive_group(required=True)
+    source.add_argument('--csv', nargs='+', metavar='FILE', help="CSV files (symbol = file name)")
+    source.add_argument('--json', nargs='+', metavar='FILE', help="mongoexport JSON files")
+    source.add_argument('--mongo-db', metavar='DB', help="MongoDB minute database (e.g. NasDataBase_M)")
+    ingest.add_argument('--symbol', help="Symbol for all files (CSV/JSON)")
+    ingest.add_argument('--symbols', nargs='+', help="Collections to ingest (MongoDB)")
+    ingest.add_argument('--db-address', default='MONGODB_LOCAL', help="Address key in myStockInfo.yaml")
+
+    info = sub.add_parser('info', help="Show stored symbols and partitions")
+    info.add_argument('--root', required=True, help="Store root directory")
+
+    args = parser.parse_args(argv)
+    store = MinuteBarStore(args.root)
+
+    if args.command == 'ingest':
+        if args.mongo_db:
+            counts = ingest_mongodb(store, args.mongo_db, args.symbols, args.db_address)
+        else:
+            file_format = 'csv' if args.csv else 'json'
+            counts = ingest_files(store, args.csv or args.json, file_format, args.symbol)
+        print(f"[MinuteBarStore] Ingested {sum(counts.values())} bars for {len(counts)} symbols into {args.root}")
+        return 0
+
+    for symbol in store.symbols():
+        months = store.months(symbol)
+        print(f"{symbol}: {len(months)} partitions ({months[0]} ~ {months[-1]})")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='[%(levelname)s] %(message)s'
+    )
+    raise SystemExit(main())
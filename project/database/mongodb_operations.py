@@ -6,16 +6,36 @@ Core MongoDB operations for trading data management
 
 import pandas as pd
 import pymongo
-import yaml
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, Optional, Union
-from pathlib import Path
-import os
+from typing import Dict, Any, List, Optional, Union
+
+from project.database.connection_registry import get_client, load_stock_info
+from project.database.data_versions import bump_data_versions
+from project.database.database_name_calculator import database_market
+from project.database.price_history_cache import PriceHistoryCache
+from project.database.timeseries_layout import (
+    LAYOUT_TIMESERIES, configured_layout, panel_exists, read_panel, write_panel
+)
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
+# Default number of concurrent collection reads in execute_query_bulk
+DEFAULT_READ_WORKERS = 8
+
+# Documents fetched per cursor round trip in bulk reads
+BULK_READ_BATCH_SIZE = 5000
+
+# Documents per insert_many call in bulk writes
+BULK_WRITE_BATCH_SIZE = 1000
+
+# Seconds before a "no time-series panel" result is checked again (migrate may create it later)
+PANEL_RECHECK_INTERVAL = 60
+
 class MongoDBOperations:
     """
     MongoDB operations class for trading data management
@@ -23,68 +43,45 @@ class MongoDBOperations:
     Data Agent has exclusive management of this class
     """
     
-    def __init__(self, db_address: str = "MONGODB_LOCAL"):
+    def __init__(self, db_address: str = "MONGODB_LOCAL", max_read_workers: int = DEFAULT_READ_WORKERS,
+                 data_layout: Optional[str] = None):
         """
         Initialize MongoDB Operations
 
         Args:
             db_address: Database address identifier in config
+            max_read_workers: Max concurrent collection reads in execute_query_bulk
+                              (shared by all callers of this instance)
+            data_layout: 'collection' (one collection per symbol) or 'timeseries'
+                         (migrated <db>_TS panel) for execute_query_bulk
+                         (default: global_settings.DATA_LAYOUT)
         """
         self.db_address = db_address
         self.stock_info = None
         self._load_config()
+        self.data_layout = data_layout or configured_layout()
 
-        # Single persistent connection (reuse throughout lifecycle)
+        # Bulk read pool (created on first bulk read, bounded for the whole instance)
+        self.max_read_workers = max(1, max_read_workers)
+        self._read_executor: Optional[ThreadPoolExecutor] = None
+        self._read_executor_lock = threading.Lock()
+
+        # {db_name: (time-series panel exists, checked at)} for write-through
+        self._panel_databases: Dict[str, tuple] = {}
+
+        # Process-wide shared connection (connection_registry)
         self._client = None
         self._connect()
     
     def _load_config(self):
-        """Load database configuration from myStockInfo.yaml"""
-        try:
-            # Try to find config file in project root
-            project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            config_path = os.path.join(project_root, 'myStockInfo.yaml')
-            
-            if os.path.exists(config_path):
-                with open(config_path, 'r', encoding='UTF-8') as f:
-                    self.stock_info = yaml.load(f, Loader=yaml.FullLoader)
-            else:
-                logger.warning(f"Configuration file not found at {config_path}")
-                # Create default configuration structure
-                self.stock_info = {
-                    self.db_address: "localhost",
-                    "MONGODB_PORT": 27017,
-                    "MONGODB_ID": "admin", 
-                    "MONGODB_PW": "password"
-                }
-                
-        except Exception as e:
-            logger.error(f"Error loading configuration: {e}")
-            # Default configuration
-            self.stock_info = {
-                self.db_address: "localhost",
-                "MONGODB_PORT": 27017,
-                "MONGODB_ID": "admin",
-                "MONGODB_PW": "password"
-            }
-    
+        """Load database configuration from myStockInfo.yaml (shared with the connection registry)"""
+        self.stock_info = load_stock_info()
+
     def _connect(self):
-        """Establish single persistent MongoDB connection"""
+        """Attach to the process-wide MongoDB client for this address"""
         try:
             if self._client is None:
-                self._client = pymongo.MongoClient(
-                    host=self.stock_info[self.db_address],
-                    port=self.stock_info["MONGODB_PORT"],
-                    username=self.stock_info["MONGODB_ID"],
-                    password=self.stock_info["MONGODB_PW"],
-                    maxPoolSize=10,
-                    minPoolSize=1,
-                    maxIdleTimeMS=10000,
-                    connectTimeoutMS=20000,
-                    serverSelectionTimeoutMS=20000,
-                    waitQueueTimeoutMS=5000
-                )
-                logger.info(f"MongoDB connection established to {self.stock_info[self.db_address]}")
+                self._client = get_client(self.db_address)
         except Exception as e:
             logger.error(f"Failed to connect to MongoDB: {e}")
             raise
@@ -96,11 +93,13 @@ class MongoDBOperations:
         return self._client
 
     def close(self):
-        """Close MongoDB connection"""
-        if self._client is not None:
-            self._client.close()
+        """Release this instance's resources (the shared client stays open for other users)"""
+        if getattr(self, '_read_executor', None) is not None:
+            self._read_executor.shutdown(wait=False)
+            self._read_executor = None
+        if getattr(self, '_client', None) is not None:
             self._client = None
-            logger.info("MongoDB connection closed")
+            logger.debug(f"MongoDB connection released ({self.db_address})")
 
     def __del__(self):
         """Cleanup on deletion"""
@@ -129,6 +128,7 @@ class MongoDBOperations:
             # Insert document into MongoDB
             collection.insert_one(df_data)
 
+            self._after_write(db_name, {renamed_stock: [df_data]})
             return True
             
         except Exception as e:
@@ -148,6 +148,13 @@ class MongoDBOperations:
         Returns:
             bool: Success status
         """
+        documents = self._update_stock_rows(db_name, df_data, stock)
+        if documents:
+            self._after_write(db_name, {"A" + stock: documents})
+        return documents is not None
+
+    def _update_stock_rows(self, db_name: str, df_data: dict, stock: str) -> Optional[List[dict]]:
+        """update_stock_db body: inserted documents (None on error)"""
         try:
             renamed_stock = "A" + stock
             
@@ -161,31 +168,133 @@ class MongoDBOperations:
             # Check if today's data already exists
             existing_data = collection.find_one({'Date': today})
             
+            documents = []
             if not existing_data:
-                # Get latest document
-                latest_document = collection.find().sort('Date', -1).limit(1)
-                
                 # Insert new data (this would normally get OHLCV data from Helper)
                 # For now, we'll insert the provided data
                 if isinstance(df_data, pd.DataFrame):
-                    df_data = df_data.reset_index()
-                    
-                    # Insert each row
-                    for index, row in df_data.iterrows():
-                        # Check if this date already exists
-                        if collection.find_one({'Date': row['Date']}):
-                            continue
-                        
-                        # Insert row
-                        collection.insert_one(row.to_dict())
+                    documents = self._insert_new_rows(collection, df_data.reset_index())
+                    logger.debug(f"Inserted {len(documents)} new rows for {stock} into {db_name}")
                 else:
                     # Insert single document
                     collection.insert_one(df_data)
-            return True
+                    documents = [df_data]
+            return documents
             
         except Exception as e:
             logger.error(f"Error updating stock DB for {stock}: {e}")
-            return False
+            return None
+
+    def update_stock_db_bulk(self, db_name: str, frames: Dict[str, pd.DataFrame],
+                             max_workers: Optional[int] = None) -> Dict[str, bool]:
+        """
+        Run update_stock_db for many symbols concurrently
+
+        Args:
+            db_name: Database name
+            frames: {stock: DataFrame of new bars}
+            max_workers: Concurrent symbols (default: max_read_workers)
+
+        Returns:
+            Dict[str, bool]: {stock: success}
+        """
+        if not frames:
+            return {}
+
+        workers = max(1, min(max_workers or self.max_read_workers, len(frames)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='mongo-write') as executor:
+            futures = {stock: executor.submit(self._update_stock_rows, db_name, df, stock)
+                       for stock, df in frames.items()}
+            inserted = {stock: future.result() for stock, future in futures.items()}
+
+        # One notification (data version bump) for the whole batch
+        written = {"A" + stock: documents for stock, documents in inserted.items() if documents}
+        if written:
+            self._after_write(db_name, written)
+
+        results = {stock: documents is not None for stock, documents in inserted.items()}
+        failed = [stock for stock, ok in results.items() if not ok]
+        logger.info(f"Bulk update {db_name}: {len(results) - len(failed)}/{len(results)} symbols updated")
+        return results
+
+    def _after_write(self, db_name: str, written: Dict[str, Optional[List[dict]]]):
+        """
+        Propagate stock collection writes/drops to derived stores
+
+        - Bumps the data version of the database's market and area
+          (BacktestResultCache keys include it, so earlier results are not reused)
+        - Drops price cache entries whose cached range reaches the earliest written date
+          (appends after the cached range are picked up by the delta sync)
+        - Writes the documents through to the time-series panel (<db>_TS) if the database is migrated
+          (panel existence is cached per database - a missing panel is re-checked every
+          PANEL_RECHECK_INTERVAL seconds and before drops - so unmigrated databases pay
+          almost no extra round trips)
+
+        Args:
+            db_name: Database name
+            written: {collection: inserted documents} (None = collection dropped)
+        """
+        market = database_market(db_name)
+        if market is not None:
+            try:
+                bump_data_versions(market)
+            except Exception as e:
+                logger.warning(f"Failed to bump data version for {db_name}: {e}")
+
+        # Group collections by earliest written date (None = drop the whole entry)
+        since_groups: Dict[Optional[datetime], List[str]] = {}
+        for collection_name, documents in written.items():
+            dates = [doc.get('Date') for doc in documents] if documents is not None else [None]
+            since = None if any(date is None for date in dates) else min(dates)
+            since_groups.setdefault(since, []).append(collection_name)
+
+        price_cache = PriceHistoryCache()
+        for since, collection_names in since_groups.items():
+            try:
+                price_cache.invalidate(db_name, collection_names, since=since)
+            except Exception as e:
+                logger.warning(f"Failed to invalidate price cache for {db_name}: {e}")
+
+        try:
+            conn = self._get_connection()
+            if self._has_panel(conn, db_name, refresh=any(docs is None for docs in written.values())):
+                write_panel(conn, db_name, written, checked=True)
+        except Exception as e:
+            logger.warning(f"Failed to write through to the time-series panel of {db_name}: {e}")
+
+    def _has_panel(self, conn, db_name: str, refresh: bool = False) -> bool:
+        """Cached panel_exists (positive results kept, negative ones re-checked after an interval)"""
+        cached = self._panel_databases.get(db_name)
+        now = time.monotonic()
+        if refresh or cached is None or (not cached[0] and now - cached[1] >= PANEL_RECHECK_INTERVAL):
+            cached = self._panel_databases[db_name] = (panel_exists(conn, db_name), now)
+        return cached[0]
+
+    @staticmethod
+    def _insert_new_rows(collection, df_data: pd.DataFrame, date_field: str = 'Date') -> List[dict]:
+        """
+        Insert rows whose date is not stored yet (returns the inserted documents)
+
+        One find for the stored dates in the frame's range, then unordered
+        insert_many batches (instead of find_one + insert_one per row).
+        """
+        if df_data.empty:
+            return []
+
+        dates = df_data[date_field]
+        stored = collection.find(
+            {date_field: {'$gte': dates.min(), '$lte': dates.max()}},
+            {'_id': 0, date_field: 1}
+        )
+        existing = {doc[date_field] for doc in stored if date_field in doc}
+
+        # Same-date rows inside the frame: first one wins (as with per-row checks)
+        new_rows = df_data[~dates.isin(existing) & ~dates.duplicated()]
+        documents = new_rows.to_dict('records')
+
+        for start in range(0, len(documents), BULK_WRITE_BATCH_SIZE):
+            collection.insert_many(documents[start:start + BULK_WRITE_BATCH_SIZE], ordered=False)
+        return documents
     
     def execute_query(self, db_name: str, collection_name: str, query: dict = None,
                      projection: dict = None, limit: int = None) -> pd.DataFrame:
@@ -238,6 +347,94 @@ class MongoDBOperations:
             logger.error(f"Error executing query on {db_name}.{collection_name}: {e}")
             return pd.DataFrame()
     
+    def execute_query_bulk(self, db_name: str, collection_names: List[str], query: dict = None,
+                           projection: dict = None, sort_field: str = 'Date') -> Dict[str, pd.DataFrame]:
+        """
+        Run the same query on many collections concurrently (one collection per symbol)
+
+        Reads run on a bounded thread pool (max_read_workers) over the shared MongoClient.
+        Documents are returned ordered by sort_field from the server, so no client-side
+        sort is needed; sort_field becomes the DataFrame index (same shape as execute_query).
+        With the 'timeseries' layout, a migrated database is read with a single query
+        over its time-series collection instead (timeseries_layout.read_panel); symbols
+        missing from the panel or ending before the newest bar of the result are re-read
+        from their own collections.
+
+        Args:
+            db_name: Database name
+            collection_names: Collection names (e.g. symbols)
+            query: Query filter applied to every collection
+            projection: Field projection
+            sort_field: Server-side ascending sort / index field
+
+        Returns:
+            Dict[str, pd.DataFrame]: {collection_name: DataFrame} (empty results omitted)
+        """
+        names = [name for name in dict.fromkeys(collection_names) if name and name.strip()]
+        if not names:
+            return {}
+
+        if self.data_layout == LAYOUT_TIMESERIES:
+            panel = read_panel(self._get_connection(), db_name, names, query, projection, sort_field)
+            if panel is not None:
+                latest = max((frame.index[-1] for frame in panel.values() if len(frame)), default=None)
+                stale = [name for name in names
+                         if name not in panel or (latest is not None and panel[name].index[-1] < latest)]
+                if not stale:
+                    return panel
+                logger.debug(f"{db_name}: {len(stale)} symbols missing or behind in the time-series panel, "
+                             f"reading their collections")
+                panel.update(self._read_collections(db_name, stale, query, projection, sort_field))
+                return {name: panel[name] for name in names if name in panel}
+            logger.debug(f"{db_name} has no time-series collection, reading per-symbol collections")
+
+        return self._read_collections(db_name, names, query, projection, sort_field)
+
+    def _read_collections(self, db_name: str, names: List[str], query: Optional[dict],
+                          projection: Optional[dict], sort_field: str) -> Dict[str, pd.DataFrame]:
+        """Per-symbol collection reads on the bounded pool (execute_query_bulk body)"""
+        db = self._get_connection()[db_name]
+        executor = self._get_read_executor()
+        futures = {
+            name: executor.submit(self._read_collection, db, name, query or {}, projection, sort_field)
+            for name in names
+        }
+
+        results = {}
+        for name, future in futures.items():
+            try:
+                data = future.result()
+            except Exception as e:
+                logger.debug(f"Error reading {db_name}.{name}: {e}")
+                continue
+            if not data.empty:
+                results[name] = data
+
+        return results
+
+    @staticmethod
+    def _read_collection(db, collection_name: str, query: dict, projection: Optional[dict],
+                         sort_field: str) -> pd.DataFrame:
+        """Single collection read for execute_query_bulk (server-side ordering)"""
+        cursor = db[collection_name.strip()].find(query, projection) \
+            .sort(sort_field, pymongo.ASCENDING).batch_size(BULK_READ_BATCH_SIZE)
+        data = pd.DataFrame(list(cursor))
+
+        if not data.empty and sort_field in data.columns:
+            data = data.set_index(sort_field)
+
+        return data
+
+    def _get_read_executor(self) -> ThreadPoolExecutor:
+        """Bounded read pool shared by all bulk reads of this instance"""
+        if self._read_executor is None:
+            with self._read_executor_lock:
+                if self._read_executor is None:
+                    self._read_executor = ThreadPoolExecutor(
+                        max_workers=self.max_read_workers, thread_name_prefix='mongo-read'
+                    )
+        return self._read_executor
+
     def get_latest_data(self, db_name: str, collection_name: str, date_field: str = 'Date') -> dict:
         """
         Get latest data from collection
@@ -328,6 +525,7 @@ class MongoDBOperations:
             db = conn[db_name]
             
             db[collection_name].drop()
+            self._after_write(db_name, {collection_name: None})
             return True
             
         except Exception as e:
@@ -415,7 +613,9 @@ class MongoDBOperations:
             'supported_operations': [
                 'make_stock_db',
                 'update_stock_db', 
+                'update_stock_db_bulk',
                 'execute_query',
+                'execute_query_bulk',
                 'get_latest_data',
                 'check_data_exists',
                 'get_collection_names',
@@ -0,0 +1,478 @@
+"""
+Price History Cache - Data Layer Implementation
+
+일봉/주봉 등 MongoDB 종목 컬렉션을 로컬 컬럼 파일(.npz, 종목당 1개)로 보관하고
+이후 조회에서는 캐시된 마지막 구간(overlap_rows) 이후 문서만 MongoDB에서 가져와 이어 붙인다.
+
+디렉토리 구조:
+    <root>/<DB_NAME>/manifest.json    캐시 버전 + 종목별 {rows, min_date, max_date, synced_at}
+    <root>/<DB_NAME>/<SYMBOL>.npz     Date 인덱스 + 컬럼 배열 (pickle 없음)
+
+동기화 규칙:
+- 캐시에 없는 종목: 컬렉션 전체 조회 후 저장
+- 요청 종료일이 캐시 max_date 이하: MongoDB 조회 없음
+- 그 외: 마지막 동기화 후 sync_interval 초가 지났으면 캐시 마지막 overlap_rows 행의 시작일부터 조회
+  → 겹치는 구간이 캐시와 다르면(수정/삭제/소급 입력) 해당 종목 전체 재조회 + 시장 데이터 버전 증가
+- 겹치는 구간보다 오래된 문서의 수정은 쓰기 경로가 알린다:
+  MongoDBOperations 쓰기/삭제가 invalidate(db, symbols, since)를 호출 (캐시 max_date >= since 항목 삭제)
+  외부 도구로 DB를 고친 경우 invalidate 명령으로 해당 DB/종목 삭제
+- manifest는 파일 mtime이 바뀌면 다시 읽는다 (다른 프로세스의 invalidate 반영)
+
+캐시에는 모든 필드를 저장하고, projection은 로컬에서 컬럼 선택으로 적용한다.
+
+사용법:
+    python -m project.database.price_history_cache warm --market US --area US --types AD W
+    python -m project.database.price_history_cache info
+    python -m project.database.price_history_cache invalidate --db NasDataBase_D --symbols AAPL
+"""
+
+import os
+import json
+import time
+import argparse
+import threading
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import logging
+
+from project.database.data_versions import bump_data_versions
+from project.database.database_name_calculator import database_market
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = os.path.join('outputs', 'cache', 'price_history')
+
+# 과거 값이 바뀌지 않는 시계열 데이터 타입만 캐시 (calculate_database_name 코드)
+CACHED_DATA_TYPES = ('AD', 'W')
+
+# 마지막 동기화 후 이 시간(초) 안에는 delta 조회 생략 (0 = 매번 delta 조회)
+DEFAULT_SYNC_INTERVAL = 3600
+
+# delta 조회 시 다시 가져와 캐시와 비교하는 마지막 행 수 (과거 데이터 수정 감지)
+DEFAULT_OVERLAP_ROWS = 5
+
+_MANIFEST_FILE = 'manifest.json'
+_ENTRY_SUFFIX = '.npz'
+
+
+# ===== COLUMN ENCODING =====
+def _encode_frame(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    DataFrame → npz 배열 (allow_pickle=False로 읽을 수 있는 타입만)
+
+    숫자/불리언/날짜 컬럼은 그대로, 그 외(문자열 등)는 문자열 배열 + null 마스크로 저장한다.
+    """
+    columns, kinds = [], []
+    arrays = {'index': df.index.to_numpy(dtype='datetime64[ns]')}
+
+    for i, name in enumerate(df.columns):
+        values = df[name]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            kind = 'datetime'
+            arrays[f'c{i}'] = values.to_numpy(dtype='datetime64[ns]')
+        elif pd.api.types.is_bool_dtype(values) or pd.api.types.is_numeric_dtype(values):
+            kind = 'numeric'
+            arrays[f'c{i}'] = values.to_numpy()
+        elif pd.api.types.infer_dtype(values, skipna=True) in ('floating', 'integer', 'mixed-integer-float',
+                                                                'decimal', 'boolean', 'empty'):
+            kind = 'numeric'
+            arrays[f'c{i}'] = pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64)
+        else:
+            kind = 'string'
+            mask = values.isna().to_numpy()
+            arrays[f'c{i}'] = np.where(mask, '', values.astype(str).to_numpy()).astype(str)
+            arrays[f'm{i}'] = mask
+        columns.append(str(name))
+        kinds.append(kind)
+
+    arrays['meta'] = np.array(json.dumps({'version': CACHE_VERSION, 'columns': columns, 'kinds': kinds}))
+    return arrays
+
+
+def _decode_frame(arrays) -> pd.DataFrame:
+    """npz 배열 → DataFrame (Date 인덱스)"""
+    meta = json.loads(str(arrays['meta']))
+    data = {}
+    for i, (name, kind) in enumerate(zip(meta['columns'], meta['kinds'])):
+        values = arrays[f'c{i}']
+        if kind == 'string':
+            values = pd.Series(values, dtype=object).where(~arrays[f'm{i}'], None).to_numpy()
+        data[name] = values
+
+    index = pd.DatetimeIndex(arrays['index'], name='Date')
+    return pd.DataFrame(data, index=index, columns=meta['columns'])
+
+
+def _same_rows(cached: pd.DataFrame, fetched: pd.DataFrame) -> bool:
+    """겹치는 구간 비교: 날짜와 MongoDB 문서의 모든 필드 값이 캐시와 같은지"""
+    if not cached.index.equals(fetched.index):
+        return False
+    if not set(fetched.columns) <= set(cached.columns):
+        return False
+    return cached[list(fetched.columns)].astype(object).equals(fetched.astype(object))
+
+
+def _clean_documents(df: pd.DataFrame) -> pd.DataFrame:
+    """MongoDB 조회 결과 정리: _id 제거, 날짜 인덱스 정렬/중복 제거 (나중 문서 우선)"""
+    if '_id' in df.columns:
+        df = df.drop(columns='_id')
+    df.index = pd.DatetimeIndex(df.index, name='Date')
+    df = df[~df.index.duplicated(keep='last')]
+    return df.sort_index()
+
+
+# ===== CACHE =====
+class PriceHistoryCache:
+    """
+    MongoDB 종목 컬렉션의 로컬 컬럼 캐시 (delta 동기화)
+
+    read()는 DataFrameGenerator의 MongoDB 조회와 같은 {symbol: DataFrame}을 반환한다.
+    스레드 간 공유 가능 (manifest 갱신은 DB별 lock).
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, sync_interval: float = DEFAULT_SYNC_INTERVAL,
+                 overlap_rows: int = DEFAULT_OVERLAP_ROWS):
+        """
+        Args:
+            cache_dir: 캐시 루트 디렉토리
+            sync_interval: delta 조회 최소 간격 (초, 0 = 종료일이 캐시 범위 밖이면 매번 조회)
+            overlap_rows: delta 조회 시 다시 가져와 비교할 캐시 마지막 행 수 (1 이상)
+        """
+        self.cache_dir = cache_dir
+        self.sync_interval = sync_interval
+        self.overlap_rows = max(1, overlap_rows)
+        self._manifests: Dict[str, Dict] = {}
+        self._manifest_mtimes: Dict[str, Optional[float]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    # ===== READ =====
+    def read(self, db, db_name: str, symbols: List[str], start: Optional[datetime] = None,
+             end: Optional[datetime] = None, projection: Optional[dict] = None) -> Dict[str, pd.DataFrame]:
+        """
+        캐시 우선 조회 (필요 시 MongoDB delta 동기화)
+
+        Args:
+            db: MongoDBOperations (execute_query_bulk 사용)
+            db_name: Database name
+            symbols: Collection names (symbols)
+            start: Start date (inclusive)
+            end: End date (inclusive)
+            projection: Field projection (로컬 컬럼 선택으로 적용)
+
+        Returns:
+            {symbol: DataFrame} (데이터 없는 종목 제외)
+        """
+        frames = self.sync(db, db_name, symbols, end)
+
+        results = {}
+        for symbol, df in frames.items():
+            if df.empty:
+                continue
+            df = df.loc[pd.Timestamp(start) if start is not None else None:
+                        pd.Timestamp(end) if end is not None else None]
+            if projection:
+                df = df[[column for column in df.columns if projection.get(column)]]
+            if not df.empty:
+                results[symbol] = df
+        return results
+
+    def sync(self, db, db_name: str, symbols: List[str], end: Optional[datetime] = None) -> Dict[str, pd.DataFrame]:
+        """
+        종목별 캐시를 end까지 최신화하고 전체 기간 DataFrame 반환
+
+        Returns:
+            {symbol: DataFrame} (데이터 없는 종목은 빈 DataFrame)
+        """
+        with self._db_lock(db_name):
+            entries = self._load_manifest(db_name)['symbols']
+            now = time.time()
+            frames, full_fetch, rewritten = {}, [], []
+            delta_groups: Dict[Optional[pd.Timestamp], List[str]] = defaultdict(list)
+
+            for symbol in dict.fromkeys(symbols):
+                entry = entries.get(symbol)
+                df = self._load_entry(db_name, symbol, entry)
+                if df is None:
+                    full_fetch.append(symbol)
+                    continue
+
+                frames[symbol] = df
+                max_date = entry['max_date']
+                if end is not None and max_date is not None and pd.Timestamp(end) <= pd.Timestamp(max_date):
+                    continue  # 요청 기간 전체가 캐시에 있음
+                if now - entry['synced_at'] < self.sync_interval:
+                    continue
+                overlap_start = df.index[max(0, len(df) - self.overlap_rows)] if len(df) else None
+                delta_groups[overlap_start].append(symbol)
+
+            # 같은 겹침 시작일 종목끼리 한 번의 bulk 조회
+            for overlap_start, group in delta_groups.items():
+                query = {'Date': {'$gte': overlap_start.to_pydatetime()}} if overlap_start is not None else {}
+                fetched = db.execute_query_bulk(db_name=db_name, collection_names=group, query=query)
+                for symbol in group:
+                    cached = frames[symbol]
+                    rows = _clean_documents(fetched[symbol]) if symbol in fetched else pd.DataFrame()
+                    if overlap_start is None:
+                        new_rows = rows
+                    else:
+                        max_date = cached.index[-1]
+                        if rows.empty or not _same_rows(cached.loc[overlap_start:], rows.loc[:max_date]):
+                            rewritten.append(symbol)  # 겹치는 구간이 수정/삭제됨
+                            continue
+                        new_rows = rows.loc[rows.index > max_date]
+
+                    if new_rows.empty:
+                        entries[symbol]['synced_at'] = now
+                        continue
+                    df = _clean_documents(pd.concat([cached, new_rows])) if len(cached) else new_rows
+                    frames[symbol] = df
+                    entries[symbol] = self._write_entry(db_name, symbol, df, now)
+
+            if full_fetch or rewritten:
+                fetched = db.execute_query_bulk(db_name=db_name, collection_names=full_fetch + rewritten)
+                for symbol in full_fetch + rewritten:
+                    df = _clean_documents(fetched[symbol]) if symbol in fetched else pd.DataFrame()
+                    frames[symbol] = df
+                    entries[symbol] = self._write_entry(db_name, symbol, df, now)
+
+            if full_fetch or delta_groups:
+                self._save_manifest(db_name)
+                logger.info(f"Price cache {db_name}: {len(full_fetch)} full, "
+                            f"{sum(len(group) for group in delta_groups.values())} delta "
+                            f"({len(rewritten)} rewritten), {len(frames) - len(full_fetch)} cached symbols")
+
+        if rewritten:
+            # MongoDB가 쓰기 경로 밖에서 수정됨 → 이 데이터로 만든 백테스트 결과도 무효
+            logger.warning(f"Price cache {db_name}: history changed for {len(rewritten)} symbols, refetched")
+            _bump_market_version(db_name)
+
+        return frames
+
+    # ===== MAINTENANCE =====
+    def invalidate(self, db_name: Optional[str] = None, symbols: Optional[List[str]] = None,
+                   since: Optional[datetime] = None) -> int:
+        """
+        캐시 항목 삭제 (과거 데이터 수정/재적재 후 호출)
+
+        Args:
+            db_name: Database name (None이면 모든 DB)
+            symbols: 삭제할 종목 (None이면 DB 전체)
+            since: 수정된 가장 이른 날짜 - 캐시 max_date가 이보다 이른 항목은 delta 동기화로
+                   충분하므로 유지 (None이면 무조건 삭제)
+
+        Returns:
+            삭제된 종목 수
+        """
+        removed = 0
+        for name in ([db_name] if db_name else self.databases()):
+            if not os.path.exists(os.path.join(self.cache_dir, name, _MANIFEST_FILE)):
+                continue
+            with self._db_lock(name):
+                entries = self._load_manifest(name)['symbols']
+                targets = []
+                for symbol in list(symbols if symbols is not None else entries):
+                    entry = entries.get(symbol)
+                    if (since is not None and entry is not None and entry['max_date'] is not None
+                            and pd.Timestamp(entry['max_date']) < pd.Timestamp(since)):
+                        continue
+                    targets.append(symbol)
+                for symbol in targets:
+                    if entries.pop(symbol, None) is not None:
+                        removed += 1
+                    self._remove(self._entry_path(name, symbol))
+                if targets:
+                    self._save_manifest(name)
+
+        if removed:
+            logger.info(f"Price cache invalidated ({db_name or 'all databases'}): {removed} symbols removed")
+        return removed
+
+    def databases(self) -> List[str]:
+        """캐시된 DB 목록"""
+        if not os.path.isdir(self.cache_dir):
+            return []
+        return sorted(name for name in os.listdir(self.cache_dir)
+                      if os.path.exists(os.path.join(self.cache_dir, name, _MANIFEST_FILE)))
+
+    def stats(self) -> Dict[str, Dict]:
+        """DB별 종목 수/용량/최신 날짜"""
+        stats = {}
+        for name in self.databases():
+            entries = self._load_manifest(name)['symbols']
+            directory = os.path.join(self.cache_dir, name)
+            stats[name] = {
+                'symbols': len(entries),
+                'bytes': sum(os.path.getsize(os.path.join(directory, file)) for file in os.listdir(directory)),
+                'max_date': max((entry['max_date'] for entry in entries.values() if entry['max_date']), default=None),
+            }
+        return stats
+
+    # ===== STORAGE =====
+    def _db_lock(self, db_name: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(db_name, threading.Lock())
+
+    def _entry_path(self, db_name: str, symbol: str) -> str:
+        return os.path.join(self.cache_dir, db_name, symbol + _ENTRY_SUFFIX)
+
+    def _load_entry(self, db_name: str, symbol: str, entry: Optional[Dict]) -> Optional[pd.DataFrame]:
+        """캐시된 종목 DataFrame (없거나 읽을 수 없으면 None, 데이터 없는 종목은 빈 DataFrame)"""
+        if entry is None:
+            return None
+        if entry['rows'] == 0:
+            return pd.DataFrame()
+
+        path = self._entry_path(db_name, symbol)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                return _decode_frame(data)
+        except Exception as e:
+            logger.warning(f"Failed to read price cache entry {path}: {e}")
+            return None
+
+    def _write_entry(self, db_name: str, symbol: str, df: pd.DataFrame, synced_at: float) -> Dict:
+        """종목 파일 저장 (임시 파일에 쓴 뒤 교체) 후 manifest 항목 반환"""
+        path = self._entry_path(db_name, symbol)
+        if df.empty:
+            self._remove(path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, **_encode_frame(df))
+            os.replace(tmp_path, path)
+
+        return {
+            'rows': len(df),
+            'min_date': str(df.index[0]) if len(df) else None,
+            'max_date': str(df.index[-1]) if len(df) else None,
+            'synced_at': synced_at,
+        }
+
+    def _load_manifest(self, db_name: str) -> Dict:
+        path = os.path.join(self.cache_dir, db_name, _MANIFEST_FILE)
+        mtime = os.path.getmtime(path) if os.path.exists(path) else None
+
+        # 다른 프로세스가 manifest를 바꾸지 않았으면 메모리 사본 사용
+        manifest = self._manifests.get(db_name)
+        if manifest is not None and self._manifest_mtimes.get(db_name) == mtime:
+            return manifest
+
+        manifest = {'version': CACHE_VERSION, 'symbols': {}}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    stored = json.load(f)
+                if stored.get('version') == CACHE_VERSION:
+                    manifest = stored
+                else:
+                    logger.info(f"Price cache {db_name}: version changed, rebuilding")
+            except Exception as e:
+                logger.warning(f"Failed to read price cache manifest {path}: {e}")
+
+        self._manifests[db_name] = manifest
+        self._manifest_mtimes[db_name] = mtime
+        return manifest
+
+    def _save_manifest(self, db_name: str):
+        directory = os.path.join(self.cache_dir, db_name)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, _MANIFEST_FILE)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._manifests[db_name], f, sort_keys=True)
+        os.replace(tmp_path, path)
+        self._manifest_mtimes[db_name] = os.path.getmtime(path)
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _bump_market_version(db_name: str):
+    """DB 시장의 데이터 버전 증가 (BacktestResultCache 키 무효화)"""
+    market = database_market(db_name)
+    if market is not None:
+        bump_data_versions(market)
+
+
+# ===== CLI =====
+def warm_cache(cache: PriceHistoryCache, market: str, area: str, data_types: List[str],
+               symbols: Optional[List[str]] = None, db_address: str = 'MONGODB_LOCAL') -> Dict[str, int]:
+    """
+    유니버스 전체 캐시 미리 채우기
+
+    Returns:
+        {db_name: 캐시된 종목 수}
+    """
+    from project.database.mongodb_operations import MongoDBOperations
+    from project.database.database_name_calculator import calculate_database_name
+
+    db = MongoDBOperations(db_address=db_address)
+    counts = {}
+    try:
+        for data_type in data_types:
+            db_name = calculate_database_name(market, area, data_type, 'Stock')
+            names = symbols or db.get_collection_names(db_name)
+            frames = cache.sync(db, db_name, names, end=datetime.now())
+            counts[db_name] = sum(1 for df in frames.values() if not df.empty)
+            logger.info(f"Warmed {db_name}: {counts[db_name]}/{len(names)} symbols")
+    finally:
+        db.close()
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Price history cache tools")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help="Cache root directory")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    warm = sub.add_parser('warm', help="Fetch / delta-sync every symbol of the market databases")
+    warm.add_argument('--market', default='US', help="Market identifier")
+    warm.add_argument('--area', default='US', help="Market area")
+    warm.add_argument('--types', nargs='+', default=list(CACHED_DATA_TYPES), help="Data types (AD, W, ...)")
+    warm.add_argument('--symbols', nargs='+', help="Symbols (default: every collection)")
+    warm.add_argument('--db-address', default='MONGODB_LOCAL', help="Address key in myStockInfo.yaml")
+
+    sub.add_parser('info', help="Show cached databases")
+
+    invalidate = sub.add_parser('invalidate', help="Drop cached symbols (after historical data changes)")
+    invalidate.add_argument('--db', help="Database name (default: all)")
+    invalidate.add_argument('--symbols', nargs='+', help="Symbols (default: whole database)")
+
+    args = parser.parse_args(argv)
+    # 미리 채우기는 항상 최신 데이터까지 동기화
+    cache = PriceHistoryCache(args.cache_dir, sync_interval=0)
+
+    if args.command == 'warm':
+        counts = warm_cache(cache, args.market, args.area, args.types, args.symbols, args.db_address)
+        for db_name, count in counts.items():
+            print(f"[PriceHistoryCache] {db_name}: {count} symbols cached")
+        return 0
+
+    if args.command == 'invalidate':
+        removed = cache.invalidate(args.db, args.symbols)
+        print(f"[PriceHistoryCache] Removed {removed} symbols")
+        return 0
+
+    for db_name, stats in cache.stats().items():
+        print(f"{db_name}: {stats['symbols']} symbols, {stats['bytes'] / 1024 / 1024:.1f} MB, "
+              f"latest {stats['max_date']}")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='[%(levelname)s] %(message)s'
+    )
+    raise SystemExit(main())
@@ -0,0 +1,449 @@
+"""
+Symbol Directory - Data Layer Implementation
+
+종목 → 거래소/보유 데이터 타입/기간/유동성 정보를 로컬 파일 하나에 보관한다.
+유니버스 선택(get_symbols_from_mongodb), DB 라우팅(find_database, 전날 종가 조회),
+거래소 라우팅(KIS get_market_code_us)이 list_collection_names 스캔/거래소 HTTP 조회 대신 사용한다.
+
+파일: outputs/cache/symbol_directory.json
+    {'version', 'refreshed_at', 'symbols': {SYMBOL: {exchange, data_types, first_date, last_date,
+                                                    rows, last_close, avg_volume, avg_dollar_volume}}}
+
+갱신 규칙 (refresh):
+- 거래소 × 데이터 타입 DB마다 list_collection_names 한 번 → 종목별 거래소/데이터 타입
+- 종목마다 일봉(D) 최근 LIQUIDITY_WINDOW개 문서 조회 (Date 인덱스) → last_date가 그대로면 나머지 생략
+- last_date가 바뀐 종목/새 종목만 first_date, 문서 수, 유동성 재계산
+- 더 이상 어떤 DB에도 없는 종목은 삭제
+- 한 종목의 일봉이 여러 거래소 DB에 있으면 (거래소 이전) 마지막 일봉 날짜가 가장 최근인 거래소,
+  날짜가 같으면 US_EXCHANGES 순서(NAS → NYS → AMX)의 첫 거래소
+
+갱신은 유니버스 선택 경로가 아니라 CLI(refresh)를 cron 등으로 주기 실행해 수행한다.
+get_symbol_directory()는 기본적으로 파일만 읽고, 파일이 없을 때만 호출 측이 한 번 생성한다.
+
+사용법:
+    python -m project.database.symbol_directory refresh
+    python -m project.database.symbol_directory info
+    python -m project.database.symbol_directory lookup AAPL IBM
+"""
+
+import os
+import json
+import time
+import argparse
+import dataclasses
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+import pymongo
+import logging
+
+from project.database.connection_registry import get_client
+from project.database.database_name_calculator import calculate_database_name
+
+logger = logging.getLogger(__name__)
+
+DIRECTORY_VERSION = 1
+DEFAULT_DIRECTORY_PATH = os.path.join('outputs', 'cache', 'symbol_directory.json')
+
+# 권장 갱신 주기(초) - 이보다 오래된 디렉토리는 유니버스 선택 시 경고
+DEFAULT_REFRESH_INTERVAL = 6 * 3600
+
+US_EXCHANGES = ('NAS', 'NYS', 'AMX')
+DIRECTORY_DATA_TYPES = ('D', 'AD', 'W', 'RS', 'E', 'F')
+
+# 기간/유동성 기준 데이터 타입
+PRIMARY_DATA_TYPE = 'D'
+LIQUIDITY_WINDOW = 20
+
+# DB 거래소 코드 → KIS 해외주식 거래소 코드
+KIS_EXCHANGE_CODES = {'NAS': 'NASD', 'NYS': 'NYSE', 'AMX': 'AMEX'}
+
+DEFAULT_WORKERS = 8
+
+
+@dataclasses.dataclass
+class SymbolRecord:
+    """종목 하나의 디렉토리 정보"""
+    symbol: str
+    exchange: str
+    data_types: List[str]
+    first_date: Optional[str] = None
+    last_date: Optional[str] = None
+    rows: int = 0
+    last_close: Optional[float] = None
+    avg_volume: Optional[float] = None
+    avg_dollar_volume: Optional[float] = None
+
+
+def _database_name(exchange: str, area: str, data_type: str) -> Optional[str]:
+    """calculate_database_name (알 수 없는 조합이면 None)"""
+    name = calculate_database_name(exchange, area, data_type)
+    return None if name.startswith('Unknown_') else name
+
+
+def _is_symbol_collection(name: str) -> bool:
+    return bool(name) and not name.startswith(('_', 'system.'))
+
+
+def _date_string(value) -> Optional[str]:
+    return value.strftime('%Y-%m-%d') if hasattr(value, 'strftime') else None
+
+
+def _float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class SymbolDirectory:
+    """
+    영속 종목 디렉토리
+
+    load()는 JSON 파일 하나만 읽으므로 MongoDB 연결 없이 수 ms 안에 끝난다.
+    refresh()는 바뀐 종목만 다시 계산해 저장한다.
+    """
+
+    def __init__(self, path: str = DEFAULT_DIRECTORY_PATH, exchanges: Iterable[str] = US_EXCHANGES,
+                 data_types: Iterable[str] = DIRECTORY_DATA_TYPES):
+        """
+        Args:
+            path: Directory file (JSON)
+            exchanges: Exchange codes to scan, in routing priority order
+            data_types: Database data types to record per symbol
+        """
+        self.path = path
+        self.exchanges = tuple(exchanges)
+        self.data_types = tuple(data_types)
+        self.refreshed_at: Optional[float] = None
+        self._records: Dict[str, SymbolRecord] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._records
+
+    # ===== LOOKUP =====
+    def get(self, symbol: str) -> Optional[SymbolRecord]:
+        return self._records.get(symbol)
+
+    def exchange(self, symbol: str) -> Optional[str]:
+        """DB 거래소 코드 (NAS/NYS/AMX), 모르는 종목이면 None"""
+        record = self._records.get(symbol)
+        return record.exchange if record else None
+
+    def kis_exchange(self, symbol: str) -> Optional[str]:
+        """KIS 거래소 코드 (NASD/NYSE/AMEX), 모르는 종목이면 None"""
+        return KIS_EXCHANGE_CODES.get(self.exchange(symbol))
+
+    def database(self, symbol: str, data_type: str, area: str = 'US') -> Optional[str]:
+        """
+        종목의 데이터 타입별 DB 이름 (예: AAPL, 'D' → NasDataBase_D)
+
+        디렉토리가 스캔한 데이터 타입이면 실제로 컬렉션이 있을 때만, 그 외(M 등)는 거래소 기준으로 반환한다.
+        """
+        record = self._records.get(symbol)
+        if record is None:
+            return None
+        if data_type in self.data_types and data_type not in record.data_types:
+            return None
+        return _database_name(record.exchange, area, data_type)
+
+    def symbols(self, exchanges: Optional[Iterable[str]] = None, data_type: Optional[str] = PRIMARY_DATA_TYPE,
+                min_rows: int = 0, min_dollar_volume: Optional[float] = None) -> List[str]:
+        """
+        조건에 맞는 종목 목록 (정렬됨)
+
+        Args:
+            exchanges: Exchange codes (default: all)
+            data_type: Required data type (None = any)
+            min_rows: Minimum primary (daily) document count
+            min_dollar_volume: Minimum average daily dollar volume
+        """
+        wanted = set(exchanges) if exchanges else None
+        selected = []
+        for symbol, record in self._records.items():
+            if wanted is not None and record.exchange not in wanted:
+                continue
+            if data_type and data_type not in record.data_types:
+                continue
+            if record.rows < min_rows:
+                continue
+            if min_dollar_volume is not None and (record.avg_dollar_volume or 0.0) < min_dollar_volume:
+                continue
+            selected.append(symbol)
+        return sorted(selected)
+
+    def age(self) -> Optional[float]:
+        """마지막 갱신 후 경과 시간(초), 갱신한 적 없으면 None"""
+        return None if self.refreshed_at is None else time.time() - self.refreshed_at
+
+    # ===== PERSISTENCE =====
+    def load(self) -> bool:
+        """디렉토리 파일 읽기 (없거나 버전이 다르면 False)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning(f"Failed to read symbol directory {self.path}: {e}")
+            return False
+
+        if stored.get('version') != DIRECTORY_VERSION:
+            logger.info(f"Symbol directory version mismatch ({stored.get('version')}), ignoring {self.path}")
+            return False
+
+        fields = {field.name for field in dataclasses.fields(SymbolRecord)}
+        with self._lock:
+            self._records = {
+                symbol: SymbolRecord(symbol=symbol, **{k: v for k, v in entry.items() if k in fields and k != 'symbol'})
+                for symbol, entry in stored.get('symbols', {}).items()
+            }
+            self.refreshed_at = stored.get('refreshed_at')
+        return True
+
+    def save(self):
+        """디렉토리 파일 쓰기 (임시 파일 → rename)"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._lock:
+            payload = {
+                'version': DIRECTORY_VERSION,
+                'refreshed_at': self.refreshed_at,
+                'symbols': {
+                    symbol: {k: v for k, v in dataclasses.asdict(record).items() if k != 'symbol'}
+                    for symbol, record in sorted(self._records.items())
+                },
+            }
+
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+    # ===== REFRESH =====
+    def refresh(self, client: Optional[pymongo.MongoClient] = None, area: str = 'US',
+                max_workers: int = DEFAULT_WORKERS, force: bool = False) -> Dict[str, int]:
+        """
+        MongoDB에서 증분 갱신 후 저장
+
+        Args:
+            client: MongoClient (default: shared MONGODB_LOCAL client)
+            area: Market area passed to calculate_database_name
+            max_workers: Concurrent symbol queries
+            force: Recompute every symbol even if its last date is unchanged
+
+        Returns:
+            {'added', 'updated', 'unchanged', 'removed'} counts
+        """
+        client = client or get_client('MONGODB_LOCAL')
+
+        # 1) 거래소/데이터 타입별 컬렉션 목록 → 종목별 (거래소, 데이터 타입)
+        membership: Dict[str, Dict[str, List[str]]] = {}
+        for exchange in self.exchanges:
+            for data_type in self.data_types:
+                db_name = _database_name(exchange, area, data_type)
+                if not db_name:
+                    continue
+                for name in client[db_name].list_collection_names():
+                    if _is_symbol_collection(name):
+                        membership.setdefault(name, {}).setdefault(exchange, []).append(data_type)
+
+        # 일봉이 있는 거래소들 (US_EXCHANGES 순서), 없으면 컬렉션이 있는 첫 거래소
+        placements: Dict[str, List[str]] = {}
+        for symbol, by_exchange in membership.items():
+            daily = [e for e in self.exchanges if PRIMARY_DATA_TYPE in by_exchange.get(e, ())]
+            placements[symbol] = daily or [next(e for e in self.exchanges if e in by_exchange)]
+
+        # 2) 종목별 거래소 확정 + 기간/유동성 (last_date가 바뀐 종목만 재계산)
+        previous = dict(self._records)
+
+        def build(item) -> tuple:
+            symbol, candidates = item
+            old = previous.get(symbol)
+            exchange = candidates[0]
+            try:
+                if len(candidates) > 1:
+                    exchange = self._latest_exchange(client, area, symbol, candidates)
+                if old is not None and old.exchange != exchange:
+                    old = None
+                data_types = [t for t in self.data_types if t in membership[symbol][exchange]]
+                return self._build_record(client, area, symbol, exchange, data_types, None if force else old)
+            except Exception as e:
+                logger.debug(f"Failed to refresh {symbol}: {e}")
+                if old is None or old.exchange not in candidates:
+                    old = SymbolRecord(symbol, exchange, [t for t in self.data_types if t in membership[symbol][exchange]])
+                return old, 'unchanged'
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='symbol-dir') as executor:
+            results = list(executor.map(build, placements.items()))
+
+        counts = {'added': 0, 'updated': 0, 'unchanged': 0,
+                  'removed': sum(1 for symbol in previous if symbol not in placements)}
+        records = {}
+        for record, status in results:
+            records[record.symbol] = record
+            counts['added' if record.symbol not in previous else status] += 1
+
+        with self._lock:
+            self._records = records
+            self.refreshed_at = time.time()
+        self.save()
+
+        logger.info(f"Symbol directory refreshed: {len(records)} symbols "
+                    f"(+{counts['added']} ~{counts['updated']} -{counts['removed']})")
+        return counts
+
+    def _latest_exchange(self, client: pymongo.MongoClient, area: str, symbol: str,
+                         candidates: List[str]) -> str:
+        """
+        일봉이 여러 거래소 DB에 있는 종목의 현재 거래소
+
+        거래소를 옮긴 종목은 이전 거래소 컬렉션이 갱신되지 않으므로 마지막 일봉 날짜가
+        가장 최근인 거래소를 고른다 (같으면 candidates 순서).
+        """
+        last_dates = {}
+        for exchange in candidates:
+            collection = client[_database_name(exchange, area, PRIMARY_DATA_TYPE)][symbol]
+            latest = collection.find_one({}, {'_id': 0, 'Date': 1}, sort=[('Date', pymongo.DESCENDING)])
+            last_dates[exchange] = (_date_string(latest.get('Date')) if latest else None) or ''
+
+        exchange = max(candidates, key=lambda e: (last_dates[e], -candidates.index(e)))
+        logger.debug(f"{symbol} has daily data on {candidates}, using {exchange} (last {last_dates[exchange]})")
+        return exchange
+
+    def _build_record(self, client: pymongo.MongoClient, area: str, symbol: str, exchange: str,
+                      data_types: List[str], old: Optional[SymbolRecord]) -> tuple:
+        """(SymbolRecord, 'updated' | 'unchanged')"""
+        record = SymbolRecord(symbol, exchange, data_types)
+        if PRIMARY_DATA_TYPE not in data_types:
+            return record, 'updated' if old != record else 'unchanged'
+
+        collection = client[_database_name(exchange, area, PRIMARY_DATA_TYPE)][symbol]
+        recent = list(collection.find({}, {'_id': 0, 'Date': 1, 'close': 1, 'volume': 1})
+                      .sort('Date', pymongo.DESCENDING).limit(LIQUIDITY_WINDOW))
+        if not recent:
+            return record, 'updated' if old != record else 'unchanged'
+
+        last_date = _date_string(recent[0].get('Date'))
+        if old is not None and old.last_date == last_date and old.data_types == data_types:
+            return old, 'unchanged'
+
+        first = collection.find_one({}, {'_id': 0, 'Date': 1}, sort=[('Date', pymongo.ASCENDING)])
+        closes = [_float(doc.get('close')) for doc in recent]
+        volumes = [_float(doc.get('volume')) for doc in recent]
+        pairs = [(c, v) for c, v in zip(closes, volumes) if c is not None and v is not None]
+
+        record.first_date = _date_string(first.get('Date')) if first else None
+        record.last_date = last_date
+        record.rows = collection.estimated_document_count()
+        record.last_close = closes[0]
+        if pairs:
+            record.avg_volume = sum(v for _, v in pairs) / len(pairs)
+            record.avg_dollar_volume = sum(c * v for c, v in pairs) / len(pairs)
+        return record, 'updated'
+
+
+# ===== SHARED INSTANCE =====
+_shared_directory: Optional[SymbolDirectory] = None
+_shared_lock = threading.Lock()
+
+
+def get_symbol_directory(max_age: Optional[float] = None,
+                         path: str = DEFAULT_DIRECTORY_PATH) -> SymbolDirectory:
+    """
+    프로세스 공유 디렉토리 (처음 호출 시 파일 로드)
+
+    Args:
+        max_age: Refresh from MongoDB when older than this many seconds
+                 (None = never refresh; file only. Scheduled CLI refresh keeps the file current)
+        path: Directory file
+
+    갱신이 실패하면 기존(오래된) 내용을 그대로 사용한다. 내용이 전혀 없으면 예외를 올린다.
+    """
+    global _shared_directory
+    with _shared_lock:
+        if _shared_directory is None or _shared_directory.path != path:
+            _shared_directory = SymbolDirectory(path)
+            _shared_directory.load()
+        directory = _shared_directory
+
+        if max_age is not None and (directory.age() is None or directory.age() > max_age):
+            try:
+                directory.refresh()
+            except Exception as e:
+                if not len(directory):
+                    raise
+                logger.warning(f"Symbol directory refresh failed, using entries from "
+                               f"{directory.age() / 3600:.1f}h ago: {e}")
+    return directory
+
+
+def lookup_kis_exchange(symbol: str) -> Optional[str]:
+    """
+    주문 경로용 KIS 거래소 코드 조회 (로컬 파일만 사용, MongoDB 조회 없음)
+
+    Returns:
+        NASD/NYSE/AMEX, 디렉토리에 없거나 읽을 수 없으면 None
+    """
+    try:
+        return get_symbol_directory(max_age=None).kis_exchange(symbol)
+    except Exception as e:
+        logger.debug(f"Symbol directory lookup failed for {symbol}: {e}")
+        return None
+
+
+# ===== CLI =====
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Symbol directory tools")
+    parser.add_argument('--path', default=DEFAULT_DIRECTORY_PATH, help="Directory file")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    refresh = sub.add_parser('refresh', help="Incrementally refresh from MongoDB")
+    refresh.add_argument('--force', action='store_true', help="Recompute every symbol")
+    refresh.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="Concurrent symbol queries")
+    refresh.add_argument('--db-address', default='MONGODB_LOCAL', help="Address key in myStockInfo.yaml")
+
+    sub.add_parser('info', help="Show directory summary")
+
+    lookup = sub.add_parser('lookup', help="Show symbol entries")
+    lookup.add_argument('symbols', nargs='+')
+
+    args = parser.parse_args(argv)
+    directory = SymbolDirectory(args.path)
+    directory.load()
+
+    if args.command == 'refresh':
+        counts = directory.refresh(get_client(args.db_address), max_workers=args.workers, force=args.force)
+        print(f"[SymbolDirectory] {len(directory)} symbols: {counts['added']} added, {counts['updated']} updated, "
+              f"{counts['unchanged']} unchanged, {counts['removed']} removed")
+        return 0
+
+    if args.command == 'lookup':
+        for symbol in args.symbols:
+            record = directory.get(symbol)
+            print(f"{symbol}: {dataclasses.asdict(record) if record else 'not found'}")
+        return 0
+
+    if directory.refreshed_at is None:
+        print(f"[SymbolDirectory] {args.path} not built yet - run 'refresh'")
+        return 1
+    print(f"[SymbolDirectory] {len(directory)} symbols, refreshed {directory.age() / 3600:.1f}h ago")
+    for exchange in directory.exchanges:
+        print(f"  {exchange}: {len(directory.symbols(exchanges=[exchange], data_type=None))} symbols, "
+              f"{len(directory.symbols(exchanges=[exchange]))} with daily data")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='[%(levelname)s] %(message)s'
+    )
+    raise SystemExit(main())
@@ -0,0 +1,304 @@
+"""
+Time-Series Layout - Data Layer Implementation
+
+종목별 컬렉션 레이아웃(NasDataBase_D/AAPL, NasDataBase_D/MSFT, ...)의 대안으로
+DB별 MongoDB time-series 컬렉션 하나(timeField=Date, metaField=symbol)에 모든 종목을 저장한다.
+
+    <DB_NAME>_TS / bars   {'Date': datetime, 'symbol': 'AAPL', ...원본 필드}
+
+- migrate: 기존 종목별 컬렉션을 bulk 변환 (종목 병렬, 이미 옮긴 종목은 마지막 날짜 이후만 추가)
+- read_panel: 유니버스 전체를 {'symbol': {'$in': [...]}, 'Date': 범위} 쿼리 한 번으로 조회
+- write_panel: MongoDBOperations 쓰기 경로(make/update_stock_db, delete_collection)가 호출
+  → 이미 변환된 종목에 새 문서 추가 / 삭제된 종목 제거 (변환 전 종목은 migrate가 담당)
+- 레이아웃 선택: myStockInfo.yaml global_settings.DATA_LAYOUT ('collection' | 'timeseries')
+  또는 MongoDBOperations(data_layout=...) - 'timeseries'여도 변환되지 않은 DB는 종목별 컬렉션을 읽고,
+  패널에 없는 종목 / 조회 결과 중 최신 날짜보다 뒤처진 종목은 종목별 컬렉션에서 다시 읽는다
+
+주의: MongoDBOperations를 거치지 않고 종목 컬렉션을 갱신(외부 적재 도구, 직접 수정)했다면
+갱신할 때마다 migrate를 다시 실행해야 한다. migrate는 마지막 날짜 이후만 추가하므로
+과거 문서를 고친 경우에는 패널 DB(<DB_NAME>_TS)를 삭제하고 전체를 다시 변환한다.
+
+MongoDB 5.0 이상 필요 (time-series 컬렉션).
+
+사용법:
+    python -m project.database.timeseries_layout migrate --databases NasDataBase_D NysDataBase_D
+    python -m project.database.timeseries_layout info
+    python -m project.database.timeseries_layout benchmark --database NasDataBase_D --symbols 500 --days 1095
+"""
+
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import pandas as pd
+import pymongo
+import logging
+
+from project.database.connection_registry import get_client, load_stock_info
+
+logger = logging.getLogger(__name__)
+
+LAYOUT_COLLECTION = 'collection'
+LAYOUT_TIMESERIES = 'timeseries'
+DATA_LAYOUTS = (LAYOUT_COLLECTION, LAYOUT_TIMESERIES)
+
+PANEL_DATABASE_SUFFIX = '_TS'
+PANEL_COLLECTION = 'bars'
+TIME_FIELD = 'Date'
+META_FIELD = 'symbol'
+
+# 일봉/주봉 기준 버킷 단위 (MongoDB 권장: 간격이 하루 이상이면 hours)
+PANEL_GRANULARITY = 'hours'
+
+MIGRATION_BATCH_SIZE = 1000
+PANEL_READ_BATCH_SIZE = 10000
+DEFAULT_WORKERS = 8
+
+
+# ===== NAMES / CONFIG =====
+def panel_database_name(db_name: str) -> str:
+    """종목별 DB 이름 → time-series DB 이름 (NasDataBase_D → NasDataBase_D_TS)"""
+    return db_name + PANEL_DATABASE_SUFFIX
+
+
+def configured_layout() -> str:
+    """myStockInfo.yaml global_settings.DATA_LAYOUT (기본 'collection')"""
+    layout = (load_stock_info().get('global_settings') or {}).get('DATA_LAYOUT', LAYOUT_COLLECTION)
+    if layout not in DATA_LAYOUTS:
+        logger.warning(f"Unknown DATA_LAYOUT '{layout}', using '{LAYOUT_COLLECTION}'")
+        return LAYOUT_COLLECTION
+    return layout
+
+
+def panel_exists(client: pymongo.MongoClient, db_name: str) -> bool:
+    """db_name이 time-series 레이아웃으로 변환되어 있는지"""
+    return bool(client[panel_database_name(db_name)].list_collection_names(filter={'name': PANEL_COLLECTION}))
+
+
+# ===== READ =====
+def read_panel(client: pymongo.MongoClient, db_name: str, symbols: List[str], query: Optional[dict] = None,
+               projection: Optional[dict] = None, sort_field: str = TIME_FIELD) -> Optional[Dict[str, pd.DataFrame]]:
+    """
+    여러 종목을 time-series 컬렉션에서 쿼리 한 번으로 조회
+
+    MongoDBOperations.execute_query_bulk와 같은 형태({symbol: DataFrame}, sort_field 인덱스,
+    빈 결과 제외)를 반환한다. 정렬은 클라이언트에서 수행 (서버 정렬 메모리 제한 회피).
+
+    Returns:
+        {symbol: DataFrame}, time-series 컬렉션이 없으면 None
+    """
+    if not panel_exists(client, db_name):
+        return None
+
+    names = list(dict.fromkeys(symbols))
+    if not names:
+        return {}
+
+    filter_ = dict(query or {})
+    filter_[META_FIELD] = {'$in': names}
+
+    if projection:
+        fields = {key: value for key, value in projection.items() if key != '_id'}
+        fields.update({'_id': 0, META_FIELD: 1, sort_field: 1})
+    else:
+        fields = {'_id': 0}
+
+    cursor = client[panel_database_name(db_name)][PANEL_COLLECTION] \
+        .find(filter_, fields).batch_size(PANEL_READ_BATCH_SIZE)
+    data = pd.DataFrame(list(cursor))
+    if data.empty or sort_field not in data.columns:
+        return {}
+
+    data = data.sort_values([META_FIELD, sort_field], kind='stable')
+    return {
+        symbol: frame.drop(columns=META_FIELD).set_index(sort_field)
+        for symbol, frame in data.groupby(META_FIELD, sort=False)
+    }
+
+
+# ===== WRITE-THROUGH =====
+def write_panel(client: pymongo.MongoClient, db_name: str, written: Dict[str, Optional[List[dict]]],
+                checked: bool = False) -> int:
+    """
+    종목 컬렉션 쓰기를 time-series 컬렉션에 반영 (변환된 DB만)
+
+    Args:
+        client: MongoDB client
+        db_name: 종목별 DB 이름
+        written: {symbol: 추가된 문서} (None = 종목 컬렉션 삭제 → 패널 문서 삭제)
+        checked: 호출자가 panel_exists를 이미 확인함 (조회 생략)
+
+    Returns:
+        추가된 문서 수
+    """
+    if not checked and not panel_exists(client, db_name):
+        return 0
+
+    target = client[panel_database_name(db_name)][PANEL_COLLECTION]
+    inserted = 0
+    for symbol, documents in written.items():
+        if documents is None:
+            target.delete_many({META_FIELD: symbol})
+            continue
+        # 아직 변환되지 않은 종목은 건너뜀 (일부만 넣으면 migrate가 과거 문서를 옮기지 않음)
+        if target.find_one({META_FIELD: symbol}, {'_id': 1}) is None:
+            continue
+
+        batch = [
+            {**{key: value for key, value in document.items() if key != '_id'}, META_FIELD: symbol}
+            for document in documents if isinstance(document.get(TIME_FIELD), datetime)
+        ]
+        for start in range(0, len(batch), MIGRATION_BATCH_SIZE):
+            target.insert_many(batch[start:start + MIGRATION_BATCH_SIZE], ordered=False)
+        inserted += len(batch)
+    return inserted
+
+
+# ===== MIGRATION =====
+def ensure_panel_collection(client: pymongo.MongoClient, db_name: str):
+    """time-series 컬렉션 + (symbol, Date) 인덱스 생성 (없을 때만)"""
+    target = client[panel_database_name(db_name)]
+    if PANEL_COLLECTION not in target.list_collection_names():
+        target.create_collection(
+            PANEL_COLLECTION,
+            timeseries={'timeField': TIME_FIELD, 'metaField': META_FIELD, 'granularity': PANEL_GRANULARITY}
+        )
+        logger.info(f"Created time-series collection {panel_database_name(db_name)}.{PANEL_COLLECTION}")
+    target[PANEL_COLLECTION].create_index([(META_FIELD, pymongo.ASCENDING), (TIME_FIELD, pymongo.ASCENDING)])
+
+
+def migrate_symbol(client: pymongo.MongoClient, db_name: str, symbol: str) -> int:
+    """
+    종목 컬렉션 하나를 time-series 컬렉션으로 복사 (이미 옮긴 마지막 날짜 이후만)
+
+    Returns:
+        추가된 문서 수
+    """
+    target = client[panel_database_name(db_name)][PANEL_COLLECTION]
+    latest = target.find_one({META_FIELD: symbol}, {TIME_FIELD: 1}, sort=[(TIME_FIELD, pymongo.DESCENDING)])
+
+    query = {TIME_FIELD: {'$type': 'date'}}
+    if latest is not None:
+        query[TIME_FIELD]['$gt'] = latest[TIME_FIELD]
+
+    cursor = client[db_name][symbol].find(query, {'_id': 0}).sort(TIME_FIELD, pymongo.ASCENDING) \
+        .batch_size(MIGRATION_BATCH_SIZE)
+
+    inserted, batch = 0, []
+    for document in cursor:
+        document[META_FIELD] = symbol
+        batch.append(document)
+        if len(batch) >= MIGRATION_BATCH_SIZE:
+            target.insert_many(batch, ordered=False)
+            inserted += len(batch)
+            batch = []
+    if batch:
+        target.insert_many(batch, ordered=False)
+        inserted += len(batch)
+    return inserted
+
+
+def migrate_database(client: pymongo.MongoClient, db_name: str, symbols: Optional[List[str]] = None,
+                     max_workers: int = DEFAULT_WORKERS) -> Dict[str, int]:
+    """
+    종목별 컬렉션 DB 전체를 time-series 레이아웃으로 변환 (종목 병렬)
+
+    Returns:
+        {symbol: 추가된 문서 수} (실패한 종목은 -1)
+    """
+    ensure_panel_collection(client, db_name)
+    names = symbols or sorted(name for name in client[db_name].list_collection_names()
+                              if name and not name.startswith(('_', 'system.')))
+
+    def migrate(symbol: str) -> int:
+        try:
+            return migrate_symbol(client, db_name, symbol)
+        except Exception as e:
+            logger.error(f"Failed to migrate {db_name}.{symbol}: {e}")
+            return -1
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='ts-migrate') as executor:
+        counts = dict(zip(names, executor.map(migrate, names)))
+
+    failed = sum(1 for count in counts.values() if count < 0)
+    logger.info(f"Migrated {db_name}: {sum(c for c in counts.values() if c > 0)} documents, "
+                f"{len(counts) - failed}/{len(counts)} symbols")
+    return counts
+
+
+# ===== BENCHMARK =====
+def benchmark_layouts(db_name: str, symbols: List[str], start: datetime, end: datetime,
+                      db_address: str = 'MONGODB_LOCAL') -> Dict[str, Dict[str, float]]:
+    """같은 유니버스/기간을 두 레이아웃으로 읽은 시간 비교"""
+    from project.database.mongodb_operations import MongoDBOperations
+
+    query = {TIME_FIELD: {'$gte': start, '$lte': end}}
+    results = {}
+    for layout in DATA_LAYOUTS:
+        db = MongoDBOperations(db_address=db_address, data_layout=layout)
+        try:
+            started = time.perf_counter()
+            frames = db.execute_query_bulk(db_name, symbols, query=query)
+            results[layout] = {
+                'seconds': time.perf_counter() - started,
+                'symbols': len(frames),
+                'rows': sum(len(frame) for frame in frames.values()),
+            }
+        finally:
+            db.close()
+    return results
+
+
+# ===== CLI =====
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="MongoDB time-series layout tools")
+    parser.add_argument('--db-address', default='MONGODB_LOCAL', help="Address key in myStockInfo.yaml")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    migrate = sub.add_parser('migrate', help="Copy per-symbol collections into a time-series collection "
+                                             "(re-run after updates made outside MongoDBOperations)")
+    migrate.add_argument('--databases', nargs='+', required=True, help="Source databases (e.g. NasDataBase_D)")
+    migrate.add_argument('--symbols', nargs='+', help="Collections to migrate (default: all)")
+    migrate.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="Concurrent symbols")
+
+    sub.add_parser('info', help="Show migrated databases")
+
+    bench = sub.add_parser('benchmark', help="Compare per-symbol and time-series reads")
+    bench.add_argument('--database', required=True, help="Source database (must be migrated)")
+    bench.add_argument('--symbols', type=int, default=500, help="Number of symbols to read")
+    bench.add_argument('--days', type=int, default=365 * 3, help="Date range length")
+
+    args = parser.parse_args(argv)
+    client = get_client(args.db_address)
+
+    if args.command == 'migrate':
+        for db_name in args.databases:
+            counts = migrate_database(client, db_name, args.symbols, args.workers)
+            print(f"[TimeSeriesLayout] {db_name} → {panel_database_name(db_name)}: "
+                  f"{sum(c for c in counts.values() if c > 0)} documents from {len(counts)} symbols")
+        return 0
+
+    if args.command == 'benchmark':
+        names = sorted(name for name in client[args.database].list_collection_names()
+                       if name and not name.startswith(('_', 'system.')))[:args.symbols]
+        end = datetime.now()
+        results = benchmark_layouts(args.database, names, end - timedelta(days=args.days), end, args.db_address)
+        for layout, result in results.items():
+            print(f"{layout:<12} {result['seconds']:>8.2f}s  {result['symbols']:>6} symbols  {result['rows']:>10,} rows")
+        return 0
+
+    for name in sorted(client.list_database_names()):
+        if name.endswith(PANEL_DATABASE_SUFFIX):
+            count = client[name][PANEL_COLLECTION].count_documents({})
+            print(f"{name[:-len(PANEL_DATABASE_SUFFIX)]:<24} → {name}.{PANEL_COLLECTION}: {count:,} documents")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='[%(levelname)s] %(message)s'
+    )
+    raise SystemExit(main())
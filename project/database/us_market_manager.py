@@ -4,7 +4,6 @@ Based on refer/Database/MakMongoDB_US.py
 Manages US market data collection and MongoDB operations
 """
 
-import pymongo
 import pandas as pd
 import json
 import logging
@@ -17,6 +16,7 @@ import os
 from pathlib import Path
 
 from .mongodb_operations import MongoDBOperations
+from .connection_registry import get_client
 from .database_name_calculator import (
     calculate_file_path, 
     calculate_universe_list, 
@@ -192,12 +192,7 @@ class USMarketDataManager:
             )
             
             # MongoDB connection
-            conn = pymongo.MongoClient(
-                host=self.stock_info["MONGODB_LOCAL"], 
-                port=self.stock_info["MONGODB_PORT"],
-                username=self.stock_info["MONGODB_ID"],
-                password=self.stock_info["MONGODB_PW"]
-            )
+            conn = get_client("MONGODB_LOCAL")
             
             # Process ETF data
             db_name = calculate_database_name(self.market, self.area, 'D', 'ETF')
@@ -228,7 +223,6 @@ class USMarketDataManager:
                     logging.error(f"Error processing ETF {etf_symbol}: {etf_error}")
                     continue
             
-            conn.close()
             logger.info(f"Successfully processed {processed_count} ETFs for MongoDB")
             return True
             
@@ -249,12 +243,7 @@ class USMarketDataManager:
         """
         try:
             # MongoDB connection
-            conn = pymongo.MongoClient(
-                host=self.stock_info["MONGODB_LOCAL"], 
-                port=self.stock_info["MONGODB_PORT"],
-                username=self.stock_info["MONGODB_ID"],
-                password=self.stock_info["MONGODB_PW"]
-            )
+            conn = get_client("MONGODB_LOCAL")
             
             # Process Stock data
             db_name = calculate_database_name(self.market, self.area, 'D', 'Stock')
@@ -285,7 +274,6 @@ class USMarketDataManager:
                     logger.error(f"Error processing stock {stock_symbol}: {stock_error}")
                     continue
             
-            conn.close()
             logger.info(f"Successfully processed {processed_count} stocks for MongoDB")
             return True
             
@@ -9,7 +9,7 @@ import pandas as pd
 import copy
 import concurrent.futures
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, Iterable, List, Tuple, Optional, Any
 import logging
 import sys
 import os
@@ -20,15 +20,26 @@ sys.path.append(project_root)
 
 # Import Database Layer components
 try:
-    from project.database.mongodb_operations import MongoDBOperations
+    from project.database.mongodb_operations import MongoDBOperations, DEFAULT_READ_WORKERS
     from project.database.database_name_calculator import calculate_database_name
+    from project.database.price_history_cache import (
+        PriceHistoryCache, CACHED_DATA_TYPES, DEFAULT_SYNC_INTERVAL
+    )
     DATABASE_AVAILABLE = True
 except ImportError:
     DATABASE_AVAILABLE = False
+    DEFAULT_READ_WORKERS = 8
+    CACHED_DATA_TYPES = ()
+
+# Stage → database data type mapping and column-requirement projections
+from project.indicator.data_requirements import STAGE_DATA_TYPES, build_projections
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
+# Stage → DataFrameGenerator / TechnicalIndicatorGenerator attribute
+STAGE_ATTRIBUTES = {'W': 'df_W', 'RS': 'df_RS', 'D': 'df_D', 'E': 'df_E', 'F': 'df_F'}
+
 class DataFrameGenerator:
     """
     Generates trading data frames based on refer/BackTest/TestMain.py logic
@@ -36,7 +47,11 @@ class DataFrameGenerator:
     """
     
     def __init__(self, universe: List[str] = None, market: str = 'US', area: str = 'US',
-                 start_day: datetime = None, end_day: datetime = None, is_backtest: bool = False):
+                 start_day: datetime = None, end_day: datetime = None, is_backtest: bool = False,
+                 max_read_workers: int = DEFAULT_READ_WORKERS,
+                 required_columns: Optional[Dict[str, Iterable[str]]] = None,
+                 use_price_cache: bool = True, price_cache: Optional[Any] = None,
+                 data_layout: Optional[str] = None):
         """
         Initialize DataFrameGenerator
 
@@ -47,6 +62,14 @@ class DataFrameGenerator:
             start_day: Start date for data
             end_day: End date for data
             is_backtest: True for backtest mode (prevents future reference), False for live trading
+            max_read_workers: Max concurrent symbol reads (shared by all data types)
+            required_columns: {stage: processed columns needed downstream} - read as a
+                              MongoDB projection (stages not listed read all fields)
+            use_price_cache: Read AD/W history through the local PriceHistoryCache
+                             (False = always query MongoDB directly)
+            price_cache: Shared PriceHistoryCache instance (default: created per generator)
+            data_layout: 'collection' (per-symbol) or 'timeseries' (one query per data type
+                         on migrated databases) - default: global_settings.DATA_LAYOUT
         """
         pd.set_option('future.no_silent_downcasting', True)
 
@@ -85,10 +108,21 @@ class DataFrameGenerator:
         self.df_E = {}   # Earnings data (US only)
         self.df_F = {}   # Fundamental data (US only)
 
+        # Field projection per data type (data_requirements.build_projections)
+        self.projections = build_projections(required_columns)
+
         # Single MongoDB connection for all operations (reuse connection)
         self.db = None
         if DATABASE_AVAILABLE:
-            self.db = MongoDBOperations(db_address="MONGODB_LOCAL")
+            self.db = MongoDBOperations(db_address="MONGODB_LOCAL", max_read_workers=max_read_workers,
+                                        data_layout=data_layout)
+
+        # Local price history cache (live trading always delta-syncs to the latest bar)
+        self.price_cache = None
+        if DATABASE_AVAILABLE and use_price_cache:
+            self.price_cache = price_cache or PriceHistoryCache(
+                sync_interval=DEFAULT_SYNC_INTERVAL if is_backtest else 0
+            )
 
         logger.info(f"Initialized DataFrameGenerator for {area} market with {len(universe)} symbols")
     
@@ -117,7 +151,9 @@ class DataFrameGenerator:
 
                 # Call ReadDataBase method (equivalent to refer implementation)
                 df_dict, updated_universe = self._read_from_mongodb(
-                    self.db, universe, market, area, database_name, data_start_day, end_day
+                    self.db, universe, market, area, database_name, data_start_day, end_day,
+                    projection=self.projections.get(data_type),
+                    use_cache=data_type in CACHED_DATA_TYPES
                 )
 
                 return data_type, df_dict, updated_universe
@@ -134,7 +170,9 @@ class DataFrameGenerator:
     
     def _read_from_mongodb(self, db: Any, universe: List[str], 
                           market: str, area: str, database_name: str, 
-                          data_start_day: datetime, end_day: datetime) -> Tuple[Dict, List[str]]:
+                          data_start_day: datetime, end_day: datetime,
+                          projection: Optional[Dict[str, int]] = None,
+                          use_cache: bool = False) -> Tuple[Dict, List[str]]:
         """
         Read data from MongoDB - equivalent to MongoDB.ReadDataBase method
         
@@ -146,50 +184,46 @@ class DataFrameGenerator:
             database_name: Database name to query
             data_start_day: Start date
             end_day: End date
-            
+            projection: Field projection (None = all fields)
+            use_cache: Read through the local price cache (if enabled)
+
         Returns:
             Tuple of (dataframe_dict, updated_universe)
         """
-        df_dict = {}
-        updated_universe = []
-
         try:
             # Filter out empty or invalid symbols
-            valid_symbols = [s for s in universe if s and s.strip()]
-
-            for symbol in valid_symbols:
-                try:
-                    # Skip if symbol is empty after strip
-                    if not symbol.strip():
-                        continue
-
-                    # Query data for each symbol
-                    df = db.execute_query(
-                        db_name=database_name,
-                        collection_name=symbol.strip(),
-                        query={
-                            'Date': {
-                                '$gte': data_start_day,
-                                '$lte': end_day
-                            }
-                        }
-                    )
+            valid_symbols = [s.strip() for s in universe if s and s.strip()]
 
-                    if not df.empty:
-                        df_dict[symbol] = df
-                        updated_universe.append(symbol)
+            if use_cache and self.price_cache is not None:
+                # Cached history + MongoDB documents newer than the cached max date
+                df_dict = self.price_cache.read(
+                    db, database_name, valid_symbols, data_start_day, end_day, projection=projection
+                )
+                updated_universe = [symbol for symbol in valid_symbols if symbol in df_dict]
+                logger.info(f"Read data for {len(updated_universe)} symbols from {database_name} (price cache)")
+                return df_dict, updated_universe
+
+            # Concurrent per-symbol reads on the shared client (server-side Date ordering)
+            df_dict = db.execute_query_bulk(
+                db_name=database_name,
+                collection_names=valid_symbols,
+                query={
+                    'Date': {
+                        '$gte': data_start_day,
+                        '$lte': end_day
+                    }
+                },
+                projection=projection
+            )
+            updated_universe = [symbol for symbol in valid_symbols if symbol in df_dict]
 
-                except Exception as e:
-                    logger.debug(f"Error reading {symbol} from {database_name}: {e}")
-                    continue
-                    
             logger.info(f"Successfully read data for {len(updated_universe)} symbols from {database_name}")
             return df_dict, updated_universe
-            
+
         except Exception as e:
             logger.error(f"Error reading from MongoDB database {database_name}: {e}")
             return {}, []
-    
+
     def _simulate_database_read(self, data_type: str, universe: List[str], 
                                data_start_day: datetime, end_day: datetime) -> Tuple[str, Dict, List[str]]:
         """
@@ -536,12 +570,7 @@ class DataFrameGenerator:
                         self.df_E[stock] = self.df_E[stock][~self.df_E[stock].index.duplicated()]
 
                         # Convert earnings percentage data to decimal format
-                        # eps_yoy, eps_qoq, rev_yoy, rev_qoq are stored as % (25.0 = 25%)
-                        # Convert to decimal format (0.25 = 25%) to match fundamental data
-                        percentage_columns = ['eps_yoy', 'eps_qoq', 'rev_yoy', 'rev_qoq']
-                        for col in percentage_columns:
-                            if col in self.df_E[stock].columns:
-                                self.df_E[stock][col] = self.df_E[stock][col] / 100.0
+                        self.df_E[stock] = self._earnings_to_decimal(self.df_E[stock])
 
                     if stock in self.df_F:
                         self.df_F[stock] = self.df_F[stock][~self.df_F[stock].index.duplicated()]
@@ -607,57 +636,174 @@ class DataFrameGenerator:
         for stock in self.universe:
             try:
                 if stock in self.df_F and stock in self.df_D:
-                    # Get daily close data (columns NOT renamed yet, so use ad_close)
-                    daily_close = None
-                    if 'ad_close' in self.df_D[stock].columns:
-                        daily_close = self.df_D[stock]['ad_close']
-                    elif 'close' in self.df_D[stock].columns:
-                        daily_close = self.df_D[stock]['close']
-                    elif 'Dclose' in self.df_D[stock].columns:
-                        daily_close = self.df_D[stock]['Dclose']
-
-                    if daily_close is None:
-                        logger.warning(f"No close price column found for {stock} in daily data")
-                        continue
-
-                    # Join close prices to fundamental data based on F data's index
-                    # Use merge with nearest date matching (forward fill)
-                    df_f_with_close = self.df_F[stock].copy()
-
-                    # For each fundamental data date, find the corresponding close price
-                    # If exact date match exists, use it; otherwise use nearest previous date
-                    close_values = []
-                    for f_date in df_f_with_close.index:
-                        # Find closest date in daily data that is <= f_date
-                        valid_dates = daily_close.index[daily_close.index <= f_date]
-                        if len(valid_dates) > 0:
-                            closest_date = valid_dates[-1]  # Most recent date
-                            close_values.append(daily_close.loc[closest_date])
-                        else:
-                            # No previous date available, use forward fill from daily data
-                            close_values.append(None)
+                    joined = self._join_daily_close(self.df_F[stock], self.df_D[stock], stock)
+                    if joined is not None:
+                        self.df_F[stock] = joined
 
-                    # Add 'close' column to fundamental data
-                    df_f_with_close['close'] = close_values
+            except Exception as e:
+                logger.error(f"Error processing fundamental data for {stock}: {e}")
+                import traceback
+                traceback.print_exc()
 
-                    # Forward fill any None values
-                    df_f_with_close['close'] = df_f_with_close['close'].ffill()
+    @staticmethod
+    def _earnings_to_decimal(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Convert earnings percentage columns to decimal format
 
-                    # Update fundamental dataframe
-                    self.df_F[stock] = df_f_with_close
+        eps_yoy, eps_qoq, rev_yoy, rev_qoq are stored as % (25.0 = 25%)
+        Convert to decimal format (0.25 = 25%) to match fundamental data
+        """
+        percentage_columns = [col for col in ['eps_yoy', 'eps_qoq', 'rev_yoy', 'rev_qoq'] if col in df.columns]
+        if not percentage_columns:
+            return df
 
-                    # Forward fill other missing fundamental values
-                    self.df_F[stock].ffill(inplace=True)
+        df = df.copy()
+        for col in percentage_columns:
+            df[col] = df[col] / 100.0
+        return df
 
-                    # Remove duplicates
-                    self.df_F[stock] = self.df_F[stock][~self.df_F[stock].index.duplicated()]
+    @staticmethod
+    def _join_daily_close(df_f: pd.DataFrame, df_d: pd.DataFrame, stock: str) -> Optional[pd.DataFrame]:
+        """
+        Join daily close prices onto fundamental data (F 인덱스 날짜 기준 직전 일봉 종가)
 
-                    logger.debug(f"Processed fundamental data for {stock}: {len(self.df_F[stock])} records with close prices")
+        Args:
+            df_f: Fundamental dataframe (quarterly index)
+            df_d: Daily dataframe (columns may or may not be renamed yet)
+            stock: Stock symbol (logging)
 
-            except Exception as e:
-                logger.error(f"Error processing fundamental data for {stock}: {e}")
-                import traceback
-                traceback.print_exc()
+        Returns:
+            Fundamental dataframe with 'close' column, None if no close column exists
+        """
+        # Get daily close data (columns NOT renamed yet, so use ad_close)
+        daily_close = None
+        if 'ad_close' in df_d.columns:
+            daily_close = df_d['ad_close']
+        elif 'close' in df_d.columns:
+            daily_close = df_d['close']
+        elif 'Dclose' in df_d.columns:
+            daily_close = df_d['Dclose']
+
+        if daily_close is None:
+            logger.warning(f"No close price column found for {stock} in daily data")
+            return None
+
+        # Join close prices to fundamental data based on F data's index
+        # Use merge with nearest date matching (forward fill)
+        df_f_with_close = df_f.copy()
+
+        # For each fundamental data date, find the corresponding close price
+        # If exact date match exists, use it; otherwise use nearest previous date
+        close_values = []
+        for f_date in df_f_with_close.index:
+            # Find closest date in daily data that is <= f_date
+            valid_dates = daily_close.index[daily_close.index <= f_date]
+            if len(valid_dates) > 0:
+                closest_date = valid_dates[-1]  # Most recent date
+                close_values.append(daily_close.loc[closest_date])
+            else:
+                # No previous date available, use forward fill from daily data
+                close_values.append(None)
+
+        # Add 'close' column to fundamental data
+        df_f_with_close['close'] = close_values
+
+        # Forward fill any None values
+        df_f_with_close['close'] = df_f_with_close['close'].ffill()
+
+        # Forward fill other missing fundamental values
+        df_f_with_close.ffill(inplace=True)
+
+        # Remove duplicates
+        df_f_with_close = df_f_with_close[~df_f_with_close.index.duplicated()]
+
+        logger.debug(f"Processed fundamental data for {stock}: {len(df_f_with_close)} records with close prices")
+        return df_f_with_close
+
+    # ===== STAGE-SCOPED LOADING =====
+    def load_stage_data(self, stage: str, symbols: List[str],
+                        raw_cache: Optional[Dict[str, Dict[str, Optional[pd.DataFrame]]]] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Load and post-process a single data type (stage-scoped load_data_from_database)
+
+        Only the requested stage's database is read and only that data type goes
+        through TechnicalIndicatorGenerator. F additionally needs raw AD data for the
+        close-price join; it is taken from raw_cache when an earlier stage read it.
+
+        Args:
+            stage: Stage identifier ('W', 'RS', 'D', 'E', 'F' - E/F are US only)
+            symbols: Symbols to load
+            raw_cache: {data_type: {symbol: de-duplicated raw DataFrame or None}}
+                       shared across stages; newly read raw data is recorded here
+
+        Returns:
+            Dictionary of {symbol: processed DataFrame}
+        """
+        if stage not in STAGE_DATA_TYPES:
+            raise ValueError(f"Unknown stage: {stage}")
+
+        if stage in ('E', 'F') and self.area != 'US':
+            return {}
+
+        if raw_cache is None:
+            raw_cache = {}
+
+        frames = self._read_raw_frames(STAGE_DATA_TYPES[stage], symbols, raw_cache)
+
+        if stage == 'E':
+            frames = {stock: self._earnings_to_decimal(df) for stock, df in frames.items()}
+        elif stage == 'F':
+            daily = self._read_raw_frames('AD', list(frames), raw_cache)
+            for stock in list(frames):
+                if stock in daily:
+                    joined = self._join_daily_close(frames[stock], daily[stock], stock)
+                    if joined is not None:
+                        frames[stock] = joined
+
+        processed = self._apply_stage_indicators(stage, frames)
+        setattr(self, STAGE_ATTRIBUTES[stage], processed)
+
+        logger.info(f"Stage {stage} loaded: {len(processed)}/{len(symbols)} symbols")
+        return processed
+
+    def _read_raw_frames(self, data_type: str, symbols: List[str],
+                         raw_cache: Dict[str, Dict[str, Optional[pd.DataFrame]]]) -> Dict[str, pd.DataFrame]:
+        """
+        Read raw (de-duplicated) data for symbols not yet in raw_cache
+
+        Symbols without data are cached as None so they are not queried again.
+        """
+        cached = raw_cache.setdefault(data_type, {})
+        missing = [symbol for symbol in symbols if symbol not in cached]
+
+        if missing:
+            _, df_dict, _ = self.read_database_task(
+                self.market, self.area, data_type, missing, self.data_start_day, self.end_day
+            )
+            for symbol in missing:
+                df = df_dict.get(symbol)
+                cached[symbol] = df[~df.index.duplicated()] if df is not None and not df.empty else None
+
+        return {symbol: cached[symbol] for symbol in symbols if cached.get(symbol) is not None}
+
+    def _apply_stage_indicators(self, stage: str, frames: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        """Run TechnicalIndicatorGenerator on one data type only (other types empty)"""
+        from project.indicator.technical_indicators import TechnicalIndicatorGenerator
+
+        inputs = {attribute: {} for attribute in STAGE_ATTRIBUTES.values()}
+        inputs[STAGE_ATTRIBUTES[stage]] = frames
+
+        tech_gen = TechnicalIndicatorGenerator(
+            universe=list(frames),
+            area=self.area,
+            start_day=self.start_day,
+            end_day=self.end_day,
+            trading=not self.is_backtest,  # trading=True for live, False for backtest
+            **inputs
+        )
+
+        df_D, df_W, df_RS, df_E, df_F = tech_gen.return_processed_data()
+        return {'df_D': df_D, 'df_W': df_W, 'df_RS': df_RS, 'df_E': df_E, 'df_F': df_F}[STAGE_ATTRIBUTES[stage]]
 
     def get_strategy_data(self, strategy_name: str = 'A') -> Tuple[Dict, List[str]]:
         """
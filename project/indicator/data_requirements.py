@@ -0,0 +1,118 @@
+"""
+Data Requirements - Indicator Layer
+필요 컬럼 → MongoDB projection 변환
+
+전략/단계가 사용하는 (처리 후) 컬럼 목록을 원본 DB 필드 projection으로 바꿔
+DataFrameGenerator/StagedDataLoader 조회 시 필요한 필드만 전송받는다.
+
+- 지표 계산 입력 필드(INDICATOR_INPUT_FIELDS)는 항상 포함
+- 이름이 바뀌는 OHLCV 컬럼(Dclose, Wclose, close 등)은 원본 필드명(ad_close/close)으로 역매핑
+- 계산되는 컬럼(SMA20, 52_H 등)은 DB에 없으므로 projection에 있어도 무시된다
+- 요구 컬럼이 None이면 projection도 None (모든 필드 - 기존 동작)
+- staged 파이프라인의 요구 컬럼은 시그널 설정(strategy_signal_config.yaml)에서 도출
+  (signal_config_required_columns)
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+# Stage → database data type (daily stage reads the AD database)
+STAGE_DATA_TYPES = {'W': 'W', 'RS': 'RS', 'D': 'AD', 'E': 'E', 'F': 'F'}
+
+_OHLCV = ('open', 'high', 'low', 'close', 'volume')
+
+# TechnicalIndicatorGenerator가 읽는 원본 필드 (데이터 타입별)
+INDICATOR_INPUT_FIELDS: Dict[str, tuple] = {
+    'AD': _OHLCV + ('ad_open', 'ad_high', 'ad_low', 'ad_close'),
+    'W': _OHLCV + ('ad_open', 'ad_high', 'ad_low', 'ad_close'),
+    'RS': ('RS_4W',),
+    'E': (),
+    'F': ('commonStockSharesOutstanding', 'netIncome', 'totalShareholderEquity', 'totalRevenue',
+          'totalAssets', 'grossProfit', 'operatingIncome', 'depreciationAndAmortization',
+          'totalLiabilities', 'cashAndCashEquivalentsAtCarryingValue'),
+}
+
+# Staged 시그널이 읽는 컬럼 - {is_signal_enabled 이름: (stage, columns)}, 시그널이 켜져 있을 때만 필요
+_HIGHEST = ('Highest_1M', 'Highest_3M', 'Highest_6M', 'Highest_1Y', 'Highest_2Y')
+SIGNAL_STAGE_COLUMNS: Dict[str, tuple] = {
+    'earnings': ('E', ('eps_yoy', 'rev_yoy')),
+    'fundamental': ('F', ('MarketCapitalization', 'REV_YOY', 'EPS_YOY', 'revenue')),
+    'weekly': ('W', ('Wclose', '52_H', '52_L', '1Year_H', '1Year_L', '2Year_H', '2Year_L')),
+    'rs': ('RS', ('RS_4W',)),
+    'daily_rs': ('D', ('Dhigh', 'SMA20', 'SMA50') + _HIGHEST),
+}
+
+# 시그널 설정과 무관하게 읽는 컬럼 (D 단계 TargetPrice/LossCutPrice, staged 백테스트 변환)
+PIPELINE_OUTPUT_COLUMNS: Dict[str, tuple] = {
+    'D': ('Dopen', 'Dhigh', 'Dlow', 'Dclose', 'Dvolume', 'ADR') + _HIGHEST,
+}
+
+
+def _raw_field_names(data_type: str, column: str) -> List[str]:
+    """처리 후 컬럼명 → 원본 필드 후보 (Dclose → close, ad_close)"""
+    prefix = {'AD': 'D', 'W': 'W'}.get(data_type)
+    if prefix and column.startswith(prefix) and column[len(prefix):] in _OHLCV:
+        column = column[len(prefix):]
+    if prefix and column in _OHLCV:
+        return [column, f'ad_{column}']
+    return [column]
+
+
+def build_projection(data_type: str, columns: Optional[Iterable[str]]) -> Optional[Dict[str, int]]:
+    """
+    요구 컬럼 → MongoDB projection
+
+    Args:
+        data_type: Database data type (W, RS, AD, E, F)
+        columns: Processed column names needed downstream (None = all fields)
+
+    Returns:
+        {'_id': 0, 'Date': 1, field: 1, ...} or None
+    """
+    if columns is None:
+        return None
+
+    projection = {'_id': 0, 'Date': 1}
+    for field in INDICATOR_INPUT_FIELDS.get(data_type, ()):
+        projection[field] = 1
+    for column in columns:
+        for field in _raw_field_names(data_type, column):
+            projection[field] = 1
+    return projection
+
+
+def build_projections(required_columns: Optional[Dict[str, Iterable[str]]]) -> Dict[str, Dict[str, int]]:
+    """
+    단계별 요구 컬럼 {stage: columns} → 데이터 타입별 projection {data_type: projection}
+
+    요구 컬럼이 없는 단계의 데이터 타입은 결과에 없다 (모든 필드 조회).
+    """
+    if not required_columns:
+        return {}
+
+    merged: Dict[str, List[str]] = {}
+    for stage, columns in required_columns.items():
+        if columns is None:
+            continue
+        data_type = STAGE_DATA_TYPES.get(stage, stage)
+        merged.setdefault(data_type, []).extend(columns)
+
+    return {data_type: build_projection(data_type, columns) for data_type, columns in merged.items()}
+
+
+def signal_config_required_columns(config_loader=None,
+                                   strategy: Optional[str] = None) -> Dict[str, List[str]]:
+    """
+    Staged 시그널 설정 → 단계별 요구 컬럼 {stage: columns}
+
+    Args:
+        config_loader: StrategySignalConfigLoader (None = every signal enabled,
+                       same as StagedSignalService without a config)
+        strategy: Signal strategy name (default: active strategy)
+
+    꺼진 시그널의 컬럼은 빠지므로 해당 단계는 Date와 지표 입력 필드만 조회한다.
+    """
+    required = {stage: list(PIPELINE_OUTPUT_COLUMNS.get(stage, ())) for stage in STAGE_DATA_TYPES}
+    for signal_name, (stage, columns) in SIGNAL_STAGE_COLUMNS.items():
+        if config_loader is None or config_loader.is_signal_enabled(signal_name, strategy):
+            required[stage].extend(column for column in columns if column not in required[stage])
+    return required
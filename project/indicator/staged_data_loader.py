@@ -5,15 +5,21 @@ Staged Data Loader - Indicator Layer
 
 Architecture: Load data stage-by-stage based on filtered symbols
 E → F → W → RS → D
+
+각 단계는 해당 데이터 타입만 DB에서 읽고 해당 타입만 지표 처리한다
+(DataFrameGenerator.load_stage_data). 이미 로드한 종목은 다시 읽지 않으며,
+원본 데이터는 단계 간 공유한다 (예: F 종가 조인에 읽은 AD 원본을 D 단계에서 재사용).
+required_columns를 주면 해당 컬럼만 projection으로 조회한다
+(StagedPipelineService는 시그널 설정에서 도출한 컬럼을 전달).
 """
 
 import pandas as pd
-from typing import Dict, List, Optional, Set
+from typing import Dict, Iterable, List, Optional, Set
 from datetime import datetime, timedelta
 import logging
 
 from project.database.mongodb_operations import MongoDBOperations
-from project.indicator.data_frame_generator import DataFrameGenerator
+from project.indicator.data_frame_generator import DataFrameGenerator, DEFAULT_READ_WORKERS
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -28,7 +34,10 @@ class StagedDataLoader:
     """
 
     def __init__(self, market: str = 'US', area: str = 'US',
-                 start_day: datetime = None, end_day: datetime = None, is_backtest: bool = False):
+                 start_day: datetime = None, end_day: datetime = None, is_backtest: bool = False,
+                 max_read_workers: int = DEFAULT_READ_WORKERS,
+                 required_columns: Optional[Dict[str, Iterable[str]]] = None,
+                 use_price_cache: bool = True, data_layout: Optional[str] = None):
         """
         Initialize staged data loader
 
@@ -38,12 +47,21 @@ class StagedDataLoader:
             start_day: Start date for data loading
             end_day: End date for data loading
             is_backtest: True for backtest mode (prevents future reference), False for live trading
+            max_read_workers: Max concurrent symbol reads per stage load
+            required_columns: {stage: processed columns} read as MongoDB projections
+                              (None = all fields)
+            use_price_cache: Read AD/W history through the local price cache
+            data_layout: 'collection' or 'timeseries' (default: global_settings.DATA_LAYOUT)
         """
         self.market = market
         self.area = area
         self.start_day = start_day or (datetime.now() - timedelta(days=365*3))
         self.end_day = end_day or datetime.now()
         self.is_backtest = is_backtest
+        self.max_read_workers = max_read_workers
+        self.required_columns = required_columns
+        self.use_price_cache = use_price_cache
+        self.data_layout = data_layout
 
         # Single MongoDB connection for all operations
         self.db = MongoDBOperations(db_address="MONGODB_LOCAL")
@@ -57,6 +75,15 @@ class StagedDataLoader:
             'D': {}   # Daily data
         }
 
+        # Symbols already requested per stage (including symbols without data)
+        self._requested: Dict[str, Set[str]] = {stage: set() for stage in self.data}
+
+        # Raw (de-duplicated) database frames shared across stages: {data_type: {symbol: df or None}}
+        self._raw_data: Dict[str, Dict[str, Optional[pd.DataFrame]]] = {}
+
+        # Created on first stage load and reused by every stage
+        self._generator: Optional[DataFrameGenerator] = None
+
     def load_stage_data(self, stage: str, symbols: List[str]) -> Dict[str, pd.DataFrame]:
         """
         특정 단계의 데이터 로드
@@ -68,42 +95,44 @@ class StagedDataLoader:
         Returns:
             Dictionary of {symbol: DataFrame}
         """
-        logger.info(f"Loading {stage} data for {len(symbols)} symbols")
-
-        # Create DataFrameGenerator for this stage
-        df_generator = DataFrameGenerator(
-            universe=symbols,
-            market=self.market,
-            area=self.area,
-            start_day=self.start_day,
-            end_day=self.end_day,
-            is_backtest=self.is_backtest
-        )
-
-        # Load data from database
-        df_generator.load_data_from_database()
-        all_data = df_generator.get_dataframes()
-
-        # Extract data for this stage
-        if stage == 'E':
-            stage_data = all_data.get('df_E', {})
-        elif stage == 'F':
-            stage_data = all_data.get('df_F', {})
-        elif stage == 'W':
-            stage_data = all_data.get('df_W', {})
-        elif stage == 'RS':
-            stage_data = all_data.get('df_RS', {})
-        elif stage == 'D':
-            stage_data = all_data.get('df_D', {})
-        else:
-            stage_data = {}
-
-        # Store in cache
-        self.data[stage].update(stage_data)
+        if stage not in self.data:
+            raise ValueError(f"Unknown stage: {stage}")
+
+        # Only symbols not requested by an earlier call hit the database
+        missing = [symbol for symbol in dict.fromkeys(symbols) if symbol not in self._requested[stage]]
+        logger.info(f"Loading {stage} data for {len(symbols)} symbols ({len(missing)} not yet loaded)")
+
+        if missing:
+            loaded = self._get_generator().load_stage_data(stage, missing, raw_cache=self._raw_data)
+            self.data[stage].update(loaded)
+            self._requested[stage].update(missing)
+
+            # Only daily raw data is needed again (F close join ↔ D stage)
+            for data_type in [key for key in self._raw_data if key != 'AD']:
+                del self._raw_data[data_type]
+
+        stage_data = {symbol: self.data[stage][symbol] for symbol in symbols if symbol in self.data[stage]}
 
         logger.info(f"Loaded {stage} data: {len(stage_data)} symbols with data")
         return stage_data
 
+    def _get_generator(self) -> DataFrameGenerator:
+        """Stage-scoped DataFrameGenerator (one instance for all stages)"""
+        if self._generator is None:
+            self._generator = DataFrameGenerator(
+                universe=[],
+                market=self.market,
+                area=self.area,
+                start_day=self.start_day,
+                end_day=self.end_day,
+                is_backtest=self.is_backtest,
+                max_read_workers=self.max_read_workers,
+                required_columns=self.required_columns,
+                use_price_cache=self.use_price_cache,
+                data_layout=self.data_layout
+            )
+        return self._generator
+
     def load_stage_E(self, symbols: List[str]) -> Dict[str, pd.DataFrame]:
         """
         Stage 1: Load Earnings data
@@ -204,6 +233,8 @@ class StagedDataLoader:
         """Close database connection"""
         if self.db:
             self.db.close()
+        if self._generator is not None and self._generator.db is not None:
+            self._generator.db.close()
 
     def __del__(self):
         """Cleanup on deletion"""
@@ -86,17 +86,21 @@ class BacktestResultManager:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         return f"BT_{strategy_id}_{timestamp}"
 
-    def calculate_config_hash(self, config: Dict) -> str:
+    @staticmethod
+    def calculate_config_hash(config: Dict) -> str:
         """
         Calculate SHA256 hash of strategy configuration
 
+        Also used without a database connection (BacktestResultCache keys).
+        Non-JSON values (e.g. dates parsed from YAML) are hashed by their string form.
+
         Args:
             config: Strategy configuration dictionary
 
         Returns:
             SHA256 hash string
         """
-        config_json = json.dumps(config, sort_keys=True)
+        config_json = json.dumps(config, sort_keys=True, default=str)
         return hashlib.sha256(config_json.encode()).hexdigest()
 
     def store_strategy_config(self, strategy: Dict, strategy_id: Optional[str] = None) -> str:
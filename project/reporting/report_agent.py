@@ -611,6 +611,10 @@ class ReportAgent:
         # BacktestResults 객체에서 데이터 추출
         if hasattr(backtest_results, 'portfolio_values'):
             formatted['portfolio_value'] = pd.Series(backtest_results.portfolio_values)
+        elif getattr(backtest_results, 'ledger', None) is not None:
+            # EquityLedger 기반 결과: 일별 총 자산을 배열에서 바로 구성
+            formatted['portfolio_value'] = backtest_results.ledger.total_value_series()
+            formatted['returns'] = formatted['portfolio_value'].pct_change().fillna(0)
 
         if hasattr(backtest_results, 'daily_returns'):
             formatted['returns'] = pd.Series(backtest_results.daily_returns)
@@ -235,6 +235,8 @@ class ReportAgent:
         # Extract portfolio values if available
         if hasattr(backtest_results, 'portfolio_values'):
             results_dict['portfolio_values'] = backtest_results.portfolio_values
+        elif getattr(backtest_results, 'ledger', None) is not None:
+            results_dict['portfolio_values'] = backtest_results.ledger.total_value_series()
         elif hasattr(backtest_results, 'portfolio_history'):
             results_dict['portfolio_values'] = backtest_results.portfolio_history
 
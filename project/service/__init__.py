@@ -8,7 +8,15 @@ Strategy Layer에서 생성된 신호를 바탕으로 실제 거래 실행과 
 작성일: 2025-09-21
 
 모듈 구성:
+- backtest_models: 백테스트 공용 데이터 모델 (Position, Portfolio, Trade 등)
+- backtest_kernel: 일봉/분봉 공용 이벤트 기반 시뮬레이션 커널
+- backtest_checkpoint: 백테스트 상태 체크포인트 (이어서 실행)
+- backtest_profiler: 백테스트 단계별 실행 시간/할당 계측
+- backtest_result_cache: 동일 백테스트 결과 재사용 (로컬 디스크, 용량 제한/데이터 갱신 무효화)
 - daily_backtest_service: 일봉 백테스트 서비스
+- columnar_market_data: 배열 기반 시장 데이터 (columnar 엔진, 공유 메모리 게시)
+- batch_backtest_service: 멀티 시나리오 벡터화 백테스트 (파라미터 스윕)
+- equity_ledger: append-only 자산/포지션 이력 기록기
 - minute_backtest_service: 분봉 백테스트 서비스
 - execution_services: 백테스트 실행 함수들
 - backtest_engine: 통합 백테스트 엔진
@@ -16,6 +24,45 @@ Strategy Layer에서 생성된 신호를 바탕으로 실제 거래 실행과 
 - trade_recorder: 거래 기록 관리
 """
 
+try:
+    from .backtest_kernel import (
+        BacktestKernel,
+        BarSource,
+        FrameBarSource,
+        ColumnarBarSource,
+        DailyBarFill,
+        MinuteBarFill,
+        EntryFill
+    )
+except ImportError:
+    pass
+
+try:
+    from .backtest_checkpoint import (
+        BacktestCheckpoint,
+        save_checkpoint,
+        load_checkpoint
+    )
+except ImportError:
+    pass
+
+try:
+    from .backtest_profiler import (
+        PhaseProfiler,
+        NULL_PROFILER,
+        format_profile
+    )
+except ImportError:
+    pass
+
+try:
+    from .backtest_result_cache import (
+        BacktestResultCache,
+        data_fingerprint
+    )
+except ImportError:
+    pass
+
 try:
     from .daily_backtest_service import (
         DailyBacktestService,
@@ -24,6 +71,31 @@ try:
 except ImportError:
     pass
 
+try:
+    from .columnar_market_data import (
+        ColumnarMarketData,
+        SharedColumnarMarketData,
+        SharedColumnarHandle
+    )
+except ImportError:
+    pass
+
+try:
+    from .batch_backtest_service import (
+        BatchBacktestService,
+        expand_config_grid
+    )
+except ImportError:
+    pass
+
+try:
+    from .equity_ledger import (
+        EquityLedger,
+        LedgerPortfolioView
+    )
+except ImportError:
+    pass
+
 try:
     from .minute_backtest_service import (
         MinuteBacktestService
@@ -91,7 +163,15 @@ def get_service_info():
         'version': __version__,
         'author': __author__,
         'modules': [
+            'backtest_models',
+            'backtest_kernel',
+            'backtest_checkpoint',
+            'backtest_profiler',
+            'backtest_result_cache',
             'daily_backtest_service',
+            'columnar_market_data',
+            'batch_backtest_service',
+            'equity_ledger',
             'minute_backtest_service',
             'execution_services',
             'backtest_engine',
@@ -0,0 +1,213 @@
+"""
+Backtest Checkpoint - Service Layer Implementation
+
+백테스트 종료 시점의 전체 상태를 압축 파일(.npz) 하나로 저장하고,
+다음 실행에서 새 날짜만 이어서 시뮬레이션하기 위한 체크포인트.
+
+저장 내용:
+- 포트폴리오: 현금, 보유 포지션, 승/패 카운터
+- 커널 상태: half_sell_executed, trade_count
+- EquityLedger 배열 (일별 집계 + 포지션 델타)
+- 거래 기록 (컬럼 배열)
+- config/universe 해시 - 일치할 때만 이어서 실행
+
+pickle을 사용하지 않으며(allow_pickle=False), 메타데이터는 JSON으로 저장한다.
+"""
+
+import json
+import hashlib
+import os
+import dataclasses
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import logging
+
+from project.service.backtest_models import (
+    BacktestConfig, Position, Trade, Portfolio, TradeType, SellReason
+)
+from project.service.equity_ledger import EquityLedger
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+
+# 시뮬레이션 결과에 영향을 주지 않는 설정 (해시에서 제외)
+_NON_SIMULATION_FIELDS = ('message_output', 'engine_mode', 'enable_profiling', 'profile_allocations')
+
+_TRADE_FLOAT_FIELDS = ('quantity', 'price', 'pnl', 'again', 'buy_price', 'holding_days', 'risk')
+
+
+# ===== HASHING =====
+def config_hash(config: BacktestConfig) -> str:
+    """시뮬레이션 규칙에 영향을 주는 설정의 SHA256 해시"""
+    values = {key: value for key, value in dataclasses.asdict(config).items()
+              if key not in _NON_SIMULATION_FIELDS}
+    config_json = json.dumps(values, sort_keys=True, default=str)
+    return hashlib.sha256(config_json.encode()).hexdigest()
+
+
+def universe_hash(universe: List[str]) -> str:
+    """유니버스 해시 (순서 포함 - 매수 후보 순서가 결과에 영향)"""
+    return hashlib.sha256(json.dumps(list(universe)).encode()).hexdigest()
+
+
+# ===== CHECKPOINT =====
+class BacktestCheckpoint:
+    """
+    백테스트 상태 스냅샷
+
+    capture()로 실행 종료 상태를 만들고 save()/load()로 파일에 기록/복원한다.
+    restore()는 커널 상태를 되돌리고 (portfolio, ledger, trades)를 반환한다.
+    """
+
+    def __init__(self, meta: Dict, arrays: Dict[str, np.ndarray]):
+        self.meta = meta
+        self.arrays = arrays
+
+    @property
+    def last_date(self) -> pd.Timestamp:
+        """체크포인트에 기록된 마지막 시뮬레이션 날짜"""
+        return pd.Timestamp(self.meta['last_date'])
+
+    @classmethod
+    def capture(cls, config: BacktestConfig, universe: List[str], kernel, portfolio: Portfolio,
+                ledger: EquityLedger, trades: List[Trade]) -> 'BacktestCheckpoint':
+        """실행 종료 상태 캡처 (ledger의 마지막 날짜 기준)"""
+        if len(ledger) == 0:
+            raise ValueError("Cannot checkpoint an empty backtest")
+
+        meta = {
+            'version': CHECKPOINT_VERSION,
+            'config_hash': config_hash(config),
+            'universe_hash': universe_hash(universe),
+            'last_date': str(pd.Timestamp(ledger.dates[-1])),
+            'cash': portfolio.cash,
+            'stock_value': portfolio.stock_value,  # 증분 합계 그대로 (재합산 시 부동소수 오차)
+            'counters': [portfolio.win_count, portfolio.loss_count, portfolio.win_gain, portfolio.loss_gain],
+            'positions': [list(position._astuple()) for position in portfolio.positions.values()],
+            'half_sell_executed': sorted(kernel.half_sell_executed),
+            'trade_count': kernel.trade_count,
+        }
+
+        arrays = {f'ledger_{key}': value for key, value in ledger.state_arrays().items()}
+        arrays.update(cls._trade_arrays(trades))
+        return cls(meta, arrays)
+
+    def save(self, path: str):
+        """압축 .npz 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(f, meta=np.array(json.dumps(self.meta)), **self.arrays)
+        os.replace(tmp_path, path)
+
+        logger.info(f"Backtest checkpoint saved: {path} (last date {self.meta['last_date']}, "
+                    f"{os.path.getsize(path) / 1024:.1f} KB)")
+
+    @classmethod
+    def load(cls, path: str) -> 'BacktestCheckpoint':
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            arrays = {key: data[key] for key in data.files if key != 'meta'}
+
+        if meta.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version: {meta.get('version')}")
+        return cls(meta, arrays)
+
+    def matches(self, config: BacktestConfig, universe: List[str]) -> bool:
+        """config/universe가 체크포인트 생성 시점과 같은지 확인"""
+        if self.meta['config_hash'] != config_hash(config):
+            logger.warning("Checkpoint config hash mismatch")
+            return False
+        if self.meta['universe_hash'] != universe_hash(universe):
+            logger.warning("Checkpoint universe hash mismatch")
+            return False
+        return True
+
+    def restore(self, kernel) -> Tuple[Portfolio, EquityLedger, List[Trade]]:
+        """커널 상태 복원 후 (portfolio, ledger, trades) 반환"""
+        meta = self.meta
+        win_count, loss_count, win_gain, loss_gain = meta['counters']
+        portfolio = Portfolio(
+            cash=meta['cash'],
+            positions={state[0]: Position(*state) for state in meta['positions']},
+            win_count=win_count,
+            loss_count=loss_count,
+            win_gain=win_gain,
+            loss_gain=loss_gain
+        )
+        portfolio._stock_value = meta['stock_value']
+
+        ledger = EquityLedger.from_state_arrays(
+            {key[len('ledger_'):]: value for key, value in self.arrays.items() if key.startswith('ledger_')}
+        )
+
+        kernel.half_sell_executed = set(meta['half_sell_executed'])
+        kernel.trade_count = meta['trade_count']
+
+        return portfolio, ledger, self._trades_from_arrays(self.arrays)
+
+    # ===== TRADE ENCODING =====
+    @staticmethod
+    def _trade_arrays(trades: List[Trade]) -> Dict[str, np.ndarray]:
+        """거래 기록 → 컬럼 배열 (None은 빈 문자열/NaN/NaT)"""
+        arrays = {
+            'trade_ticker': np.array([t.ticker for t in trades], dtype=str),
+            'trade_type': np.array([t.trade_type.value for t in trades], dtype=str),
+            'trade_reason': np.array([t.reason.value if t.reason else '' for t in trades], dtype=str),
+            'trade_timestamp': np.array([np.datetime64(pd.Timestamp(t.timestamp), 'ns') for t in trades],
+                                        dtype='datetime64[ns]'),
+            'trade_buy_date': np.array([np.datetime64(pd.Timestamp(t.buy_date), 'ns') if t.buy_date is not None
+                                        else np.datetime64('NaT', 'ns') for t in trades],
+                                       dtype='datetime64[ns]'),
+        }
+        for name in _TRADE_FLOAT_FIELDS:
+            arrays[f'trade_{name}'] = np.array(
+                [np.nan if getattr(t, name) is None else getattr(t, name) for t in trades], dtype=np.float64
+            )
+        return arrays
+
+    @staticmethod
+    def _trades_from_arrays(arrays: Dict[str, np.ndarray]) -> List[Trade]:
+        columns = {name: arrays[f'trade_{name}'].tolist() for name in _TRADE_FLOAT_FIELDS}
+        optional = ('buy_price', 'holding_days', 'risk')
+
+        trades = []
+        for i, ticker in enumerate(arrays['trade_ticker'].tolist()):
+            reason = arrays['trade_reason'][i]
+            buy_date = arrays['trade_buy_date'][i]
+            values = {name: columns[name][i] for name in _TRADE_FLOAT_FIELDS}
+            for name in optional:
+                if np.isnan(values[name]):
+                    values[name] = None
+
+            trades.append(Trade(
+                ticker=ticker,
+                trade_type=TradeType(str(arrays['trade_type'][i])),
+                timestamp=pd.Timestamp(arrays['trade_timestamp'][i]),
+                reason=SellReason(str(reason)) if reason else None,
+                buy_date=None if np.isnat(buy_date) else pd.Timestamp(buy_date),
+                **values
+            ))
+        return trades
+
+
+def save_checkpoint(path: str, config: BacktestConfig, universe: List[str], kernel,
+                    portfolio: Portfolio, ledger: EquityLedger, trades: List[Trade]):
+    """백테스트 종료 상태를 체크포인트 파일로 저장"""
+    BacktestCheckpoint.capture(config, universe, kernel, portfolio, ledger, trades).save(path)
+
+
+def load_checkpoint(path: str) -> Optional[BacktestCheckpoint]:
+    """체크포인트 로드 (파일이 없거나 읽을 수 없으면 None)"""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        return BacktestCheckpoint.load(path)
+    except Exception as e:
+        logger.warning(f"Failed to load backtest checkpoint {path}: {e}")
+        return None
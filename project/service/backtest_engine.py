@@ -11,16 +11,18 @@ Strategy Layer에서 전달받은 신호를 바탕으로 백테스트 실행
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Any, Optional, Tuple, Union
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields, replace, asdict
 from enum import Enum
 from datetime import datetime, timedelta
 import multiprocessing as mp
 from concurrent.futures import ProcessPoolExecutor, as_completed
+import logging
 import time
 
 from .daily_backtest_service import DailyBacktestService, BacktestConfig
 from .minute_backtest_service import MinuteBacktestService
 from .execution_services import BacktestExecutionServices, ExecutionConfig
+from .columnar_market_data import ColumnarMarketData, SharedColumnarHandle
 
 
 class TimeFrame(Enum):
@@ -182,6 +184,7 @@ class BacktestEngine:
             execution_time = time.time() - start_time
 
             # 결과에 실행 시간 추가
+            result = self._service_result_to_dict(result)
             result['execution_time'] = execution_time
             result['timeframe'] = timeframe.value
 
@@ -268,6 +271,10 @@ class BacktestEngine:
         """
         파라미터 최적화 (그리드 서치)
 
+        시장 데이터는 한 번만 준비(_prepare_data → ColumnarMarketData)하여 모든 조합이 공유한다.
+        조합의 키는 BacktestConfig 필드(max_positions, std_risk 등)여야 하며 해당 실행의 설정으로 적용된다.
+        신호는 미리 계산된 데이터를 쓰므로 그 외 키는 결과에 영향이 없어 ValueError로 거부한다.
+
         Args:
             parameter_ranges: 최적화할 파라미터 범위 {param_name: [values]}
             universe: 백테스트 대상 종목 리스트
@@ -278,15 +285,27 @@ class BacktestEngine:
         Returns:
             OptimizationResult: 최적화 결과
         """
+        if self.timeframe != TimeFrame.DAILY:
+            raise ValueError(f"Parameter optimization supports daily timeframe only: {self.timeframe}")
+
+        # 결과를 바꾸지 못하는 키는 최적 파라미터로 보고되지 않도록 거부
+        config_fields = {f.name for f in fields(BacktestConfig)}
+        unknown = sorted(set(parameter_ranges) - config_fields)
+        if unknown:
+            raise ValueError(f"Parameters are not BacktestConfig fields and would have no effect: {unknown}")
+
         # 파라미터 조합 생성
         parameter_combinations = self._generate_parameter_combinations(parameter_ranges)
 
+        # 시장 데이터 준비 (한 번)
+        columnar = self._prepare_columnar(universe, df_data)
+
         # 최적화 실행
         if self.config.enable_multiprocessing and len(parameter_combinations) > 1:
-            results = self._optimize_parallel(parameter_combinations, universe, df_data,
+            results = self._optimize_parallel(parameter_combinations, universe, columnar,
                                            base_strategy, optimization_metric)
         else:
-            results = self._optimize_sequential(parameter_combinations, universe, df_data,
+            results = self._optimize_sequential(parameter_combinations, universe, columnar,
                                              base_strategy, optimization_metric)
 
         # 최적 결과 선택
@@ -299,41 +318,48 @@ class BacktestEngine:
             parameter_results=results
         )
 
+    def _prepare_columnar(self, universe: List[str], df_data: Dict[str, pd.DataFrame]) -> ColumnarMarketData:
+        """최적화 공용 시장 데이터 (DailyBacktestService._prepare_data와 같은 전처리)"""
+        processed_data = self.daily_service._prepare_data(universe, dict(df_data))
+        if processed_data.empty:
+            raise ValueError("No valid data for parameter optimization")
+        return ColumnarMarketData.from_frame(processed_data)
+
     def _optimize_parallel(self, parameter_combinations: List[Dict], universe: List[str],
-                          df_data: Dict[str, pd.DataFrame], base_strategy: Dict[str, Any],
+                          columnar: ColumnarMarketData, base_strategy: Dict[str, Any],
                           optimization_metric: str) -> List[Tuple[Dict, BacktestResult]]:
-        """병렬 파라미터 최적화"""
-        max_workers = self.config.max_workers or mp.cpu_count()
-
-        with ProcessPoolExecutor(max_workers=max_workers) as executor:
-            futures = []
-
-            for params in parameter_combinations:
-                future = executor.submit(
-                    self._single_optimization_run,
-                    params, universe, df_data, base_strategy
-                )
-                futures.append((params, future))
-
-            results = []
-            for params, future in futures:
-                try:
-                    result = future.result()
+        """
+        병렬 파라미터 최적화
+
+        시장 데이터 배열은 공유 메모리에 한 번 게시하고, 워커는 초기화 시 복사 없이 연결한다.
+        작업마다 전달되는 것은 파라미터 dict뿐이다.
+        """
+        max_workers = min(self.config.max_workers or mp.cpu_count(), len(parameter_combinations))
+        chunksize = max(1, len(parameter_combinations) // (max_workers * 4))
+
+        results = []
+        with columnar.to_shared() as shared:
+            with ProcessPoolExecutor(max_workers=max_workers,
+                                     initializer=_init_optimization_worker,
+                                     initargs=(self.config, shared.handle, universe, base_strategy)) as executor:
+                for params, result, error in executor.map(_optimization_task, parameter_combinations,
+                                                          chunksize=chunksize):
+                    if error is not None:
+                        print(f"Error in optimization run with params {params}: {error}")
+                        continue
                     results.append((params, result))
-                except Exception as e:
-                    print(f"Error in optimization run with params {params}: {e}")
 
         return results
 
     def _optimize_sequential(self, parameter_combinations: List[Dict], universe: List[str],
-                           df_data: Dict[str, pd.DataFrame], base_strategy: Dict[str, Any],
+                           columnar: ColumnarMarketData, base_strategy: Dict[str, Any],
                            optimization_metric: str) -> List[Tuple[Dict, BacktestResult]]:
         """순차 파라미터 최적화"""
         results = []
 
         for params in parameter_combinations:
             try:
-                result = self._single_optimization_run(params, universe, df_data, base_strategy)
+                result = self._single_optimization_run(params, universe, columnar, base_strategy)
                 results.append((params, result))
             except Exception as e:
                 print(f"Error in optimization run with params {params}: {e}")
@@ -341,18 +367,27 @@ class BacktestEngine:
         return results
 
     def _single_optimization_run(self, parameters: Dict, universe: List[str],
-                               df_data: Dict[str, pd.DataFrame],
+                               columnar: ColumnarMarketData,
                                base_strategy: Dict[str, Any]) -> BacktestResult:
-        """단일 최적화 실행"""
+        """단일 최적화 실행 (준비된 columnar 데이터 사용)"""
         # 파라미터를 적용한 전략 설정 생성
         strategy = base_strategy.copy()
         strategy.update(parameters)
 
-        # 신호 생성
-        strategy_signals = self._generate_mock_signals(strategy, universe)
+        # 전략 설정 중 BacktestConfig 필드는 이번 실행 설정으로 적용
+        config_fields = {f.name for f in fields(BacktestConfig)}
+        overrides = {key: value for key, value in strategy.items() if key in config_fields}
+        service = DailyBacktestService(replace(self.backtest_config, **overrides))
 
         # 백테스트 실행
-        return self.run_backtest(universe, df_data, strategy_signals)
+        start_time = time.time()
+        result = self._service_result_to_dict(service.run_backtest_columnar(
+            universe, columnar, market=self.config.market, area=self.config.area
+        ))
+        result['execution_time'] = time.time() - start_time
+        result['strategy_name'] = strategy.get('name', 'Default')
+
+        return self._convert_to_backtest_result(result, TimeFrame.DAILY.value)
 
     def _generate_parameter_combinations(self, parameter_ranges: Dict[str, List]) -> List[Dict]:
         """파라미터 조합 생성"""
@@ -382,6 +417,40 @@ class BacktestEngine:
             metadata={'strategy': strategy}
         )
 
+    def _service_result_to_dict(self, result) -> Dict:
+        """
+        서비스 BacktestResult(dataclass) → 엔진 결과 dict
+
+        performance_metrics에 일별 총자산 기반 annual_return/sharpe_ratio와 시계열을 더한다.
+        """
+        metrics = dict(result.performance_metrics)
+        if result.ledger is not None and len(result.ledger):
+            equity_curve = result.ledger.total_value_series()
+        else:
+            equity_curve = pd.Series(dtype=float)
+
+        daily_returns = equity_curve.pct_change().dropna()
+        std = daily_returns.std() if len(daily_returns) > 1 else 0.0
+        sharpe_ratio = float(daily_returns.mean() / std * np.sqrt(252)) if std > 0 else 0.0
+        total_return = metrics.get('total_return', 0.0)
+        annual_return = ((1 + total_return) ** (252 / len(equity_curve)) - 1
+                         if len(equity_curve) and total_return > -1 else 0.0)
+
+        return {
+            **metrics,
+            'annual_return': float(annual_return),
+            'sharpe_ratio': sharpe_ratio,
+            'trades': [asdict(trade) for trade in result.trades],
+            'portfolio_history': (result.daily_balance.reset_index().to_dict('records')
+                                  if result.daily_balance is not None else []),
+            'daily_returns': daily_returns,
+            'equity_curve': equity_curve,
+            'drawdown_series': (equity_curve / equity_curve.cummax() - 1
+                                if len(equity_curve) else pd.Series(dtype=float)),
+            'detailed_metrics': metrics,
+            'execution_time': result.execution_time
+        }
+
     def _convert_to_backtest_result(self, result_dict: Dict, timeframe: str) -> BacktestResult:
         """백테스트 결과를 BacktestResult 객체로 변환"""
         # 기본 메트릭 계산
@@ -398,10 +467,10 @@ class BacktestEngine:
         trades = result_dict.get('trades', [])
         portfolio_history = result_dict.get('portfolio_history', [])
 
-        # 임시 시계열 데이터 (실제로는 백테스트 결과에서 생성)
-        daily_returns = pd.Series(dtype=float)
-        equity_curve = pd.Series(dtype=float)
-        drawdown_series = pd.Series(dtype=float)
+        # 시계열 데이터 (_service_result_to_dict에서 생성, 없으면 빈 시리즈)
+        daily_returns = result_dict.get('daily_returns', pd.Series(dtype=float))
+        equity_curve = result_dict.get('equity_curve', pd.Series(dtype=float))
+        drawdown_series = result_dict.get('drawdown_series', pd.Series(dtype=float))
 
         return BacktestResult(
             timeframe=timeframe,
@@ -475,4 +544,27 @@ class BacktestEngine:
         overall_status = 'healthy' if all(s == 'healthy' for s in status.values()) else 'degraded'
         status['overall'] = overall_status
 
-        return status
\ No newline at end of file
+        return status
+
+
+# ===== OPTIMIZATION WORKER (process pool) =====
+_worker_engine: Optional[BacktestEngine] = None
+_worker_context: Optional[Tuple[ColumnarMarketData, List[str], Dict[str, Any]]] = None
+
+
+def _init_optimization_worker(config: BacktestEngineConfig, handle: SharedColumnarHandle,
+                              universe: List[str], base_strategy: Dict[str, Any]):
+    """워커 프로세스 초기화: 공유 메모리 시장 데이터에 연결 (복사 없음)"""
+    global _worker_engine, _worker_context
+    logging.getLogger('project.service').setLevel(logging.WARNING)
+    _worker_engine = BacktestEngine(config)
+    _worker_context = (ColumnarMarketData.from_shared(handle), universe, base_strategy)
+
+
+def _optimization_task(parameters: Dict) -> Tuple[Dict, Optional[BacktestResult], Optional[str]]:
+    """파라미터 조합 하나 실행 → (params, result, error)"""
+    columnar, universe, base_strategy = _worker_context
+    try:
+        return parameters, _worker_engine._single_optimization_run(parameters, universe, columnar, base_strategy), None
+    except Exception as e:
+        return parameters, None, str(e)
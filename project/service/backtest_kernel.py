@@ -0,0 +1,914 @@
+"""
+Backtest Kernel - Service Layer Implementation
+
+일봉/분봉 백테스트가 공유하는 이벤트 기반 시뮬레이션 커널.
+
+- BarSource: 시간 순서의 바(일봉/분봉 등 해상도 무관) 스트림
+    - FrameBarSource: MultiIndex DataFrame에서 종목별 dict 추출 (기존 dataframe 경로)
+    - ColumnarBarSource: ColumnarMarketData 배열 (columnar 경로)
+- FillModel: 매수 후보의 체결 방식
+    - DailyBarFill: 당일 OHLC로 체결 (TestTradeD)
+    - MinuteBarFill: MinuteBarStore 분봉 재생으로 체결 (일봉 신호 + 분봉 체결)
+- BacktestKernel: 매도(손절/신호/50% 매도) → 보유 갱신 → 매수/휩쏘 규칙을 한 곳에서 적용하고
+  EquityLedger에 일별 상태를 기록
+
+DailyBacktestService / MinuteBacktestService는 BarSource와 FillModel 조합만 다르다.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Callable, Dict, List, Optional, Tuple
+from dataclasses import dataclass
+import logging
+
+from project.service.backtest_models import (
+    BacktestConfig, Position, Trade, Portfolio, DayTradingResult,
+    TradeType, SellReason, _DATACLASS_SLOTS
+)
+from project.service.columnar_market_data import ColumnarMarketData
+from project.strategy.candidate_ranking import top_k_indices
+from project.service.backtest_profiler import PhaseProfiler, NULL_PROFILER
+from project.service.equity_ledger import EquityLedger
+from project.database.minute_bar_store import MinuteBarStore
+
+logger = logging.getLogger(__name__)
+
+
+# ===== BAR SOURCES =====
+class BarSource:
+    """
+    시간 순서 바 스트림 인터페이스
+
+    커널은 인덱스 i마다 유효 종목, 보유/후보 종목의 필드 dict, 매수 후보만 요청한다.
+    매수 후보는 candidate_fields 중 하나라도 >= 1 인 종목 (일봉: BuySig/signal, 분봉: BuySig).
+    """
+
+    def __init__(self, dates: np.ndarray, candidate_fields: Tuple[str, ...] = ('BuySig', 'signal')):
+        self.dates = dates
+        self.candidate_fields = candidate_fields
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def date(self, index: int) -> pd.Timestamp:
+        return pd.Timestamp(self.dates[index])
+
+    def valid_tickers(self, index: int) -> List[str]:
+        """오늘/전일 close > 0 인 종목 (universe 순서)"""
+        raise NotImplementedError
+
+    def rows(self, index: int, tickers: List[str]) -> Dict[str, Dict]:
+        """지정 종목의 필드 dict (_extract_market_data와 동일한 구조)"""
+        raise NotImplementedError
+
+    def buy_candidates(self, index: int, valid: List[str]) -> List[str]:
+        """매수 후보: candidate_fields 중 하나라도 >= 1 (universe 순서)"""
+        raise NotImplementedError
+
+    def field_values(self, index: int, tickers: List[str], field: str) -> np.ndarray:
+        """지정 종목의 필드 값 배열 (없으면 0.0)"""
+        raise NotImplementedError
+
+    def top_candidates(self, index: int, candidates: List[str], k: int, rank_key: str) -> List[str]:
+        """rank_key 내림차순 상위 K개 후보 (동률은 universe 순서)"""
+        values = self.field_values(index, candidates, rank_key)
+        return [candidates[c] for c in top_k_indices(values, k)]
+
+
+class FrameBarSource(BarSource):
+    """MultiIndex(Ticker, Field) DataFrame 기반 스트림 - 인덱스별 dict 추출 결과를 2개까지 캐시"""
+
+    def __init__(self, df: pd.DataFrame, universe: List[str],
+                 extract: Callable[[pd.DataFrame, int], Dict[str, Dict]],
+                 candidate_fields: Tuple[str, ...] = ('BuySig', 'signal')):
+        """
+        Args:
+            df: _prepare_data 결과
+            universe: 종목 순서
+            extract: (df, index) -> {ticker: {field: value}} (서비스의 _extract_market_data)
+            candidate_fields: 매수 후보 판정 필드
+        """
+        super().__init__(df.index.values, candidate_fields)
+        self.df = df
+        self.universe = universe
+        self._extract = extract
+        self._cache: Dict[int, Dict[str, Dict]] = {}
+
+    def market_data(self, index: int) -> Dict[str, Dict]:
+        data = self._cache.get(index)
+        if data is None:
+            data = self._extract(self.df, index)
+            if len(self._cache) >= 2:
+                self._cache.pop(min(self._cache))
+            self._cache[index] = data
+        return data
+
+    def valid_tickers(self, index: int) -> List[str]:
+        market_data = self.market_data(index)
+        previous_data = self.market_data(index - 1)
+        return [ticker for ticker in self.universe
+                if ticker in market_data and ticker in previous_data
+                and market_data[ticker].get('close', 0) > 0
+                and previous_data[ticker].get('close', 0) > 0]
+
+    def rows(self, index: int, tickers: List[str]) -> Dict[str, Dict]:
+        market_data = self.market_data(index)
+        return {ticker: market_data[ticker] for ticker in tickers if ticker in market_data}
+
+    def buy_candidates(self, index: int, valid: List[str]) -> List[str]:
+        market_data = self.market_data(index)
+        candidates = []
+        for ticker in valid:
+            ticker_data = market_data.get(ticker, {})
+            # 매수 신호 검사: BuySig >= 1 또는 signal >= 1 (sophisticated signal 지원)
+            if any(ticker_data.get(name, 0) >= 1 for name in self.candidate_fields):
+                candidates.append(ticker)
+        return candidates
+
+    def field_values(self, index: int, tickers: List[str], field: str) -> np.ndarray:
+        market_data = self.market_data(index)
+        return np.array([market_data.get(ticker, {}).get(field, 0.0) for ticker in tickers], dtype=np.float64)
+
+
+class ColumnarBarSource(BarSource):
+    """ColumnarMarketData 기반 스트림 - 유효 종목/후보는 배열 마스크, 보유/후보 종목만 dict 생성"""
+
+    def __init__(self, columnar: ColumnarMarketData, universe: List[str],
+                 candidate_fields: Tuple[str, ...] = ('BuySig', 'signal')):
+        super().__init__(columnar.dates, candidate_fields)
+        self.columnar = columnar
+        self.universe_idx = columnar.universe_indices(universe)
+        self._valid_mask: Optional[Tuple[int, np.ndarray]] = None
+
+    def _valid(self, index: int) -> np.ndarray:
+        if self._valid_mask is None or self._valid_mask[0] != index:
+            field_row = self.columnar.field_row
+            mask = ((field_row('close', index, self.universe_idx) > 0)
+                    & (field_row('close', index - 1, self.universe_idx) > 0))
+            self._valid_mask = (index, mask)
+        return self._valid_mask[1]
+
+    def valid_tickers(self, index: int) -> List[str]:
+        tickers = self.columnar.tickers
+        return [tickers[t] for t in self.universe_idx[self._valid(index)]]
+
+    def rows(self, index: int, tickers: List[str]) -> Dict[str, Dict]:
+        return self.columnar.rows(index, tickers)
+
+    def buy_candidates(self, index: int, valid: List[str]) -> List[str]:
+        columnar = self.columnar
+        signal = np.zeros(len(self.universe_idx), dtype=bool)
+        for name in self.candidate_fields:
+            signal |= columnar.field_row(name, index, self.universe_idx) >= 1
+        selected = self.universe_idx[self._valid(index) & signal]
+        return [columnar.tickers[t] for t in selected]
+
+    def field_values(self, index: int, tickers: List[str], field: str) -> np.ndarray:
+        columnar = self.columnar
+        cols = np.array([columnar.ticker_index[ticker] for ticker in tickers], dtype=np.intp)
+        return columnar.field_row(field, index, cols)
+
+
+# ===== FILL MODELS =====
+@dataclass(**_DATACLASS_SLOTS)
+class EntryFill:
+    """매수 체결 결과 (포트폴리오와 무관, 시장 데이터만으로 결정)"""
+    ticker: str
+    entry_price: float                       # 슬리피지 포함 체결가
+    daily_gain: float                        # 체결가 대비 당일 종가 수익률
+    losscut_price: float                     # 신규 포지션 손절가
+    whipsaw_gain: Optional[float] = None     # 당일 손절(휩쏘) 시 수익률, 없으면 None
+    buy_time: Optional[pd.Timestamp] = None
+    sell_time: Optional[pd.Timestamp] = None
+
+
+class DailyBarFill:
+    """당일 OHLC 체결 (TestTradeD 규칙)"""
+
+    def __init__(self, config: BacktestConfig):
+        self.config = config
+
+    def entry(self, ticker: str, ticker_data: Dict, date: pd.Timestamp) -> Optional[tuple]:
+        """
+        체결가 결정
+
+        Returns:
+            (슬리피지 포함 체결가, 당일 종가, 체결 시각, 손절 검사용 컨텍스트) 또는 None
+        """
+        target_price = ticker_data.get('TargetPrice', 0)
+        open_price = ticker_data.get('open', 0)
+        high_price = ticker_data.get('high', 0)
+
+        if target_price <= 0 or open_price <= 0:
+            return None
+
+        # Determine entry price (preserved from original logic)
+        if target_price >= open_price and target_price <= high_price:
+            entry_price = target_price
+        elif target_price < open_price:
+            entry_price = open_price
+        else:
+            entry_price = open_price
+
+        # Apply slippage
+        entry_price *= (1 + self.config.slippage)
+        return entry_price, ticker_data.get('close', 0), None, None
+
+    def losscut_exit(self, ticker: str, ticker_data: Dict, entry_price: float, daily_gain: float,
+                     losscut_price: float, context) -> Optional[tuple]:
+        """
+        진입 당일 손절(휩쏘) 여부
+
+        Returns:
+            (휩쏘 수익률, 청산 시각) 또는 None
+        """
+        low_price = ticker_data.get('low', 0)
+        low_gain = (low_price - entry_price) / entry_price if entry_price > 0 else 0
+        cut_gain = (losscut_price - entry_price) / entry_price if entry_price > 0 else 0
+
+        if low_gain < cut_gain:
+            return daily_gain, None
+        return None
+
+
+class MinuteBarFill(DailyBarFill):
+    """
+    분봉 재생 체결 (일봉 신호 + 분봉 체결)
+
+    - 진입: high가 TargetPrice 이상인 첫 분봉, 체결가 = max(TargetPrice, 해당 분봉 open)
+    - 휩쏘: 진입 이후 분봉 중 low < 진입 시점 손절가 인 첫 분봉, 청산가 = min(open, 손절가)
+      (진입 시점 손절가 = LossCutPrice, 없으면 again=1 기준 초기 손절가 - 당일 종가 미사용)
+    - 당일 종가 = 마지막 분봉 close
+    해당 종목/일자 분봉이 없으면 DailyBarFill 규칙으로 체결.
+    """
+
+    def __init__(self, config: BacktestConfig, store: Optional[MinuteBarStore]):
+        super().__init__(config)
+        self.store = store
+
+    def entry(self, ticker: str, ticker_data: Dict, date: pd.Timestamp):
+        bars = self.store.day_bars(ticker, date) if self.store is not None else None
+        if bars is None:
+            return super().entry(ticker, ticker_data, date)
+
+        target_price = ticker_data.get('TargetPrice', 0)
+        if target_price <= 0:
+            return None
+
+        crossed = np.flatnonzero(np.asarray(bars.high, dtype=np.float64) >= target_price)
+        if len(crossed) == 0:
+            return None
+
+        bar = int(crossed[0])
+        entry_price = max(target_price, float(bars.open[bar])) * (1 + self.config.slippage)
+        return entry_price, float(bars.close[-1]), bars.time_at(bar), (bars, bar)
+
+    def losscut_exit(self, ticker: str, ticker_data: Dict, entry_price: float, daily_gain: float,
+                     losscut_price: float, context):
+        if context is None:
+            return super().losscut_exit(ticker, ticker_data, entry_price, daily_gain, losscut_price, context)
+
+        bars, bar = context
+        hits = np.flatnonzero(np.asarray(bars.low[bar + 1:], dtype=np.float64) < losscut_price)
+        if len(hits) == 0:
+            return None
+
+        exit_bar = bar + 1 + int(hits[0])
+        exit_price = min(float(bars.open[exit_bar]), losscut_price)
+        return (exit_price - entry_price) / entry_price, bars.time_at(exit_bar)
+
+
+# ===== KERNEL =====
+class BacktestKernel:
+    """
+    이벤트 기반 백테스트 커널
+
+    BarSource의 각 바(인덱스)마다 매도 → 보유 갱신 → 매수/휩쏘 규칙을 적용한다.
+    규칙은 refer TestTradeD 로직을 따르며 해상도와 무관하다.
+    """
+
+    def __init__(self, config: BacktestConfig, fill_model: Optional[DailyBarFill] = None):
+        """
+        Args:
+            config: BacktestConfig
+            fill_model: 매수 체결 모델 (기본 DailyBarFill)
+        """
+        self.config = config
+        self.fill_model = fill_model or DailyBarFill(config)
+
+        # Trading state
+        self.half_sell_executed = set()  # Track half-sold stocks
+        self.trade_count = 0
+
+        # 미리 계산된 체결 결과 {index: {ticker: EntryFill or None}} - 해당 바 처리 후 폐기
+        self._entry_cache: Dict[int, Dict[str, Optional[EntryFill]]] = {}
+
+        # 단계별 계측 (서비스가 실행마다 설정, 기본은 no-op)
+        self.profiler: PhaseProfiler = NULL_PROFILER
+
+    # ===== EVENT LOOP =====
+    def run(self, source: BarSource,
+            on_step: Optional[Callable[[int, pd.Timestamp, Portfolio, DayTradingResult], None]] = None,
+            portfolio: Optional[Portfolio] = None,
+            ledger: Optional[EquityLedger] = None,
+            start: int = 0) -> Tuple[List[Trade], EquityLedger, List[DayTradingResult], Portfolio]:
+        """
+        바 스트림 전체 시뮬레이션
+
+        Args:
+            source: BarSource
+            on_step: 각 바 처리 후 호출 (index, date, portfolio, step_result) - 출력 등
+            portfolio/ledger: 이어서 실행할 상태 (None이면 초기 현금으로 시작)
+            start: 시작 인덱스 (0이면 첫 바는 초기 상태 기록만)
+
+        Returns:
+            (trades, ledger, step_results, portfolio)
+        """
+        if portfolio is None:
+            portfolio = Portfolio(cash=self.config.initial_cash)
+        if ledger is None:
+            ledger = EquityLedger(initial_capacity=len(source))
+        trades: List[Trade] = []
+        step_results: List[DayTradingResult] = []
+        profiler = self.profiler
+
+        for i in range(start, len(source)):
+            date = source.date(i)
+            if i == 0:
+                # First bar initialization
+                ledger.record(date, portfolio)
+                continue
+
+            step_result = self.process_step(source, i, date, portfolio)
+
+            # 일별 Portfolio 상태는 ledger에 기록 (DayTradingResult는 참조를 보관하지 않음)
+            portfolio = step_result.portfolio or portfolio
+            step_result.portfolio = None
+            trades.extend(step_result.trades)
+            step_results.append(step_result)
+            with profiler.phase('record'):
+                ledger.record(date, portfolio,
+                              opened=[t.ticker for t in step_result.trades if t.trade_type == TradeType.BUY])
+
+            if on_step is not None:
+                with profiler.phase('report'):
+                    on_step(i, date, portfolio, step_result)
+
+        # 사용되지 않은 사전 계산 결과는 다음 실행으로 넘기지 않음
+        self._entry_cache.clear()
+        return trades, ledger, step_results, portfolio
+
+    def process_step(self, source: BarSource, index: int, date: pd.Timestamp,
+                     portfolio: Portfolio) -> DayTradingResult:
+        """
+        바 하나 처리 (Based on TestTradeD.trade_stocks main loop logic)
+        보유 종목과 매수 후보만 dict로 읽어 매도/매수 규칙에 전달
+        """
+        result = DayTradingResult(date=date)
+        profiler = self.profiler
+
+        try:
+            # Filter valid stocks with complete data
+            with profiler.phase('extract'):
+                valid_stocks = source.valid_tickers(index)
+
+            if not valid_stocks:
+                result.portfolio = portfolio
+                return result
+
+            # Process sell orders first (preserved order from original)
+            with profiler.phase('extract'):
+                held = list(portfolio.positions.keys())
+                held_data, previous_data = source.rows(index, held), source.rows(index - 1, held)
+            with profiler.phase('sell'):
+                sell_trades = self._execute_sell_orders(portfolio, held_data, previous_data, date)
+            result.trades.extend(sell_trades)
+
+            # Process buy orders for available positions
+            with profiler.phase('candidates'):
+                buy_candidates = source.buy_candidates(index, valid_stocks)
+                result.buy_candidates = buy_candidates
+
+                available_slots = max(self.config.max_positions - portfolio.position_count, 0)
+                buy_candidates = self.slot_candidates(source, index, buy_candidates, available_slots)
+            with profiler.phase('extract'):
+                buy_data = source.rows(index, buy_candidates)
+            with profiler.phase('buy'):
+                buy_trades = self._execute_buy_orders(buy_candidates, portfolio, buy_data, date, index)
+            result.trades.extend(buy_trades)
+            self._entry_cache.pop(index, None)
+
+            # Update portfolio
+            result.portfolio = portfolio
+
+            return result
+
+        except Exception as e:
+            logger.error(f"Error processing trading day {date}: {e}")
+            result.portfolio = portfolio
+            return result
+
+    def slot_candidates(self, source: BarSource, index: int, candidates: List[str], slots: int) -> List[str]:
+        """
+        빈 슬롯에 들어갈 수 있는 후보 (최대 slots개)
+
+        rank_key가 있으면 argpartition 상위 K 선정 (전체 정렬 없음), 없으면 universe 순서 앞 K개.
+        상위 K는 K가 작아져도 같은 순서의 접두사이므로 max_positions 기준 결과가 모든 슬롯 수를 포함한다.
+        """
+        rank_key = getattr(self.config, 'candidate_rank_key', None)
+        if rank_key and slots > 0:
+            return source.top_candidates(index, candidates, slots, rank_key)
+        return candidates[:slots]
+
+    # ===== SELL RULES =====
+    def _execute_sell_orders(self, portfolio: Portfolio, market_data: Dict[str, Dict],
+                           previous_data: Dict[str, Dict], date: pd.Timestamp) -> List[Trade]:
+        """
+        Execute sell orders based on conditions
+        Preserved logic from TestTradeD.trade_stocks sell processing
+        """
+        trades = []
+        positions_to_remove = []
+
+        for ticker, position in portfolio.positions.items():
+            if ticker not in market_data or ticker not in previous_data:
+                continue
+
+            current_price = market_data[ticker].get('close', 0)
+            previous_close = previous_data[ticker].get('close', 0)
+            low_price = market_data[ticker].get('low', current_price)
+            open_price = market_data[ticker].get('open', current_price)
+            sell_signal = market_data[ticker].get('SellSig', 0)
+
+            if previous_close <= 0:
+                continue
+
+            # IMPORTANT: Update duration before checking sell conditions
+            # This ensures correct holding period calculation even if sold immediately
+            position.duration += 1
+
+            # Check loss cut condition
+            if low_price < position.losscut_price:
+                sell_price = min(open_price, position.losscut_price) if open_price < position.losscut_price else position.losscut_price
+                gain = (sell_price - previous_close) / previous_close
+
+                if self.config.message_output:
+                    logger.warning(f"{date} - LOSSCUT TRIGGERED: {ticker}, "
+                                 f"Low: ${low_price:.2f} < LossCut: ${position.losscut_price:.2f}, "
+                                 f"Sell: ${sell_price:.2f}")
+
+                trade = self._execute_sell_trade(
+                    ticker, position, sell_price, gain, date, SellReason.LOSSCUT, portfolio
+                )
+                trades.append(trade)
+                positions_to_remove.append(ticker)
+
+            # Check sell signal condition
+            elif sell_signal == 1:
+                sell_price = open_price
+                gain = (sell_price - previous_close) / previous_close
+
+                trade = self._execute_sell_trade(
+                    ticker, position, sell_price, gain, date, SellReason.SIGNAL_SELL, portfolio
+                )
+                trades.append(trade)
+                positions_to_remove.append(ticker)
+
+            # Check half sell condition (preserved from original)
+            elif (position.again >= (1 + self.config.half_sell_threshold) and
+                  ticker not in self.half_sell_executed and
+                  self.config.enable_half_sell):
+
+                sell_price = current_price
+                gain = (sell_price - previous_close) / previous_close
+
+                trade = self._execute_half_sell_trade(
+                    ticker, position, sell_price, gain, date, portfolio
+                )
+                trades.append(trade)
+                self.half_sell_executed.add(ticker)
+
+            else:
+                # Update position for holding (preserved from original remain_stock logic)
+                # Duration was already incremented above, so only update prices
+                self._update_holding_position(ticker, position, current_price, previous_close)
+
+        # Remove sold positions
+        for ticker in positions_to_remove:
+            if ticker in portfolio.positions:
+                del portfolio.positions[ticker]
+
+        return trades
+
+    def _execute_sell_trade(self, ticker: str, position: Position, sell_price: float,
+                          gain: float, date: pd.Timestamp, reason: SellReason,
+                          portfolio: Portfolio) -> Trade:
+        """Execute a complete sell trade"""
+        # 누적 수익률 계산 (오늘 gain 포함)
+        asset_a_gain_new = position.again * (1 + gain)
+
+        # 회수 현금 = 원래 투자금 * 누적 수익률 * (1 - 슬리피지)
+        # balance는 원래 투자금, again은 누적 수익률
+        return_cash = round(float(position.balance * asset_a_gain_new * (1 - self.config.slippage)), 3)
+
+        # Update portfolio
+        portfolio.cash += return_cash
+
+        # refer과 동일한 승패 판정 로직 (슬리피지 적용)
+        if asset_a_gain_new * (1 - self.config.slippage) <= 1:
+            portfolio.loss_count += 1
+            portfolio.loss_gain += abs(asset_a_gain_new - 1)
+        elif asset_a_gain_new * (1 - self.config.slippage) > 1:
+            portfolio.win_count += 1
+            portfolio.win_gain += abs(asset_a_gain_new - 1)
+
+        trade = Trade(
+            ticker=ticker,
+            trade_type=TradeType.SELL,
+            quantity=position.quantity,
+            price=sell_price,
+            timestamp=date,
+            reason=reason,
+            pnl=return_cash - position.balance,
+            again=asset_a_gain_new,
+            buy_price=position.avg_price,
+            holding_days=position.duration,
+            risk=position.risk
+        )
+
+        self.trade_count += 1
+
+        if self.config.message_output:
+            logger.info(f"{date} - SELL: {ticker}, AGAIN: {asset_a_gain_new:.3f}, "
+                       f"HoldDays: {position.duration}, Price: {sell_price:.2f}")
+
+        return trade
+
+    def _execute_half_sell_trade(self, ticker: str, position: Position, sell_price: float,
+                               gain: float, date: pd.Timestamp, portfolio: Portfolio) -> Trade:
+        """Execute half sell trade (preserved from original half_sell_stock logic)"""
+        # Calculate half sell metrics
+        half_gain = position.again * (1 + gain)
+        original_half_balance = position.balance * 0.5  # 50% of original balance BEFORE update
+        half_return_cash = original_half_balance * half_gain
+
+        # Update portfolio
+        portfolio.cash += half_return_cash
+        portfolio.win_count += 0.5  # Half position win
+        portfolio.win_gain += (half_gain - 1) * 0.5
+
+        # Update position (keep remaining 50%)
+        position.balance *= 0.5
+        position.again = half_gain
+        position.risk *= self.config.half_sell_risk_multiplier  # Increase risk for remaining position
+
+        trade = Trade(
+            ticker=ticker,
+            trade_type=TradeType.HALF_SELL,
+            quantity=position.quantity * 0.5,
+            price=sell_price,
+            timestamp=date,
+            reason=SellReason.HALF_SELL_PROFIT,
+            pnl=half_return_cash - original_half_balance,  # Correct PnL calculation
+            again=half_gain,
+            buy_price=position.avg_price,
+            holding_days=position.duration,
+            risk=position.risk
+        )
+
+        if self.config.message_output:
+            logger.info(f"{date} - HALF SELL: {ticker}, AGAIN: {half_gain:.3f}, "
+                       f"NewRisk: {position.risk:.3f}")
+
+        return trade
+
+    def _update_holding_position(self, ticker: str, position: Position,
+                               current_price: float, previous_close: float):
+        """
+        Update position for holding stocks
+        시그널이 0인 경우에도 보유중인 주식의 Gain 업데이트
+
+        NOTE: duration is already incremented in _execute_sell_orders before this method is called
+        NOTE: balance는 원래 투자금 유지, again만 업데이트 (Option 1)
+              market_value = balance * again 으로 계산
+        """
+        old_losscut = position.losscut_price
+
+        if previous_close > 0:
+            daily_gain = (current_price - previous_close) / previous_close
+            # 수익률만 업데이트 (balance는 원래 투자금 유지)
+            position.again *= (1 + daily_gain)
+
+        # Duration is already incremented in _execute_sell_orders (line 452)
+        # No need to increment here to avoid double counting
+
+        # 손절가 업데이트 (Trailing Stop)
+        new_losscut = self._calculate_refer_losscut_price(
+            position.again, position.losscut_price, position.avg_price, position.risk
+        )
+
+        # Trailing Stop이 올라갔는지 로그 출력
+        if new_losscut > old_losscut and self.config.message_output:
+            pnl_pct = (position.again - 1.0) * 100
+            losscut_moved = ((new_losscut / position.avg_price) - 1) * 100
+            logger.info(f"    [TRAILING STOP] {ticker}: LossCut ${old_losscut:.2f} -> ${new_losscut:.2f} "
+                       f"({losscut_moved:+.2f}% from entry) | Current PnL: {pnl_pct:+.2f}%")
+
+        position.losscut_price = new_losscut
+
+    # ===== ENTRY EVALUATION =====
+    def evaluate_entry(self, ticker: str, ticker_data: Dict, date: pd.Timestamp) -> Optional[EntryFill]:
+        """
+        매수 후보의 체결/손절가/휩쏘 결정 (시장 데이터만 사용하므로 사전 계산 가능)
+        """
+        entry = self.fill_model.entry(ticker, ticker_data, date)
+        if entry is None:
+            return None
+
+        entry_price, close_price, buy_time, context = entry
+
+        # 첫 날 수익률 및 Again (1 + 첫날 수익률)
+        daily_gain = (close_price - entry_price) / entry_price if entry_price > 0 else 0
+
+        # 손절가 계산 (refer CalcLossCutPrice 로직) - 신규 매수 시 losscut_old = 0
+        losscut_price = self._calculate_refer_losscut_price(
+            1 + daily_gain, 0.0, entry_price, self.config.std_risk
+        )
+
+        fill = EntryFill(ticker=ticker, entry_price=entry_price, daily_gain=daily_gain,
+                         losscut_price=losscut_price, buy_time=buy_time)
+
+        if self.config.enable_whipsaw:
+            # 분봉 체결은 진입 이후 분봉과 비교하므로 진입 시점에 알 수 있는 손절가만 사용
+            # (종가 기준 losscut_price는 보유 포지션의 손절가로만 사용)
+            whipsaw_price = losscut_price if context is None else self._entry_losscut_price(ticker_data, entry_price)
+            exit_info = self.fill_model.losscut_exit(ticker, ticker_data, entry_price, daily_gain,
+                                                     whipsaw_price, context)
+            if exit_info is not None:
+                fill.whipsaw_gain, fill.sell_time = exit_info
+
+        return fill
+
+    def _entry_losscut_price(self, ticker_data: Dict, entry_price: float) -> float:
+        """진입 시점 손절가: LossCutPrice, 없으면 again=1 기준 초기 손절가"""
+        losscut_price = ticker_data.get('LossCutPrice', 0) or 0
+        if losscut_price > 0:
+            return float(losscut_price)
+        return self._calculate_refer_losscut_price(1.0, 0.0, entry_price, self.config.std_risk)
+
+    def preload_entries(self, entries: Dict[Tuple[str, int], Optional[EntryFill]]):
+        """사전 계산된(병렬 등) 체결 결과 등록 - (ticker, bar index) 키, 해당 바 처리 후 폐기"""
+        for (ticker, index), fill in entries.items():
+            self._entry_cache.setdefault(index, {})[ticker] = fill
+
+    # ===== BUY RULES =====
+    def _execute_buy_orders(self, candidates: List[str], portfolio: Portfolio,
+                          market_data: Dict[str, Dict], date: pd.Timestamp, index: int = -1) -> List[Trade]:
+        """Execute buy orders for candidates"""
+        trades = []
+        available_slots = self.config.max_positions - portfolio.position_count
+
+        if available_slots <= 0 or not candidates:
+            return trades
+
+        # Process candidates
+        for ticker in candidates[:available_slots]:
+            if ticker in portfolio.positions:
+                continue
+
+            trade = self._execute_buy_trade(ticker, portfolio, market_data[ticker], date, index)
+            if trade:
+                trades.append(trade)
+
+        return trades
+
+    def _execute_buy_trade(self, ticker: str, portfolio: Portfolio,
+                         ticker_data: Dict[str, float], date: pd.Timestamp,
+                         index: int = -1) -> Optional[Trade]:
+        """Execute a buy trade (refer Strategy_M.buy_stock compatible)"""
+        try:
+            cached = self._entry_cache.get(index)
+            if cached is not None and ticker in cached:
+                fill = cached.pop(ticker)
+            else:
+                fill = self.evaluate_entry(ticker, ticker_data, date)
+
+            if fill is None:
+                return None
+
+            entry_price = fill.entry_price
+            adr = ticker_data.get('ADR', 5.0)
+
+            # refer Strategy_M.buy_stock 로직 그대로 구현
+            # 1. 포지션 크기 계산 (총 잔액 대비)
+            position_ratio = self._calculate_position_ratio(adr)
+            input_cash = portfolio.total_value * position_ratio
+
+            # 2. refer과 동일한 현금 처리 로직
+            if portfolio.cash > input_cash:
+                input_size = input_cash
+                portfolio.cash -= round(input_size, 3)
+            else:
+                input_size = portfolio.cash
+                portfolio.cash = 0.0
+
+            if input_size < portfolio.total_value * 0.01:  # Minimum 1%
+                return None
+
+            # 3. 첫 날 수익률 / Again / 손절가 (evaluate_entry에서 계산)
+            daily_gain = fill.daily_gain
+            asset_a_gain_new = 1 + daily_gain
+            losscut_price = fill.losscut_price
+
+            # DEBUG: WHIPSAW 조건 상세 로그
+            if self.config.message_output and self.trade_count < 5:  # 처음 5개만 출력
+                logger.info(f"[DEBUG WHIPSAW] {ticker} @ {date}")
+                logger.info(f"  entry_price: ${entry_price:.2f}")
+                logger.info(f"  losscut_price: ${losscut_price:.2f}")
+                logger.info(f"  whipsaw: {fill.whipsaw_gain is not None}")
+
+            # 4. Whipsaw 조건 (refer와 동일: 진입 후 손절가 이탈)
+            if fill.whipsaw_gain is not None:
+                # Whipsaw condition - immediate loss cut
+                return self._execute_whipsaw_trade(ticker, entry_price, fill.whipsaw_gain, date, portfolio,
+                                                   input_size, fill)
+
+            # 5. 포지션 생성
+            # FIX: balance는 원래 투자금액(input_size)만 저장
+            # market_value = balance * again 으로 계산되므로
+            # balance에 again을 곱하면 중복 계산됨
+            position = Position(
+                ticker=ticker,
+                balance=input_size,  # FIX: 원래 투자금액만 저장 (이전: input_size * again - 버그)
+                avg_price=entry_price,
+                again=asset_a_gain_new,     # 누적 수익률 (1 + Gain)
+                duration=1,
+                losscut_price=losscut_price,
+                risk=self.config.std_risk
+            )
+
+            portfolio.positions[ticker] = position
+
+            trade = Trade(
+                ticker=ticker,
+                trade_type=TradeType.BUY,
+                quantity=position.quantity,
+                price=entry_price,
+                timestamp=fill.buy_time or date,  # 분봉 체결 시 실제 체결 시각
+                pnl=0.0,
+                again=1 + daily_gain
+            )
+
+            self.trade_count += 1
+
+            if self.config.message_output:
+                losscut_pct = ((losscut_price / entry_price) - 1) * 100
+                logger.info(f"{date} - BUY: {ticker}, Entry: ${entry_price:.2f}, "
+                           f"Amount: ${input_size:.1f}, LossCut: ${losscut_price:.2f} ({losscut_pct:.2f}%)")
+
+            return trade
+
+        except Exception as e:
+            logger.error(f"Error executing buy trade for {ticker}: {e}")
+            return None
+
+    def _execute_whipsaw_trade(self, ticker: str, entry_price: float, daily_gain: float,
+                             date: pd.Timestamp, portfolio: Portfolio, investment_amount: float,
+                             fill: Optional[EntryFill] = None) -> Trade:
+        """Execute whipsaw trade (immediate buy and sell)"""
+        # Whipsaw: immediate loss
+        whipsaw_again = 1 + daily_gain
+        portfolio.loss_count += 1
+        portfolio.loss_gain += abs(daily_gain) if daily_gain < 0 else 0
+
+        trade = Trade(
+            ticker=ticker,
+            trade_type=TradeType.WHIPSAW,
+            quantity=investment_amount / entry_price,
+            price=entry_price,
+            timestamp=(fill.buy_time if fill is not None else None) or date,
+            reason=SellReason.WHIPSAW,
+            pnl=investment_amount * daily_gain,
+            again=whipsaw_again
+        )
+
+        if self.config.message_output:
+            if fill is not None and fill.buy_time is not None:
+                logger.info(f"{date} - WHIPSAW: {ticker}, AGAIN: {whipsaw_again:.3f}, "
+                            f"Entry Time: {fill.buy_time} Exit Time: {fill.sell_time}")
+            else:
+                logger.info(f"{date} - WHIPSAW: {ticker}, AGAIN: {whipsaw_again:.3f}")
+
+        return trade
+
+    def _calculate_position_ratio(self, adr: float) -> float:
+        """Calculate position ratio based on ADR (refer CalcPosSizing 로직)"""
+        std_inp_size = 0.2  # refer와 동일한 20% 기본값
+
+        # refer Strategy_M.CalcPosSizing과 동일한 로직
+        if adr >= 5:
+            return std_inp_size / 2  # 변동성이 클 때 절반으로
+        else:
+            return std_inp_size
+
+    def _calculate_refer_losscut_price(self, again: float, losscut_old: float, avg_price: float, risk: float) -> float:
+        """
+        Calculate loss cut price with Stepped Trailing Stop logic
+
+        Args:
+            again: Current accumulated gain multiplier (1.0 = no gain, 1.15 = 15% gain)
+            losscut_old: Previous loss cut price
+            avg_price: Average entry price
+            risk: RISK parameter (5% = 0.05) - 1 unit buffer
+
+        Returns:
+            Updated loss cut price (stepped trailing stop)
+
+        Stepped Trailing Stop Logic:
+            - Profit units = floor(current_profit / RISK)
+            - Losscut = Entry + (profit_units - 1) * RISK
+            - Minimum losscut: -3% from entry
+            - Creates stepped buffer zones, NOT constant percentage
+
+        Example (Entry=$150, RISK=5%):
+            Profit Range    | Units | Losscut   | From Entry
+            +0% ~ +4.99%    | 0     | $145.50   | -3%
+            +5% ~ +9.99%    | 1     | $150.00   | 0%
+            +10% ~ +14.99%  | 2     | $157.50   | +5%
+            +15% ~ +19.99%  | 3     | $165.00   | +10%
+            +20% ~ +24.99%  | 4     | $172.50   | +15%
+
+        Detail Examples:
+            - +3% profit (again=1.03): units=0, Losscut=$145.50 (-3%)
+            - +6% profit (again=1.06): units=1, Losscut=$150.00 (0%)
+            - +8% profit (again=1.08): units=1, Losscut=$150.00 (0%)
+            - +11% profit (again=1.11): units=2, Losscut=$157.50 (+5%)
+        """
+        # Calculate profit units (how many RISK units of profit achieved)
+        profit_units = int((again - 1) / self.config.std_risk)  # floor((profit%) / 5%)
+
+        # CASE 1: No profit unit yet (< 1 RISK = 5% gain)
+        if profit_units < 1:
+            # Initial stop loss at minimum -3% from entry
+            losscut_new = avg_price * (1 - self.config.init_risk)  # 0.97
+
+        # CASE 2: Profit units >= 1 - STEPPED TRAILING STOP ACTIVATED
+        else:
+            # Stepped Trailing Stop: Losscut = Entry + (profit_units - 1) * RISK
+            # This creates stepped buffer zones, not constant percentage
+            losscut_new = avg_price * (1 + (profit_units - 1) * self.config.std_risk)
+
+            # Debug log for trailing stop calculation
+            if self.config.message_output:
+                logger.debug(f"      Trailing: again={again:.3f}, units={profit_units}, "
+                           f"losscut=${losscut_new:.2f} ({((losscut_new/avg_price)-1)*100:+.2f}% from entry)")
+
+        # Apply minimum loss cut percentage (3% from entry)
+        # Never go below -3% even when trailing
+        min_loss_cut_price = avg_price * (1 - self.config.init_risk)  # 0.97
+
+        # Enforce minimum loss cut (-3% 아래로 내려가지 않음)
+        if losscut_new < min_loss_cut_price:
+            losscut_new = min_loss_cut_price
+
+        # Trailing stop: only move up, never down (손절가는 올라가기만 함)
+        if losscut_new > losscut_old:
+            return losscut_new
+        else:
+            return losscut_old
+
+    # ===== METRICS =====
+    def calculate_performance_metrics(self, trades: List[Trade], ledger: EquityLedger) -> Dict[str, float]:
+        """Calculate comprehensive performance metrics from the equity ledger"""
+        if len(ledger) == 0:
+            return {}
+
+        equity_values = ledger.total_value
+        initial_value = equity_values[0]
+        final_value = float(equity_values[-1])
+        win_count, loss_count = ledger.counters[-1, 0], ledger.counters[-1, 1]
+
+        total_return = (final_value - initial_value) / initial_value
+        total_trades = len(trades)
+        total_closed = win_count + loss_count
+        win_rate = win_count / total_closed if total_closed > 0 else 0.0
+
+        # Calculate equity curve for additional metrics
+        equity_series = pd.Series(equity_values)
+
+        # Calculate maximum drawdown
+        peak = equity_series.expanding().max()
+        drawdown = (equity_series - peak) / peak
+        max_drawdown = drawdown.min()
+
+        return {
+            'total_return': float(total_return),
+            'total_trades': total_trades,
+            'win_rate': float(win_rate),
+            'max_drawdown': max_drawdown,
+            'final_value': final_value,
+            'win_count': float(win_count),
+            'loss_count': float(loss_count),
+            'avg_cash_ratio': np.mean(ledger.cash_ratio),
+            'max_positions': int(ledger.position_count.max())
+        }
@@ -0,0 +1,320 @@
+"""
+Backtest Models - Service Layer Implementation
+
+일봉/분봉 백테스트와 BacktestKernel이 공유하는 설정/포지션/거래/결과 모델.
+(daily_backtest_service에서도 동일한 이름으로 import 가능)
+"""
+
+import pandas as pd
+from typing import Dict, List, Optional
+from dataclasses import dataclass, field
+from enum import Enum
+import sys
+
+from project.service.equity_ledger import EquityLedger
+
+
+# ===== ENUMS =====
+class TradeType(Enum):
+    BUY = "BUY"
+    SELL = "SELL"
+    HALF_SELL = "HALF_SELL"
+    WHIPSAW = "WHIPSAW"
+    HOLD = "HOLD"
+
+
+class SellReason(Enum):
+    LOSSCUT = "LOSSCUT"
+    SIGNAL_SELL = "SIGNAL_SELL"
+    HALF_SELL_PROFIT = "HALF_SELL_PROFIT"
+    WHIPSAW = "WHIPSAW"
+
+
+# ===== DATA CLASSES =====
+# Python 3.10+ 에서는 dataclass도 __slots__로 생성 (인스턴스 __dict__ 제거)
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass
+class BacktestConfig:
+    """백테스트 설정"""
+    initial_cash: float = 1000.0  # 초기 현금
+    max_positions: int = 10       # 최대 보유 종목수
+    slippage: float = 0.002       # 슬리피지 (0.2%)
+    std_risk: float = 0.05        # RISK (1 unit 버퍼, 5%) - Trailing Stop 기준
+    init_risk: float = 0.03       # 최소 손절 리스크 (3%) - 초기 및 최소 손절가
+    half_sell_threshold: float = 0.20  # 50% 매도 임계값 (20%)
+    half_sell_risk_multiplier: float = 2.0  # 50% 매도 후 리스크 배수
+    enable_whipsaw: bool = True        # 휩쏘 처리 활성화
+    enable_half_sell: bool = True      # 50% 매도 활성화
+    enable_rebuying: bool = True       # 재매수 허용
+    message_output: bool = False       # 거래 메시지 출력
+    engine_mode: str = 'dataframe'     # 'dataframe' (dict 추출) / 'columnar' (배열 엔진)
+    candidate_rank_key: Optional[str] = None  # 매수 후보 순위 필드 (예: 'RS_4W', 내림차순) - None이면 유니버스 순서
+    enable_profiling: bool = False     # 단계별 시간/호출 횟수 계측 (BacktestResult.profile)
+    profile_allocations: bool = False  # 계측 시 단계별 할당 블록 수도 기록
+
+
+class Position:
+    """
+    포지션 정보
+
+    __slots__ 기반 경량 객체. balance/again 변경 시 market_value를 다시 계산하고
+    소속 Portfolio의 stock_value에 차이만큼 반영한다.
+    """
+    __slots__ = ('ticker', '_balance', 'avg_price', '_again', 'duration', 'losscut_price', 'risk',
+                 '_market_value', '_owner')
+
+    def __init__(self, ticker: str, balance: float = 0.0, avg_price: float = 0.0, again: float = 1.0,
+                 duration: float = 0.0, losscut_price: float = 0.0, risk: float = 0.0):
+        self.ticker = ticker
+        self._balance = balance          # 투자 금액
+        self.avg_price = avg_price       # 평균 단가
+        self._again = again              # 누적 수익률
+        self.duration = duration         # 보유 기간
+        self.losscut_price = losscut_price  # 손절가
+        self.risk = risk                 # 리스크 레벨
+        self._market_value = balance * again
+        self._owner: Optional['Portfolio'] = None
+
+    @property
+    def balance(self) -> float:
+        return self._balance
+
+    @balance.setter
+    def balance(self, value: float):
+        self._balance = value
+        self._revalue()
+
+    @property
+    def again(self) -> float:
+        return self._again
+
+    @again.setter
+    def again(self, value: float):
+        self._again = value
+        self._revalue()
+
+    def _revalue(self):
+        """market_value 재계산 및 소속 Portfolio stock_value 증분 반영"""
+        value = self._balance * self._again
+        if self._owner is not None:
+            self._owner._stock_value += value - self._market_value
+        self._market_value = value
+
+    @property
+    def quantity(self) -> float:
+        """보유 수량 계산"""
+        return self._balance / self.avg_price if self.avg_price > 0 else 0.0
+
+    @property
+    def market_value(self) -> float:
+        """시장 가치 계산"""
+        return self._market_value
+
+    @property
+    def unrealized_pnl(self) -> float:
+        """미실현 손익"""
+        return self._market_value - self._balance
+
+    def _astuple(self) -> tuple:
+        return (self.ticker, self._balance, self.avg_price, self._again,
+                self.duration, self.losscut_price, self.risk)
+
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._astuple() == other._astuple()
+
+    __hash__ = None
+
+    def __reduce__(self):
+        # 소속 Portfolio 참조는 제외 (Portfolio 복원 시 다시 연결)
+        return (self.__class__, self._astuple())
+
+    def __repr__(self) -> str:
+        return (f"Position(ticker={self.ticker!r}, balance={self._balance!r}, avg_price={self.avg_price!r}, "
+                f"again={self._again!r}, duration={self.duration!r}, "
+                f"losscut_price={self.losscut_price!r}, risk={self.risk!r})")
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class Trade:
+    """거래 기록"""
+    ticker: str
+    trade_type: TradeType
+    quantity: float
+    price: float
+    timestamp: pd.Timestamp
+    reason: Optional[SellReason] = None
+    pnl: float = 0.0
+    again: float = 1.0
+    buy_date: Optional[pd.Timestamp] = None
+    buy_price: Optional[float] = None
+    holding_days: Optional[float] = None
+    risk: Optional[float] = None
+
+
+class PositionBook(dict):
+    """
+    Portfolio.positions 전용 dict
+
+    포지션 추가/삭제 시 Position의 소속 Portfolio를 연결/해제하고
+    stock_value를 증분 갱신한다. 조회/반복은 일반 dict와 동일.
+    """
+    __slots__ = ('_portfolio',)
+
+    def __init__(self, portfolio: 'Portfolio', positions: Optional[Dict[str, Position]] = None):
+        super().__init__()
+        self._portfolio = portfolio
+        if positions:
+            self.update(positions)
+
+    def _attach(self, position: Position):
+        position._owner = self._portfolio
+        self._portfolio._stock_value += position._market_value
+
+    def _detach(self, position: Position):
+        position._owner = None
+        if self:
+            self._portfolio._stock_value -= position._market_value
+        else:
+            self._portfolio._stock_value = 0.0  # 누적 부동소수 오차 초기화
+
+    def __setitem__(self, ticker: str, position: Position):
+        previous = dict.pop(self, ticker, None)
+        if previous is not None:
+            self._detach(previous)
+        dict.__setitem__(self, ticker, position)
+        self._attach(position)
+
+    def __delitem__(self, ticker: str):
+        position = dict.pop(self, ticker)
+        self._detach(position)
+
+    def pop(self, ticker: str, *default):
+        if ticker in self:
+            position = dict.pop(self, ticker)
+            self._detach(position)
+            return position
+        return dict.pop(self, ticker, *default)
+
+    def popitem(self):
+        ticker, position = dict.popitem(self)
+        self._detach(position)
+        return ticker, position
+
+    def setdefault(self, ticker: str, default: Position = None):
+        if ticker not in self:
+            self[ticker] = default
+        return dict.__getitem__(self, ticker)
+
+    def update(self, *args, **kwargs):
+        for ticker, position in dict(*args, **kwargs).items():
+            self[ticker] = position
+
+    def clear(self):
+        for position in self.values():
+            position._owner = None
+        dict.clear(self)
+        self._portfolio._stock_value = 0.0
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+class Portfolio:
+    """
+    포트폴리오 상태
+
+    __slots__ 기반 경량 객체. stock_value는 포지션 추가/삭제와
+    Position.balance/again 변경 시 증분 갱신되어 O(1)로 조회된다.
+    """
+    __slots__ = ('cash', '_positions', 'win_count', 'loss_count', 'win_gain', 'loss_gain', '_stock_value')
+
+    def __init__(self, cash: float, positions: Optional[Dict[str, Position]] = None,
+                 win_count: float = 0.0, loss_count: float = 0.0,
+                 win_gain: float = 0.0, loss_gain: float = 0.0):
+        self.cash = cash
+        self._stock_value = 0.0
+        self._positions = PositionBook(self, positions)
+
+        # 성과 지표
+        self.win_count = win_count
+        self.loss_count = loss_count
+        self.win_gain = win_gain
+        self.loss_gain = loss_gain
+
+    @property
+    def positions(self) -> PositionBook:
+        return self._positions
+
+    @positions.setter
+    def positions(self, positions: Dict[str, Position]):
+        self._positions.clear()
+        self._positions.update(positions)
+
+    @property
+    def stock_value(self) -> float:
+        """주식 자산 가치"""
+        return self._stock_value
+
+    @property
+    def total_value(self) -> float:
+        """총 자산 가치"""
+        return self.cash + self._stock_value
+
+    @property
+    def position_count(self) -> int:
+        """보유 종목수"""
+        return len(self._positions)
+
+    @property
+    def cash_ratio(self) -> float:
+        """현금 비율"""
+        total_value = self.cash + self._stock_value
+        return (self.cash / total_value * 100) if total_value > 0 else 0.0
+
+    def _astuple(self) -> tuple:
+        return (self.cash, dict(self._positions), self.win_count, self.loss_count,
+                self.win_gain, self.loss_gain)
+
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._astuple() == other._astuple()
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return (self.__class__, self._astuple())
+
+    def __repr__(self) -> str:
+        return (f"Portfolio(cash={self.cash!r}, positions={dict(self._positions)!r}, "
+                f"win_count={self.win_count!r}, loss_count={self.loss_count!r}, "
+                f"win_gain={self.win_gain!r}, loss_gain={self.loss_gain!r})")
+
+
+@dataclass
+class DayTradingResult:
+    """일일 거래 결과"""
+    date: pd.Timestamp
+    trades: List[Trade] = field(default_factory=list)
+    portfolio: Optional[Portfolio] = None
+    buy_candidates: List[str] = field(default_factory=list)
+    sell_candidates: List[str] = field(default_factory=list)
+    messages: List[str] = field(default_factory=list)
+
+
+@dataclass
+class BacktestResult:
+    """백테스트 결과"""
+    trades: List[Trade]
+    portfolio_history: List[Portfolio]
+    daily_results: List[DayTradingResult]
+    performance_metrics: Dict[str, float]
+    execution_time: float
+    config: BacktestConfig
+    daily_balance: Optional[pd.DataFrame] = None  # 일별 cash/stock_value/total_value
+    ledger: Optional[EquityLedger] = None         # 컬럼형 일별 이력 (portfolio_history 원본)
+    profile: Optional[Dict[str, Dict[str, float]]] = None  # 단계별 {'seconds', 'calls'[, 'allocated_blocks']}
@@ -0,0 +1,115 @@
+"""
+Backtest Profiler - Service Layer Implementation
+
+백테스트 단계별(phase) 누적 실행 시간/호출 횟수 계측.
+
+- PhaseProfiler.phase(name): with 블록 단위로 wall time(perf_counter)과 호출 횟수 누적
+- track_allocations=True 이면 단계별 할당 블록 수 증감(sys.getallocatedblocks)도 기록
+- 비활성화 시 NULL_PROFILER.phase()는 공유 no-op 컨텍스트를 반환 (계측 비용 거의 0)
+
+결과는 BacktestResult.profile 에 {phase: {'seconds', 'calls', 'allocated_blocks'}} 로 첨부된다.
+"""
+
+import sys
+import time
+from contextlib import nullcontext
+from typing import Dict, Optional
+
+_NULL_CONTEXT = nullcontext()
+
+
+class _PhaseTimer:
+    """단일 phase 계측 컨텍스트 (PhaseProfiler가 phase별로 재사용)"""
+    __slots__ = ('stats', 'track_allocations', '_start', '_blocks')
+
+    def __init__(self, stats: list, track_allocations: bool):
+        self.stats = stats  # [seconds, calls, allocated_blocks]
+        self.track_allocations = track_allocations
+        self._start = 0.0
+        self._blocks = 0
+
+    def __enter__(self):
+        if self.track_allocations:
+            self._blocks = sys.getallocatedblocks()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        stats = self.stats
+        stats[0] += time.perf_counter() - self._start
+        stats[1] += 1
+        if self.track_allocations:
+            stats[2] += sys.getallocatedblocks() - self._blocks
+        return False
+
+
+class PhaseProfiler:
+    """
+    단계별 누적 시간/호출 횟수 기록기
+
+    같은 phase는 중첩하지 않는다 (phase별 타이머 객체를 재사용).
+    """
+
+    def __init__(self, enabled: bool = True, track_allocations: bool = False):
+        self.enabled = enabled
+        self.track_allocations = track_allocations
+        self._stats: Dict[str, list] = {}
+        self._timers: Dict[str, _PhaseTimer] = {}
+
+    def phase(self, name: str):
+        """phase 계측 컨텍스트 (비활성화 시 no-op)"""
+        if not self.enabled:
+            return _NULL_CONTEXT
+
+        timer = self._timers.get(name)
+        if timer is None:
+            stats = self._stats[name] = [0.0, 0, 0]
+            timer = self._timers[name] = _PhaseTimer(stats, self.track_allocations)
+        return timer
+
+    def report(self) -> Optional[Dict[str, Dict[str, float]]]:
+        """{phase: {'seconds', 'calls'[, 'allocated_blocks']}} - 비활성화 시 None"""
+        if not self.enabled:
+            return None
+
+        report = {}
+        for name, (seconds, calls, blocks) in self._stats.items():
+            entry = {'seconds': seconds, 'calls': calls}
+            if self.track_allocations:
+                entry['allocated_blocks'] = blocks
+            report[name] = entry
+        return report
+
+    @classmethod
+    def from_config(cls, config) -> 'PhaseProfiler':
+        """BacktestConfig.enable_profiling/profile_allocations에 맞는 profiler (비활성화 시 NULL_PROFILER)"""
+        if not getattr(config, 'enable_profiling', False):
+            return NULL_PROFILER
+        return cls(track_allocations=getattr(config, 'profile_allocations', False))
+
+
+NULL_PROFILER = PhaseProfiler(enabled=False)
+
+
+def format_profile(profile: Optional[Dict[str, Dict[str, float]]], total_seconds: Optional[float] = None) -> str:
+    """BacktestResult.profile 텍스트 표 (시간 내림차순)"""
+    if not profile:
+        return "(profiling disabled)"
+
+    total = total_seconds or sum(entry['seconds'] for entry in profile.values()) or 1.0
+    with_blocks = any('allocated_blocks' in entry for entry in profile.values())
+
+    header = f"{'Phase':<16}{'Seconds':>10}{'%':>8}{'Calls':>10}{'ms/call':>10}"
+    if with_blocks:
+        header += f"{'Alloc blocks':>14}"
+    lines = [header, '-' * len(header)]
+
+    for name, entry in sorted(profile.items(), key=lambda item: -item[1]['seconds']):
+        seconds, calls = entry['seconds'], entry['calls']
+        line = (f"{name:<16}{seconds:>10.3f}{seconds / total * 100:>7.1f}%{calls:>10}"
+                f"{(seconds / calls * 1000 if calls else 0.0):>10.3f}")
+        if with_blocks:
+            line += f"{entry.get('allocated_blocks', 0):>14,}"
+        lines.append(line)
+
+    return '\n'.join(lines)
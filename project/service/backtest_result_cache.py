@@ -0,0 +1,299 @@
+"""
+Backtest Result Cache - Service Layer Implementation
+
+같은 조건의 백테스트를 다시 시뮬레이션하지 않도록 결과(성과 지표, 거래, EquityLedger)를
+로컬 디스크에 보관하고 재사용한다.
+
+- 키: 전략 설정 해시 + BacktestConfig 해시 + 유니버스 해시 + 데이터 값 해시 + 시장별 데이터 버전
+- 저장: 항목당 .npz 파일 1개 (pickle 없음, 메타데이터 JSON) - BacktestCheckpoint와 같은 거래 인코딩
+- 용량 제한: max_entries / max_bytes 초과 시 가장 오래 사용하지 않은 항목부터 삭제 (파일 mtime 기준 LRU)
+- 무효화: MongoDBOperations 쓰기 경로가 시장 데이터 버전을 올린다 (project.database.data_versions)
+  → 이전 키는 조회되지 않고 LRU로 정리됨
+  외부에서 DB를 갱신한 경우 invalidate_market_data(market) 호출 (버전 증가 + 해당 시장 항목 삭제)
+
+데이터 지문은 종목별 값 전체(인덱스 포함)를 해시하므로, 같은 기간의 값이 바뀌어도 키가 달라진다.
+
+사용법:
+    python -m project.service.backtest_result_cache --stats
+    python -m project.service.backtest_result_cache --invalidate US
+    python -m project.service.backtest_result_cache --clear
+"""
+
+import os
+import json
+import hashlib
+import argparse
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import logging
+
+from project.database.data_versions import DEFAULT_VERSIONS_PATH, bump_data_versions, load_data_versions
+from project.service.backtest_models import BacktestConfig, BacktestResult
+from project.service.backtest_checkpoint import BacktestCheckpoint, config_hash, universe_hash
+from project.service.equity_ledger import EquityLedger
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = os.path.join('outputs', 'cache', 'backtest_results')
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_ENTRY_SUFFIX = '.npz'
+
+
+# ===== KEY =====
+def data_fingerprint(data: Dict[str, pd.DataFrame]) -> Dict[str, str]:
+    """
+    시장 데이터 지문 {'start', 'end', 'values'}
+
+    종목별 (컬럼, 행 수, 인덱스 포함 값 해시)를 해시한다 - 과거 값이 수정되어도 키가 달라짐.
+    """
+    start, end = None, None
+    digest = hashlib.sha256()
+    for symbol in sorted(data):
+        df = data[symbol]
+        if len(df):
+            first, last = pd.Timestamp(df.index.min()), pd.Timestamp(df.index.max())
+            start = first if start is None else min(start, first)
+            end = last if end is None else max(end, last)
+        digest.update(json.dumps([symbol, len(df), list(map(str, df.columns))]).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+
+    return {
+        'start': str(start),
+        'end': str(end),
+        'values': digest.hexdigest()
+    }
+
+
+def _json_default(value):
+    """numpy 스칼라/날짜 등 JSON 직렬화"""
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+# ===== CACHE =====
+class BacktestResultCache:
+    """
+    크기 제한 로컬 백테스트 결과 캐시
+
+    make_key()로 키를 만들고 get()/put()으로 조회/저장한다.
+    프로세스 간 공유 가능 (항목 파일은 임시 파일에 쓴 뒤 교체).
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 versions_path: str = DEFAULT_VERSIONS_PATH):
+        self.cache_dir = cache_dir
+        self.versions_path = versions_path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    # ===== KEY / DATA VERSION =====
+    def make_key(self, strategy_hash: str, config: BacktestConfig, universe: List[str],
+                 data: Dict[str, pd.DataFrame], market: str,
+                 fingerprint: Optional[Dict[str, str]] = None) -> str:
+        """
+        (전략 해시, 설정, 유니버스, 데이터 값 해시, 데이터 버전) → 캐시 키
+
+        fingerprint: 미리 계산한 data_fingerprint(data) (같은 데이터로 여러 번 호출할 때 재사용)
+        """
+        components = {
+            'cache_version': CACHE_VERSION,
+            'strategy': strategy_hash,
+            'config': config_hash(config),
+            'universe': universe_hash(universe),
+            'data': fingerprint if fingerprint is not None else data_fingerprint(data),
+            'market': market,
+            'data_version': self.data_version(market),
+        }
+        return hashlib.sha256(json.dumps(components, sort_keys=True).encode()).hexdigest()
+
+    def data_version(self, market: str) -> int:
+        """시장별 데이터 버전 (DB 쓰기 / invalidate_market_data 호출마다 증가)"""
+        return load_data_versions(self.versions_path).get(market, 0)
+
+    def invalidate_market_data(self, market: Optional[str] = None) -> int:
+        """
+        시장 데이터 갱신 알림: 데이터 버전을 올리고 해당 시장 항목 삭제
+
+        Args:
+            market: 시장 코드 (None이면 기록된 모든 시장 + 전체 항목)
+
+        Returns:
+            삭제된 항목 수
+        """
+        bump_data_versions([market] if market is not None else None, self.versions_path)
+
+        removed = 0
+        for path in self._entry_paths():
+            if market is None or self._entry_market(path) == market:
+                removed += self._remove(path)
+
+        logger.info(f"Backtest result cache invalidated ({market or 'all markets'}): {removed} entries removed")
+        return removed
+
+    def clear(self) -> int:
+        """전체 항목 삭제 (데이터 버전은 유지)"""
+        return sum(self._remove(path) for path in self._entry_paths())
+
+    # ===== GET / PUT =====
+    def get(self, key: str, config: BacktestConfig) -> Optional[BacktestResult]:
+        """저장된 결과 복원 (없거나 읽을 수 없으면 None)"""
+        path = self._entry_path(key)
+        if not os.path.exists(path):
+            self.misses += 1
+            return None
+
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                meta = json.loads(str(data['meta']))
+                arrays = {name: data[name] for name in data.files if name != 'meta'}
+        except Exception as e:
+            logger.warning(f"Failed to read backtest cache entry {path}: {e}")
+            self._remove(path)
+            self.misses += 1
+            return None
+
+        if meta.get('version') != CACHE_VERSION:
+            self._remove(path)
+            self.misses += 1
+            return None
+
+        ledger = EquityLedger.from_state_arrays(
+            {name[len('ledger_'):]: value for name, value in arrays.items() if name.startswith('ledger_')}
+        )
+        trades = BacktestCheckpoint._trades_from_arrays(arrays)
+
+        # LRU: 사용 시각 갱신
+        os.utime(path)
+        self.hits += 1
+
+        return BacktestResult(
+            trades=trades,
+            portfolio_history=ledger.portfolios(),
+            daily_results=[],  # 일별 상세 결과는 저장하지 않음
+            performance_metrics=meta['performance_metrics'],
+            execution_time=meta['execution_time'],
+            config=config,
+            daily_balance=ledger.to_frame(),
+            ledger=ledger
+        )
+
+    def put(self, key: str, result: BacktestResult, market: str) -> bool:
+        """결과 저장 (ledger 없는 결과는 저장하지 않음) 후 용량 제한 적용"""
+        if result.ledger is None:
+            return False
+
+        meta = {
+            'version': CACHE_VERSION,
+            'market': market,
+            'performance_metrics': result.performance_metrics,
+            'execution_time': result.execution_time,
+        }
+        arrays = {f'ledger_{name}': value for name, value in result.ledger.state_arrays().items()}
+        arrays.update(BacktestCheckpoint._trade_arrays(result.trades))
+
+        path = self._entry_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                np.savez_compressed(f, meta=np.array(json.dumps(meta, default=_json_default)), **arrays)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to write backtest cache entry {path}: {e}")
+            self._remove(tmp_path)
+            return False
+
+        self._evict()
+        return True
+
+    def stats(self) -> Dict[str, float]:
+        """항목 수/용량/적중 통계"""
+        paths = self._entry_paths()
+        return {
+            'entries': len(paths),
+            'bytes': sum(os.path.getsize(path) for path in paths),
+            'hits': self.hits,
+            'misses': self.misses,
+            'data_versions': load_data_versions(self.versions_path),
+        }
+
+    # ===== STORAGE =====
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + _ENTRY_SUFFIX)
+
+    def _entry_paths(self) -> List[str]:
+        if not os.path.isdir(self.cache_dir):
+            return []
+        return [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+                if name.endswith(_ENTRY_SUFFIX)]
+
+    @staticmethod
+    def _entry_market(path: str) -> Optional[str]:
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                return json.loads(str(data['meta'])).get('market')
+        except Exception:
+            return None
+
+    @staticmethod
+    def _remove(path: str) -> int:
+        try:
+            os.remove(path)
+            return 1
+        except OSError:
+            return 0
+
+    def _evict(self):
+        """max_entries / max_bytes 초과분을 오래 사용하지 않은 순서로 삭제"""
+        entries = []
+        for path in self._entry_paths():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort()
+        total_bytes = sum(size for _, size, _ in entries)
+        while entries and (len(entries) > self.max_entries or total_bytes > self.max_bytes):
+            _, size, path = entries.pop(0)
+            total_bytes -= size
+            self._remove(path)
+
+
+# ===== CLI =====
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Backtest result cache maintenance')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='cache directory')
+    parser.add_argument('--invalidate', metavar='MARKET', nargs='?', const='',
+                        help='market data updated: bump data version and drop entries (no value = all markets)')
+    parser.add_argument('--clear', action='store_true', help='remove every cached result')
+    parser.add_argument('--stats', action='store_true', help='show entry count and size')
+    args = parser.parse_args(argv)
+
+    cache = BacktestResultCache(args.cache_dir)
+    if args.invalidate is not None:
+        removed = cache.invalidate_market_data(args.invalidate or None)
+        print(f"Invalidated {args.invalidate or 'all markets'}: {removed} entries removed")
+    if args.clear:
+        print(f"Cleared {cache.clear()} entries")
+    if args.stats or (args.invalidate is None and not args.clear):
+        stats = cache.stats()
+        print(f"Entries: {stats['entries']}  Size: {stats['bytes'] / 1024 / 1024:.1f} MB  "
+              f"Data versions: {stats['data_versions']}")
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
+    raise SystemExit(main())
@@ -0,0 +1,500 @@
+"""
+Batch Backtest Service - Service Layer Implementation
+
+여러 BacktestConfig(std_risk, init_risk, half_sell_threshold, max_positions,
+slippage 등)를 한 번에 시뮬레이션하는 벡터화 멀티 시나리오 백테스트.
+
+준비된 시장 데이터(ColumnarMarketData)는 모든 시나리오가 공유하고,
+현금/포지션 잔액/again/손절가/승패 카운터는 (N x tickers) 배열로 보관하여
+N개의 포트폴리오를 같은 날짜 루프에서 함께 진행한다.
+매매 규칙은 DailyBacktestService와 동일하며 결과는 N개의 BacktestResult로 반환.
+"""
+
+import pandas as pd
+import numpy as np
+from datetime import datetime
+from typing import Dict, List, Any
+from dataclasses import replace
+import itertools
+import logging
+
+from .backtest_models import (
+    BacktestConfig, BacktestResult, DayTradingResult,
+    Portfolio, Position, Trade, TradeType, SellReason
+)
+from .daily_backtest_service import DailyBacktestService
+from .columnar_market_data import ColumnarMarketData
+from project.strategy.candidate_ranking import top_k_indices
+from .equity_ledger import EquityLedger
+
+logger = logging.getLogger(__name__)
+
+
+def expand_config_grid(base_config: BacktestConfig,
+                       parameter_grid: Dict[str, List[Any]]) -> List[BacktestConfig]:
+    """
+    파라미터 그리드를 BacktestConfig 리스트로 확장
+
+    Args:
+        base_config: 기본 설정
+        parameter_grid: {field_name: [values]} (예: {'std_risk': [0.03, 0.05]})
+
+    Returns:
+        모든 조합의 BacktestConfig 리스트 (itertools.product 순서)
+    """
+    names = list(parameter_grid.keys())
+    return [replace(base_config, **dict(zip(names, values)))
+            for values in itertools.product(*(parameter_grid[name] for name in names))]
+
+
+class BatchBacktestService:
+    """
+    벡터화 멀티 시나리오 일봉 백테스트
+
+    DailyBacktestService의 매도(손절/신호/50% 매도) → 매수(휩쏘 포함) 규칙을
+    시나리오 축(N)으로 벡터화하여 파라미터 스윕 시 데이터 준비/추출을 1회로 줄인다.
+    """
+
+    def __init__(self, configs: List[BacktestConfig]):
+        """
+        Initialize Batch Backtest Service
+
+        Args:
+            configs: 시나리오별 BacktestConfig 리스트
+        """
+        if not configs:
+            raise ValueError("BatchBacktestService requires at least one BacktestConfig")
+
+        self.configs = list(configs)
+        n = len(self.configs)
+
+        # 시나리오별 파라미터 벡터
+        self.initial_cash = np.array([c.initial_cash for c in self.configs], dtype=np.float64)
+        self.max_positions = np.array([c.max_positions for c in self.configs], dtype=np.int64)
+        self.slippage = np.array([c.slippage for c in self.configs], dtype=np.float64)
+        self.std_risk = np.array([c.std_risk for c in self.configs], dtype=np.float64)
+        self.init_risk = np.array([c.init_risk for c in self.configs], dtype=np.float64)
+        self.half_sell_threshold = np.array([c.half_sell_threshold for c in self.configs], dtype=np.float64)
+        self.half_sell_risk_multiplier = np.array([c.half_sell_risk_multiplier for c in self.configs],
+                                                  dtype=np.float64)
+        self.enable_whipsaw = np.array([c.enable_whipsaw for c in self.configs], dtype=bool)
+        self.enable_half_sell = np.array([c.enable_half_sell for c in self.configs], dtype=bool)
+
+        # 매수 후보 순서는 시나리오 간 공유 (순위 필드가 같아야 함)
+        rank_keys = {getattr(c, 'candidate_rank_key', None) for c in self.configs}
+        if len(rank_keys) > 1:
+            raise ValueError(f"All scenarios must share candidate_rank_key, got {sorted(map(str, rank_keys))}")
+        self.candidate_rank_key = rank_keys.pop()
+
+        logger.info(f"BatchBacktestService initialized with {n} scenarios")
+
+    def run_backtest(self, universe: List[str], df_data: Dict[str, pd.DataFrame],
+                     market: str = 'US', area: str = 'US',
+                     record_history: bool = False) -> List[BacktestResult]:
+        """
+        Run all scenarios over the same prepared data
+
+        Args:
+            universe: List of stock tickers
+            df_data: Dictionary of DataFrames with stock data
+            market: Market identifier
+            area: Area identifier
+            record_history: True면 시나리오별 ledger에 포지션 델타까지 기록하고 DayTradingResult 생성
+                            (False면 ledger는 일별 집계만, portfolio_history는 시작/종료 스냅샷만 보관)
+
+        Returns:
+            configs 순서와 동일한 BacktestResult 리스트
+        """
+        start_time = datetime.now()
+        n = len(self.configs)
+        logger.info(f"Starting batch backtest: {n} scenarios x {len(universe)} stocks")
+
+        daily_service = DailyBacktestService(self.configs[0])
+        processed_data = daily_service._prepare_data(universe, df_data)
+        if processed_data.empty:
+            logger.warning("No valid data for batch backtest")
+            return [self._create_empty_result(config) for config in self.configs]
+
+        market_data = ColumnarMarketData.from_frame(processed_data)
+        universe_idx = market_data.universe_indices(universe)
+        n_dates, n_tickers = len(market_data), len(market_data.tickers)
+
+        # ===== 공유 시장 데이터 (dict 경로의 .get 기본값과 동일하게 채움) =====
+        close = market_data.field_values('close', 0.0)
+        sell_open = np.where(market_data.has_field('open'), market_data.field_values('open', 0.0), close)
+        sell_low = np.where(market_data.has_field('low'), market_data.field_values('low', 0.0), close)
+        sell_sig = market_data.field_values('SellSig', 0.0)
+        buy_open = market_data.field_values('open', 0.0)
+        buy_high = market_data.field_values('high', 0.0)
+        buy_low = market_data.field_values('low', 0.0)
+        target = market_data.field_values('TargetPrice', 0.0)
+        adr = market_data.field_values('ADR', 5.0)
+        signalled = (market_data.field_values('BuySig', 0.0) >= 1) | (market_data.field_values('signal', 0.0) >= 1)
+        rank_values = (market_data.field_values(self.candidate_rank_key, 0.0)
+                       if self.candidate_rank_key else None)
+
+        # ===== 시나리오 상태 (N x tickers) =====
+        cash = self.initial_cash.copy()
+        held = np.zeros((n, n_tickers), dtype=bool)
+        balance = np.zeros((n, n_tickers))
+        avg_price = np.zeros((n, n_tickers))
+        again = np.ones((n, n_tickers))
+        duration = np.zeros((n, n_tickers))
+        losscut = np.zeros((n, n_tickers))
+        risk = np.zeros((n, n_tickers))
+        entry_seq = np.zeros((n, n_tickers), dtype=np.int64)  # 포지션 삽입 순서 (dict 순서 재현)
+        half_done = np.zeros((n, n_tickers), dtype=bool)
+        win_count = np.zeros(n)
+        loss_count = np.zeros(n)
+        win_gain = np.zeros(n)
+        loss_gain = np.zeros(n)
+        seq_counter = 0
+
+        trades: List[List[Trade]] = [[] for _ in range(n)]
+        ledgers = [EquityLedger(initial_capacity=n_dates, track_positions=record_history) for _ in range(n)]
+        daily_results: List[List[DayTradingResult]] = [[] for _ in range(n)]
+        state = (held, balance, avg_price, again, duration, losscut, risk, entry_seq)
+        counters = (win_count, loss_count, win_gain, loss_gain)
+
+        self._record_day(ledgers, market_data.dates[0], cash, state, counters,
+                         [[] for _ in range(n)], market_data.tickers, record_history)
+
+        for i in range(1, n_dates):
+            date = pd.Timestamp(market_data.dates[i])
+            day_trades: List[List[Trade]] = [[] for _ in range(n)]
+            candidates: List[str] = []
+
+            valid = (close[i, universe_idx] > 0) & (close[i - 1, universe_idx] > 0)
+
+            if valid.any():
+                # ===== SELL PHASE (보유 종목 열만 처리) =====
+                cols = np.flatnonzero(held.any(axis=0))
+                if cols.size:
+                    h = held[:, cols]
+                    prev_close = close[i - 1, cols]
+                    active = h & (prev_close > 0)
+                    duration[:, cols] += active
+
+                    cur = close[i, cols]
+                    low = sell_low[i, cols]
+                    opn = sell_open[i, cols]
+                    lc = losscut[:, cols]
+                    ag = again[:, cols]
+
+                    hit_losscut = active & (low < lc)
+                    hit_signal = active & ~hit_losscut & (sell_sig[i, cols] == 1)
+                    hit_half = (active & ~hit_losscut & ~hit_signal
+                                & (ag >= (1 + self.half_sell_threshold)[:, None])
+                                & ~half_done[:, cols] & self.enable_half_sell[:, None])
+                    hold = active & ~hit_losscut & ~hit_signal & ~hit_half
+
+                    safe_prev = np.where(prev_close > 0, prev_close, 1.0)
+
+                    # 매도 이벤트는 포지션 삽입 순서대로 처리 (현금 누적/거래 순서 재현)
+                    event = hit_losscut | hit_signal | hit_half
+                    if event.any():
+                        ev_n, ev_c = np.nonzero(event)
+                        order = np.lexsort((entry_seq[ev_n, cols[ev_c]], ev_n))
+                        for k in order:
+                            s, c = ev_n[k], ev_c[k]
+                            t = cols[c]
+                            if hit_losscut[s, c]:
+                                sell_price = min(opn[c], lc[s, c]) if opn[c] < lc[s, c] else lc[s, c]
+                                reason = SellReason.LOSSCUT
+                            elif hit_signal[s, c]:
+                                sell_price = opn[c]
+                                reason = SellReason.SIGNAL_SELL
+                            else:
+                                sell_price = cur[c]
+                                reason = None
+                            gain = (sell_price - prev_close[c]) / safe_prev[c]
+
+                            if reason is None:
+                                day_trades[s].append(self._half_sell(s, t, float(sell_price), float(gain), date,
+                                                                     cash, balance, avg_price, again, duration,
+                                                                     risk, win_count, win_gain,
+                                                                     market_data.tickers))
+                                half_done[s, t] = True
+                            else:
+                                day_trades[s].append(self._full_sell(s, t, float(sell_price), float(gain), date,
+                                                                     reason, cash, balance, avg_price, again,
+                                                                     duration, risk, win_count, loss_count,
+                                                                     win_gain, loss_gain, market_data.tickers))
+                                held[s, t] = False
+
+                    # 보유 유지 종목: again 갱신 + Stepped Trailing Stop
+                    if hold.any():
+                        daily_gain = (cur - prev_close) / safe_prev
+                        new_again = np.where(hold, ag * (1 + daily_gain), ag)
+                        new_losscut = self._losscut_price(new_again, lc, avg_price[:, cols])
+                        # 50% 매도로 갱신된 again은 유지 (hold 위치만 덮어씀)
+                        again[:, cols] = np.where(hold, new_again, again[:, cols])
+                        losscut[:, cols] = np.where(hold, new_losscut, lc)
+
+                # ===== BUY PHASE =====
+                selected = universe_idx[valid & signalled[i, universe_idx]]
+                candidates = [market_data.tickers[t] for t in selected]
+                slots = self.max_positions - held.sum(axis=1)
+                max_slots = int(max(slots.max(), 0))
+
+                if candidates and max_slots > 0:
+                    if rank_values is not None:
+                        # 최대 빈 슬롯 수만큼 argpartition 상위 K 선정
+                        selected = selected[top_k_indices(rank_values[i, selected], max_slots)]
+                    stock_value = (balance * again * held).sum(axis=1)
+                    for k, t in enumerate(selected[:max_slots]):
+                        attempt = (k < slots) & ~held[:, t]
+                        if not attempt.any() or target[i, t] <= 0 or buy_open[i, t] <= 0:
+                            continue
+                        seq_counter = self._buy(i, t, attempt, date, cash, stock_value, held, balance, avg_price,
+                                                again, duration, losscut, risk, entry_seq, seq_counter,
+                                                loss_count, loss_gain, target, buy_open, buy_high, buy_low,
+                                                close, adr, day_trades, market_data.tickers)
+
+            for s in range(n):
+                trades[s].extend(day_trades[s])
+
+            self._record_day(ledgers, date, cash, state, counters, day_trades, market_data.tickers,
+                             record_history)
+
+            if record_history:
+                for s in range(n):
+                    daily_results[s].append(DayTradingResult(date=date, trades=day_trades[s],
+                                                             buy_candidates=candidates))
+
+        execution_time = (datetime.now() - start_time).total_seconds()
+
+        results = []
+        for s, config in enumerate(self.configs):
+            ledger = ledgers[s]
+            if record_history:
+                portfolio_history = ledger.portfolios()
+            else:
+                portfolio_history = [Portfolio(cash=config.initial_cash), self._final_portfolio(s, cash, state, counters,
+                                                                                              market_data.tickers)]
+
+            results.append(BacktestResult(
+                trades=trades[s],
+                portfolio_history=portfolio_history,
+                daily_results=daily_results[s],
+                performance_metrics=daily_service._calculate_performance_metrics(trades[s], ledger),
+                execution_time=execution_time,
+                config=config,
+                daily_balance=ledger.to_frame(),
+                ledger=ledger
+            ))
+
+        logger.info(f"Batch backtest completed in {execution_time:.2f}s for {n} scenarios")
+        return results
+
+    # ===== VECTORIZED RULES =====
+    def _losscut_price(self, again: np.ndarray, losscut_old: np.ndarray, avg_price: np.ndarray) -> np.ndarray:
+        """
+        Stepped Trailing Stop (BacktestKernel._calculate_refer_losscut_price 벡터화)
+        again/losscut_old/avg_price: (N x k), 시나리오별 std_risk/init_risk 적용
+        """
+        std_risk = self.std_risk[:, None]
+        init_floor = avg_price * (1 - self.init_risk[:, None])
+        profit_units = np.trunc((again - 1) / std_risk)
+        losscut_new = np.where(profit_units < 1, init_floor, avg_price * (1 + (profit_units - 1) * std_risk))
+        losscut_new = np.maximum(losscut_new, init_floor)
+        return np.where(losscut_new > losscut_old, losscut_new, losscut_old)
+
+    def _full_sell(self, s, t, sell_price, gain, date, reason, cash, balance, avg_price, again, duration,
+                   risk, win_count, loss_count, win_gain, loss_gain, tickers) -> Trade:
+        """BacktestKernel._execute_sell_trade와 동일한 전량 매도"""
+        slippage = self.slippage[s]
+        asset_a_gain_new = again[s, t] * (1 + gain)
+        return_cash = round(float(balance[s, t] * asset_a_gain_new * (1 - slippage)), 3)
+        cash[s] += return_cash
+
+        if asset_a_gain_new * (1 - slippage) <= 1:
+            loss_count[s] += 1
+            loss_gain[s] += abs(asset_a_gain_new - 1)
+        else:
+            win_count[s] += 1
+            win_gain[s] += abs(asset_a_gain_new - 1)
+
+        avg = avg_price[s, t]
+        return Trade(
+            ticker=tickers[t],
+            trade_type=TradeType.SELL,
+            quantity=float(balance[s, t] / avg) if avg > 0 else 0.0,
+            price=sell_price,
+            timestamp=date,
+            reason=reason,
+            pnl=return_cash - float(balance[s, t]),
+            again=float(asset_a_gain_new),
+            buy_price=float(avg),
+            holding_days=float(duration[s, t]),
+            risk=float(risk[s, t])
+        )
+
+    def _half_sell(self, s, t, sell_price, gain, date, cash, balance, avg_price, again, duration,
+                   risk, win_count, win_gain, tickers) -> Trade:
+        """BacktestKernel._execute_half_sell_trade와 동일한 50% 매도"""
+        half_gain = again[s, t] * (1 + gain)
+        original_half_balance = balance[s, t] * 0.5
+        half_return_cash = original_half_balance * half_gain
+
+        cash[s] += half_return_cash
+        win_count[s] += 0.5
+        win_gain[s] += (half_gain - 1) * 0.5
+
+        balance[s, t] *= 0.5
+        again[s, t] = half_gain
+        risk[s, t] *= self.half_sell_risk_multiplier[s]
+
+        avg = avg_price[s, t]
+        return Trade(
+            ticker=tickers[t],
+            trade_type=TradeType.HALF_SELL,
+            quantity=float(balance[s, t] / avg) * 0.5 if avg > 0 else 0.0,
+            price=sell_price,
+            timestamp=date,
+            reason=SellReason.HALF_SELL_PROFIT,
+            pnl=float(half_return_cash - original_half_balance),
+            again=float(half_gain),
+            buy_price=float(avg),
+            holding_days=float(duration[s, t]),
+            risk=float(risk[s, t])
+        )
+
+    def _buy(self, i, t, attempt, date, cash, stock_value, held, balance, avg_price, again, duration,
+             losscut, risk, entry_seq, seq_counter, loss_count, loss_gain, target, buy_open, buy_high,
+             buy_low, close, adr, day_trades, tickers) -> int:
+        """
+        BacktestKernel._execute_buy_trade를 시나리오 축으로 벡터화
+        attempt: 이 후보를 매수 시도하는 시나리오 마스크 (N,)
+        """
+        target_price, open_price = target[i, t], buy_open[i, t]
+        high_price, low_price, close_price = buy_high[i, t], buy_low[i, t], close[i, t]
+
+        if open_price <= target_price <= high_price:
+            base_entry = target_price
+        else:
+            base_entry = open_price
+
+        idx = np.flatnonzero(attempt)
+        entry_price = base_entry * (1 + self.slippage[idx])
+
+        # ADR 기반 포지션 비율 (refer CalcPosSizing)
+        position_ratio = 0.1 if adr[i, t] >= 5 else 0.2
+        input_cash = (cash[idx] + stock_value[idx]) * position_ratio
+
+        enough = cash[idx] > input_cash
+        input_size = np.where(enough, input_cash, cash[idx])
+        cash[idx] = np.where(enough, cash[idx] - np.round(input_size, 3), 0.0)
+
+        # 최소 1% 미만이면 매수 취소 (현금 차감은 원본 로직과 동일하게 유지)
+        ok = input_size >= (cash[idx] + stock_value[idx]) * 0.01
+        daily_gain = (close_price - entry_price) / entry_price
+        asset_a_gain_new = 1 + daily_gain
+
+        init_floor = entry_price * (1 - self.init_risk[idx])
+        profit_units = np.trunc((asset_a_gain_new - 1) / self.std_risk[idx])
+        losscut_price = np.where(profit_units < 1, init_floor,
+                                 entry_price * (1 + (profit_units - 1) * self.std_risk[idx]))
+        losscut_price = np.maximum(losscut_price, init_floor)
+        losscut_price = np.where(losscut_price > 0.0, losscut_price, 0.0)
+
+        low_gain = (low_price - entry_price) / entry_price
+        cut_gain = (losscut_price - entry_price) / entry_price
+        whipsaw = ok & self.enable_whipsaw[idx] & (low_gain < cut_gain)
+        opened = ok & ~whipsaw
+
+        for j in np.flatnonzero(whipsaw):
+            s = idx[j]
+            gain = float(daily_gain[j])
+            loss_count[s] += 1
+            loss_gain[s] += abs(gain) if gain < 0 else 0
+            day_trades[s].append(Trade(
+                ticker=tickers[t],
+                trade_type=TradeType.WHIPSAW,
+                quantity=float(input_size[j] / entry_price[j]),
+                price=float(entry_price[j]),
+                timestamp=date,
+                reason=SellReason.WHIPSAW,
+                pnl=float(input_size[j] * gain),
+                again=float(1 + gain)
+            ))
+
+        for j in np.flatnonzero(opened):
+            s = idx[j]
+            held[s, t] = True
+            balance[s, t] = input_size[j]
+            avg_price[s, t] = entry_price[j]
+            again[s, t] = asset_a_gain_new[j]
+            duration[s, t] = 1
+            losscut[s, t] = losscut_price[j]
+            risk[s, t] = self.std_risk[s]
+            entry_seq[s, t] = seq_counter
+            seq_counter += 1
+            stock_value[s] += input_size[j] * asset_a_gain_new[j]
+            day_trades[s].append(Trade(
+                ticker=tickers[t],
+                trade_type=TradeType.BUY,
+                quantity=float(input_size[j] / entry_price[j]),
+                price=float(entry_price[j]),
+                timestamp=date,
+                pnl=0.0,
+                again=float(asset_a_gain_new[j])
+            ))
+
+        return seq_counter
+
+    # ===== RESULTS =====
+    @staticmethod
+    def _scenario_positions(state: tuple, tickers: List[str], n: int) -> List[Dict[str, tuple]]:
+        """시나리오별 보유 포지션 {ticker: state} (삽입 순서 = entry_seq 순서)"""
+        held, balance, avg_price, again, duration, losscut, risk, entry_seq = state
+        s_idx, t_idx = np.nonzero(held)
+        order = np.lexsort((entry_seq[s_idx, t_idx], s_idx))
+        s_idx, t_idx = s_idx[order], t_idx[order]
+
+        positions: List[Dict[str, tuple]] = [{} for _ in range(n)]
+        values = np.column_stack([balance[s_idx, t_idx], avg_price[s_idx, t_idx], again[s_idx, t_idx],
+                                  duration[s_idx, t_idx], losscut[s_idx, t_idx], risk[s_idx, t_idx]]).tolist()
+        for s, t, row in zip(s_idx.tolist(), t_idx.tolist(), values):
+            positions[s][tickers[t]] = tuple(row)
+        return positions
+
+    def _record_day(self, ledgers: List[EquityLedger], date, cash: np.ndarray, state: tuple, counters: tuple,
+                    day_trades: List[List[Trade]], tickers: List[str], record_history: bool):
+        """시나리오별 ledger에 하루치 상태 기록"""
+        held, balance, again = state[0], state[1], state[3]
+        n = len(ledgers)
+        stock_value = (balance * again * held).sum(axis=1)
+        position_count = held.sum(axis=1)
+        counter_rows = np.column_stack(counters).tolist()
+        positions = self._scenario_positions(state, tickers, n) if record_history else [None] * n
+
+        for s in range(n):
+            ledgers[s].record_state(
+                date, cash[s], stock_value[s], counter_rows[s], positions[s],
+                opened=[t.ticker for t in day_trades[s] if t.trade_type == TradeType.BUY],
+                position_count=int(position_count[s])
+            )
+
+    def _final_portfolio(self, s: int, cash: np.ndarray, state: tuple, counters: tuple,
+                         tickers: List[str]) -> Portfolio:
+        """시나리오 s의 최종 Portfolio (record_history=False일 때 portfolio_history 끝값)"""
+        positions = self._scenario_positions(state, tickers, len(cash))[s]
+        win_count, loss_count, win_gain, loss_gain = (float(c[s]) for c in counters)
+        return Portfolio(
+            cash=float(cash[s]),
+            positions={ticker: Position(ticker, *values) for ticker, values in positions.items()},
+            win_count=win_count, loss_count=loss_count, win_gain=win_gain, loss_gain=loss_gain
+        )
+
+    @staticmethod
+    def _create_empty_result(config: BacktestConfig) -> BacktestResult:
+        """Create empty result for error cases"""
+        return BacktestResult(
+            trades=[],
+            portfolio_history=[Portfolio(cash=config.initial_cash)],
+            daily_results=[],
+            performance_metrics={},
+            execution_time=0.0,
+            config=config
+        )
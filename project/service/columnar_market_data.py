@@ -0,0 +1,321 @@
+"""
+Columnar Market Data - Service Layer Implementation
+
+DailyBacktestService._prepare_data 결과(MultiIndex DataFrame)를 한 번만
+연속된 NumPy 배열(dates x tickers x fields)로 변환하여 보관.
+일별 시뮬레이션에서는 종목/필드를 정수 인덱스로 직접 읽으므로
+매일 전체 (ticker, field) 쌍을 dict로 만드는 비용이 사라진다.
+
+문자열 필드(Sector/Industry/Type)는 정수 코드 + 카테고리 목록으로 보관.
+row() 결과는 DailyBacktestService._extract_market_data 의 종목별 dict와 동일하다.
+
+to_shared()는 배열을 공유 메모리에 한 번 게시하고, 다른 프로세스는
+from_shared(handle)로 복사 없이 같은 배열을 읽기 전용으로 사용한다 (파라미터 최적화 워커).
+"""
+
+import pandas as pd
+import numpy as np
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, List, Any, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# _extract_market_data와 동일한 문자열 필드 정의
+STRING_FIELDS = ('Sector', 'Industry', 'Type')
+
+# 공유 메모리로 게시하는 배열 속성
+SHARED_ARRAYS = ('dates', 'values', 'present', 'codes')
+
+
+class ColumnarMarketData:
+    """
+    배열 기반 시장 데이터 컨테이너
+
+    values:  float64 (dates x tickers x fields), NaN/변환 불가 값은 0.0
+    present: bool    (tickers x fields), 원본 프레임에 (ticker, field) 컬럼 존재 여부
+    codes:   int32   (dates x tickers x string_fields), 문자열 필드 카테고리 코드
+    """
+
+    def __init__(self, dates: np.ndarray, tickers: List[str], fields: List[str],
+                 values: np.ndarray, present: np.ndarray,
+                 string_fields: List[str], codes: np.ndarray,
+                 categories: List[List[Any]]):
+        self.dates = dates
+        self.tickers = list(tickers)
+        self.fields = list(fields)
+        self.values = values
+        self.present = present
+        self.string_fields = list(string_fields)
+        self.codes = codes
+        self.categories = categories
+
+        self.ticker_index = {ticker: t for t, ticker in enumerate(self.tickers)}
+        self.field_index = {name: f for f, name in enumerate(self.fields)}
+        self.string_index = {name: s for s, name in enumerate(self.string_fields)}
+
+        # row() 생성용 (field, 숫자 인덱스 또는 문자열 인덱스) 사전 계산
+        self._row_layout = []
+        for f, name in enumerate(self.fields):
+            if name in self.string_index:
+                self._row_layout.append((name, f, self.string_index[name]))
+            else:
+                self._row_layout.append((name, f, None))
+
+        self._field_cache: Dict[tuple, np.ndarray] = {}
+
+    # ===== CONSTRUCTION =====
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'ColumnarMarketData':
+        """
+        _prepare_data 결과 MultiIndex(Ticker, Field) DataFrame을 배열로 변환
+
+        Args:
+            df: columns가 (Ticker, Field) MultiIndex인 DataFrame
+
+        Returns:
+            ColumnarMarketData
+        """
+        if not isinstance(df.columns, pd.MultiIndex):
+            raise ValueError("ColumnarMarketData requires (Ticker, Field) MultiIndex columns")
+
+        tickers = list(df.columns.levels[0])
+        fields = list(df.columns.levels[1])
+        string_fields = [name for name in fields if name in STRING_FIELDS]
+
+        n_dates, n_tickers, n_fields = len(df.index), len(tickers), len(fields)
+        values = np.zeros((n_dates, n_tickers, n_fields), dtype=np.float64)
+        present = np.zeros((n_tickers, n_fields), dtype=bool)
+        codes = np.zeros((n_dates, n_tickers, len(string_fields)), dtype=np.int32)
+        categories: List[List[Any]] = []
+
+        ticker_pos = {ticker: t for t, ticker in enumerate(tickers)}
+        field_codes = df.columns.codes[1]
+        field_levels = df.columns.levels[1]
+
+        for f, name in enumerate(fields):
+            mask = np.asarray(field_levels[field_codes] == name)
+            if not mask.any():
+                if name in string_fields:
+                    categories.append([''])
+                continue
+
+            sub = df.loc[:, mask]
+            cols = [ticker_pos[key[0]] for key in sub.columns]
+            present[cols, f] = True
+
+            if name in string_fields:
+                s = string_fields.index(name)
+                raw = sub.to_numpy(dtype=object)
+                field_codes_arr, uniques = pd.factorize(raw.ravel(), use_na_sentinel=True)
+                # NaN은 ''로 보존 (_extract_market_data와 동일)
+                cats = list(uniques) + ['']
+                field_codes_arr = np.where(field_codes_arr < 0, len(cats) - 1, field_codes_arr)
+                codes[:, cols, s] = field_codes_arr.reshape(raw.shape)
+                categories.append(cats)
+                values[:, cols, f] = np.nan
+            else:
+                values[:, cols, f] = cls._to_float_block(sub)
+
+        return cls(
+            dates=df.index.values,
+            tickers=tickers,
+            fields=fields,
+            values=values,
+            present=present,
+            string_fields=string_fields,
+            codes=codes,
+            categories=categories
+        )
+
+    @classmethod
+    def from_shared(cls, handle: 'SharedColumnarHandle') -> 'ColumnarMarketData':
+        """
+        공유 메모리에 게시된 배열에 연결 (복사 없음, 읽기 전용)
+
+        연결된 세그먼트는 반환 객체가 살아있는 동안 매핑을 유지한다.
+        """
+        segments, arrays = [], {}
+        for name, (segment_name, shape, dtype) in handle.arrays.items():
+            segment = _attach_segment(segment_name)
+            segments.append(segment)
+            array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=segment.buf)
+            array.flags.writeable = False
+            arrays[name] = array
+
+        columnar = cls(
+            tickers=handle.tickers,
+            fields=handle.fields,
+            string_fields=handle.string_fields,
+            categories=handle.categories,
+            **arrays
+        )
+        columnar._shared_segments = segments
+        return columnar
+
+    def to_shared(self) -> 'SharedColumnarMarketData':
+        """배열을 공유 메모리에 게시 (호출 프로세스가 소유, close()로 해제)"""
+        return SharedColumnarMarketData(self)
+
+    @staticmethod
+    def _to_float_block(sub: pd.DataFrame) -> np.ndarray:
+        """숫자 필드 블록을 float64로 변환 (NaN/변환 불가 -> 0.0)"""
+        try:
+            block = sub.to_numpy(dtype=np.float64)
+        except (ValueError, TypeError):
+            block = np.column_stack([
+                pd.to_numeric(sub.iloc[:, c], errors='coerce').to_numpy(dtype=np.float64)
+                for c in range(sub.shape[1])
+            ]) if sub.shape[1] else np.empty((len(sub), 0))
+        return np.nan_to_num(block, nan=0.0, posinf=np.inf, neginf=-np.inf)
+
+    # ===== ACCESS =====
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def universe_indices(self, universe: List[str]) -> np.ndarray:
+        """universe 순서를 유지한 종목 인덱스 (데이터 없는 종목 제외)"""
+        return np.array([self.ticker_index[ticker] for ticker in universe
+                         if ticker in self.ticker_index], dtype=np.intp)
+
+    def field_values(self, field: str, default: float = 0.0) -> np.ndarray:
+        """
+        숫자 필드의 (dates x tickers) 배열 (읽기 전용). 컬럼이 없는 종목은 default로 채움.
+        dict 경로의 ticker_data.get(field, default)와 동일한 값을 반환.
+
+        모든 종목에 컬럼이 있으면 values의 뷰(공유 메모리 그대로), 필드가 없으면 broadcast 뷰를
+        반환하고 일부 종목만 있을 때만 복사본을 만든다. 바 단위 접근은 field_row 사용.
+        """
+        shape = self.values.shape[:2]
+        f = self.field_index.get(field)
+        if f is None or field in self.string_index:
+            return np.broadcast_to(np.float64(default), shape)
+        if self.present[:, f].all():
+            return self.values[:, :, f]
+
+        key = (field, default)
+        cached = self._field_cache.get(key)
+        if cached is None:
+            cached = self._field_cache[key] = np.where(self.present[:, f], self.values[:, :, f], default)
+        return cached
+
+    def field_row(self, field: str, index: int, cols: np.ndarray, default: float = 0.0) -> np.ndarray:
+        """한 날짜의 지정 종목(cols) 필드 값 - field_values(field, default)[index, cols]와 같고 전체 배열을 만들지 않음"""
+        f = self.field_index.get(field)
+        if f is None or field in self.string_index:
+            return np.full(len(cols), default, dtype=np.float64)
+        return np.where(self.present[cols, f], self.values[index, cols, f], default)
+
+    def has_field(self, field: str) -> np.ndarray:
+        """종목별 (ticker, field) 컬럼 존재 여부 (tickers,)"""
+        f = self.field_index.get(field)
+        if f is None:
+            return np.zeros(len(self.tickers), dtype=bool)
+        return self.present[:, f]
+
+    def row(self, index: int, t: int) -> Dict[str, Any]:
+        """
+        특정 날짜/종목의 필드 dict
+        _extract_market_data(df, index)[ticker]와 동일한 구조
+        """
+        day_values = self.values[index, t]
+        day_codes = self.codes[index, t]
+        present = self.present[t]
+
+        data = {}
+        for name, f, s in self._row_layout:
+            if not present[f]:
+                continue
+            if s is None:
+                data[name] = float(day_values[f])
+            else:
+                data[name] = self.categories[s][day_codes[s]]
+        return data
+
+    def rows(self, index: int, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        """지정 종목들만 dict로 추출 (보유 종목/매수 후보 등 소수 종목용)"""
+        data = {}
+        for ticker in tickers:
+            t = self.ticker_index.get(ticker)
+            if t is not None:
+                data[ticker] = self.row(index, t)
+        return data
+
+    def nbytes(self) -> int:
+        """배열 메모리 사용량 (bytes)"""
+        return self.values.nbytes + self.present.nbytes + self.codes.nbytes
+
+
+# ===== SHARED MEMORY =====
+@dataclass(frozen=True)
+class SharedColumnarHandle:
+    """
+    공유 메모리 배열 참조 (워커에 전달되는 작은 picklable 객체)
+
+    arrays: 속성 이름 -> (세그먼트 이름, shape, dtype 문자열)
+    """
+    arrays: Dict[str, Tuple[str, Tuple[int, ...], str]]
+    tickers: List[str]
+    fields: List[str]
+    string_fields: List[str]
+    categories: List[List[Any]]
+
+
+class SharedColumnarMarketData:
+    """
+    ColumnarMarketData 배열의 공유 메모리 게시본
+
+    생성한 프로세스가 세그먼트를 소유하며, 모든 워커가 끝난 뒤 close()로 해제(unlink)한다.
+    with 문으로 사용 가능.
+    """
+
+    def __init__(self, columnar: ColumnarMarketData):
+        self._segments: List[shared_memory.SharedMemory] = []
+        arrays = {}
+        try:
+            for name in SHARED_ARRAYS:
+                source = np.ascontiguousarray(getattr(columnar, name))
+                segment = shared_memory.SharedMemory(create=True, size=max(source.nbytes, 1))
+                self._segments.append(segment)
+                np.ndarray(source.shape, dtype=source.dtype, buffer=segment.buf)[...] = source
+                arrays[name] = (segment.name, source.shape, source.dtype.str)
+        except Exception:
+            self.close()
+            raise
+
+        self.handle = SharedColumnarHandle(
+            arrays=arrays,
+            tickers=list(columnar.tickers),
+            fields=list(columnar.fields),
+            string_fields=list(columnar.string_fields),
+            categories=[list(cats) for cats in columnar.categories]
+        )
+        self.nbytes = sum(segment.size for segment in self._segments)
+        logger.info(f"Published columnar market data to shared memory: {self.nbytes / 1024**2:.1f} MB")
+
+    def close(self):
+        """세그먼트 해제 및 삭제"""
+        for segment in self._segments:
+            segment.close()
+            try:
+                segment.unlink()
+            except FileNotFoundError:
+                pass
+        self._segments = []
+
+    def __enter__(self) -> 'SharedColumnarMarketData':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def _attach_segment(name: str) -> shared_memory.SharedMemory:
+    """기존 세그먼트 연결 (소유 프로세스만 unlink하도록 resource tracker 등록 제외)"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13
+        return shared_memory.SharedMemory(name=name)
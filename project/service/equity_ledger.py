@@ -0,0 +1,358 @@
+"""
+Equity Ledger - Service Layer Implementation
+
+백테스트 일별 포트폴리오 이력을 Portfolio 깊은 복사 대신
+append-only 타입 배열로 기록하는 컬럼형 히스토리 레코더.
+
+- 일별 집계: date, cash, stock_value, position_count, win/loss 카운터
+- 포지션 델타: 변경된 포지션만 (day, ticker, op, balance, avg_price, again,
+  duration, losscut_price, risk) 행으로 추가
+- 특정 날짜의 Portfolio는 델타를 재생하여 필요할 때만 재구성
+"""
+
+import pandas as pd
+import numpy as np
+from typing import TYPE_CHECKING, Dict, List, Optional, Iterator, Iterable, Sequence, Union
+import logging
+
+if TYPE_CHECKING:
+    from project.service.backtest_models import Portfolio
+
+logger = logging.getLogger(__name__)
+
+
+# 포지션 델타 연산 코드
+OP_OPEN = 0
+OP_UPDATE = 1
+OP_CLOSE = 2
+
+POSITION_FIELDS = ('balance', 'avg_price', 'again', 'duration', 'losscut_price', 'risk')
+
+
+class EquityLedger:
+    """
+    Append-only 컬럼형 자산 이력
+
+    record()는 하루에 한 번 호출되며, 포지션 상태가 바뀐 종목만 델타 행으로 저장한다.
+    portfolio_at()/portfolios()로 임의 날짜의 Portfolio를 지연 재구성할 수 있다.
+    """
+
+    def __init__(self, initial_capacity: int = 256, track_positions: bool = True):
+        """
+        Args:
+            initial_capacity: 초기 배열 용량 (가득 차면 2배씩 확장)
+            track_positions: False면 일별 집계만 기록 (Portfolio 재구성 불가)
+        """
+        self.track_positions = track_positions
+        self._size = 0
+        self._dates = np.empty(initial_capacity, dtype='datetime64[ns]')
+        self._cash = np.empty(initial_capacity, dtype=np.float64)
+        self._stock_value = np.empty(initial_capacity, dtype=np.float64)
+        self._position_count = np.empty(initial_capacity, dtype=np.int32)
+        self._counters = np.empty((initial_capacity, 4), dtype=np.float64)  # win/loss count, win/loss gain
+
+        self._rows = 0
+        self._row_day = np.empty(initial_capacity, dtype=np.int32)
+        self._row_ticker = np.empty(initial_capacity, dtype=np.int32)
+        self._row_op = np.empty(initial_capacity, dtype=np.int8)
+        self._row_values = np.empty((initial_capacity, len(POSITION_FIELDS)), dtype=np.float64)
+
+        self.tickers: List[str] = []
+        self._ticker_codes: Dict[str, int] = {}
+        self._last_state: Dict[str, tuple] = {}
+
+    # ===== RECORDING =====
+    def record(self, date, portfolio: 'Portfolio', opened: Iterable[str] = ()):
+        """
+        하루치 포트폴리오 상태 기록
+
+        Args:
+            date: 기록 날짜
+            portfolio: 현재 Portfolio (복사하지 않음)
+            opened: 이 날 새로 매수된 종목 (매도 후 같은 날 재매수된 종목 구분용)
+        """
+        counters = (portfolio.win_count, portfolio.loss_count, portfolio.win_gain, portfolio.loss_gain)
+        self.record_state(
+            date, portfolio.cash, portfolio.stock_value, counters,
+            {ticker: (pos.balance, pos.avg_price, pos.again, pos.duration, pos.losscut_price, pos.risk)
+             for ticker, pos in portfolio.positions.items()} if self.track_positions else None,
+            opened=opened,
+            position_count=portfolio.position_count
+        )
+
+    def record_state(self, date, cash: float, stock_value: float, counters: tuple,
+                     positions: Optional[Dict[str, tuple]], opened: Iterable[str] = (),
+                     position_count: Optional[int] = None):
+        """
+        하루치 상태를 원시 값으로 기록 (BatchBacktestService 등 배열 기반 엔진용)
+
+        Args:
+            positions: {ticker: (balance, avg_price, again, duration, losscut_price, risk)}
+                       삽입 순서 = 포지션 보유 순서
+        """
+        day = self._size
+        if day == len(self._cash):
+            self._grow_days()
+
+        self._dates[day] = np.datetime64(pd.Timestamp(date), 'ns')
+        self._cash[day] = cash
+        self._stock_value[day] = stock_value
+        self._counters[day] = counters
+        if position_count is None:
+            position_count = len(positions) if positions is not None else 0
+        self._position_count[day] = position_count
+        self._size += 1
+
+        if self.track_positions and positions is not None:
+            self._record_deltas(day, positions, set(opened))
+
+    def _record_deltas(self, day: int, positions: Dict[str, tuple], opened: set):
+        """변경된 포지션만 델타 행으로 추가 (CLOSE → OPEN/UPDATE 순서)"""
+        last = self._last_state
+
+        for ticker in list(last.keys()):
+            if ticker not in positions or ticker in opened:
+                self._append_row(day, ticker, OP_CLOSE, None)
+                del last[ticker]
+
+        for ticker, state in positions.items():
+            previous = last.get(ticker)
+            if previous is None:
+                self._append_row(day, ticker, OP_OPEN, state)
+                last[ticker] = state
+            elif previous != state:
+                self._append_row(day, ticker, OP_UPDATE, state)
+                last[ticker] = state
+
+    def _append_row(self, day: int, ticker: str, op: int, state: Optional[tuple]):
+        if self._rows == len(self._row_op):
+            self._grow_rows()
+
+        code = self._ticker_codes.get(ticker)
+        if code is None:
+            code = len(self.tickers)
+            self._ticker_codes[ticker] = code
+            self.tickers.append(ticker)
+
+        r = self._rows
+        self._row_day[r] = day
+        self._row_ticker[r] = code
+        self._row_op[r] = op
+        if state is not None:
+            self._row_values[r] = state
+        self._rows += 1
+
+    def _grow_days(self):
+        capacity = max(len(self._cash) * 2, 16)
+        self._dates = np.resize(self._dates, capacity)
+        self._cash = np.resize(self._cash, capacity)
+        self._stock_value = np.resize(self._stock_value, capacity)
+        self._position_count = np.resize(self._position_count, capacity)
+        self._counters = np.resize(self._counters, (capacity, 4))
+
+    def _grow_rows(self):
+        capacity = max(len(self._row_op) * 2, 16)
+        self._row_day = np.resize(self._row_day, capacity)
+        self._row_ticker = np.resize(self._row_ticker, capacity)
+        self._row_op = np.resize(self._row_op, capacity)
+        self._row_values = np.resize(self._row_values, (capacity, len(POSITION_FIELDS)))
+
+    # ===== ARRAY ACCESS =====
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def dates(self) -> np.ndarray:
+        return self._dates[:self._size]
+
+    @property
+    def cash(self) -> np.ndarray:
+        return self._cash[:self._size]
+
+    @property
+    def stock_value(self) -> np.ndarray:
+        return self._stock_value[:self._size]
+
+    @property
+    def total_value(self) -> np.ndarray:
+        return self.cash + self.stock_value
+
+    @property
+    def position_count(self) -> np.ndarray:
+        return self._position_count[:self._size]
+
+    @property
+    def counters(self) -> np.ndarray:
+        """(days x 4): win_count, loss_count, win_gain, loss_gain"""
+        return self._counters[:self._size]
+
+    @property
+    def cash_ratio(self) -> np.ndarray:
+        """일별 현금 비율 (%) - Portfolio.cash_ratio와 동일"""
+        total = self.total_value
+        return np.divide(self.cash, total, out=np.zeros_like(total), where=total > 0) * 100
+
+    def to_frame(self) -> pd.DataFrame:
+        """일별 집계 DataFrame (BacktestResult.daily_balance 형식)"""
+        return pd.DataFrame({
+            'cash': self.cash,
+            'stock_value': self.stock_value,
+            'total_value': self.total_value,
+            'position_count': self.position_count
+        }, index=pd.DatetimeIndex(self.dates, name='Date'))
+
+    def total_value_series(self) -> pd.Series:
+        """일별 총 자산 시계열 (리포팅용)"""
+        return pd.Series(self.total_value, index=pd.DatetimeIndex(self.dates, name='Date'), name='total_value')
+
+    def nbytes(self) -> int:
+        """실제 기록된 데이터 크기 (bytes)"""
+        day_bytes = self._size * (8 + 8 + 8 + 4 + 32)
+        row_bytes = self._rows * (4 + 4 + 1 + 8 * len(POSITION_FIELDS))
+        return day_bytes + row_bytes
+
+    # ===== SERIALIZATION =====
+    def state_arrays(self) -> Dict[str, np.ndarray]:
+        """기록된 구간만 잘라낸 배열 (np.savez 등으로 저장, from_state_arrays로 복원)"""
+        return {
+            'dates': self.dates.copy(),
+            'cash': self.cash.copy(),
+            'stock_value': self.stock_value.copy(),
+            'position_count': self.position_count.copy(),
+            'counters': self.counters.copy(),
+            'row_day': self._row_day[:self._rows].copy(),
+            'row_ticker': self._row_ticker[:self._rows].copy(),
+            'row_op': self._row_op[:self._rows].copy(),
+            'row_values': self._row_values[:self._rows].copy(),
+            'tickers': np.array(self.tickers, dtype=str),
+            'track_positions': np.array(self.track_positions),
+        }
+
+    @classmethod
+    def from_state_arrays(cls, arrays: Dict[str, np.ndarray]) -> 'EquityLedger':
+        """state_arrays() 결과로 ledger 복원 - 이어서 record() 가능"""
+        size = len(arrays['dates'])
+        rows = len(arrays['row_op'])
+        ledger = cls(initial_capacity=max(size, rows, 16), track_positions=bool(arrays['track_positions']))
+
+        ledger._size = size
+        ledger._dates[:size] = arrays['dates']
+        ledger._cash[:size] = arrays['cash']
+        ledger._stock_value[:size] = arrays['stock_value']
+        ledger._position_count[:size] = arrays['position_count']
+        ledger._counters[:size] = arrays['counters']
+
+        ledger._rows = rows
+        ledger._row_day[:rows] = arrays['row_day']
+        ledger._row_ticker[:rows] = arrays['row_ticker']
+        ledger._row_op[:rows] = arrays['row_op']
+        ledger._row_values[:rows] = arrays['row_values']
+
+        ledger.tickers = [str(ticker) for ticker in arrays['tickers']]
+        ledger._ticker_codes = {ticker: code for code, ticker in enumerate(ledger.tickers)}
+
+        # 마지막 포지션 상태 = 전체 델타 재생 결과
+        ledger._replay(ledger._last_state, 0, rows)
+        return ledger
+
+    # ===== RECONSTRUCTION =====
+    def index_of(self, date) -> int:
+        """날짜에 해당하는 (해당 날짜 이전 마지막) 기록 인덱스"""
+        target = np.datetime64(pd.Timestamp(date), 'ns')
+        index = int(np.searchsorted(self.dates, target, side='right')) - 1
+        if index < 0:
+            raise KeyError(f"No ledger entry on or before {date}")
+        return index
+
+    def portfolio_at(self, key: Union[int, pd.Timestamp, str]) -> 'Portfolio':
+        """
+        특정 날짜(또는 인덱스)의 Portfolio 재구성
+
+        Args:
+            key: 일자 인덱스(int, 음수 허용) 또는 날짜
+        """
+        if not self.track_positions:
+            raise ValueError("Ledger was recorded without position deltas")
+
+        index = self._resolve_index(key)
+        end = int(np.searchsorted(self._row_day[:self._rows], index, side='right'))
+        positions: Dict[str, tuple] = {}
+        self._replay(positions, 0, end)
+        return self._build_portfolio(index, positions)
+
+    def portfolios(self) -> 'LedgerPortfolioView':
+        """portfolio_history 호환 지연 시퀀스"""
+        return LedgerPortfolioView(self)
+
+    def iter_portfolios(self) -> Iterator['Portfolio']:
+        """모든 날짜의 Portfolio를 순서대로 재구성 (델타 1회 재생)"""
+        positions: Dict[str, tuple] = {}
+        row_days = self._row_day[:self._rows]
+        start = 0
+        for index in range(self._size):
+            end = int(np.searchsorted(row_days, index, side='right'))
+            self._replay(positions, start, end)
+            start = end
+            yield self._build_portfolio(index, positions)
+
+    def _resolve_index(self, key) -> int:
+        if isinstance(key, (int, np.integer)):
+            index = int(key)
+            if index < 0:
+                index += self._size
+            if not 0 <= index < self._size:
+                raise IndexError(f"Ledger index {key} out of range")
+            return index
+        return self.index_of(key)
+
+    def _replay(self, positions: Dict[str, tuple], start: int, end: int):
+        for r in range(start, end):
+            ticker = self.tickers[self._row_ticker[r]]
+            op = self._row_op[r]
+            if op == OP_CLOSE:
+                positions.pop(ticker, None)
+            elif op == OP_OPEN:
+                positions.pop(ticker, None)
+                positions[ticker] = tuple(self._row_values[r].tolist())
+            else:
+                positions[ticker] = tuple(self._row_values[r].tolist())
+
+    def _build_portfolio(self, index: int, positions: Dict[str, tuple]) -> 'Portfolio':
+        from .backtest_models import Portfolio, Position
+
+        win_count, loss_count, win_gain, loss_gain = self._counters[index].tolist()
+        return Portfolio(
+            cash=float(self._cash[index]),
+            positions={
+                ticker: Position(ticker, *state)
+                for ticker, state in positions.items()
+            },
+            win_count=win_count,
+            loss_count=loss_count,
+            win_gain=win_gain,
+            loss_gain=loss_gain
+        )
+
+
+class LedgerPortfolioView(Sequence):
+    """
+    EquityLedger 기반 portfolio_history 호환 시퀀스
+    인덱싱/len/반복은 기존 List[Portfolio]와 동일하게 동작하지만 필요할 때만 재구성한다.
+    """
+
+    def __init__(self, ledger: EquityLedger):
+        self.ledger = ledger
+
+    def __len__(self) -> int:
+        return len(self.ledger)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self.ledger.portfolio_at(i) for i in range(*key.indices(len(self)))]
+        return self.ledger.portfolio_at(key)
+
+    def __iter__(self) -> Iterator['Portfolio']:
+        return self.ledger.iter_portfolios()
+
+    def __repr__(self) -> str:
+        return f"LedgerPortfolioView(days={len(self)})"
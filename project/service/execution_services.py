@@ -18,6 +18,8 @@ import os
 from dataclasses import dataclass
 from enum import Enum
 
+from project.strategy.candidate_ranking import rank_descending, select_top_k
+
 
 # 데이터 클래스 정의
 @dataclass
@@ -455,25 +457,17 @@ class BacktestExecutionServices:
         # 두 조건을 모두 만족하는 최종 마스크 생성
         final_candidate_mask = candidate_mask & price_condition_mask
 
-        candidate_stocks = np.array(stock_list)[final_candidate_mask]
-        candidate_sorting_metric = sorting_metric[final_candidate_mask]
-
         # 이미 보유 중인 종목 제외
-        filtered_candidates = [
-            (stock, metric)
-            for stock, metric in zip(candidate_stocks, candidate_sorting_metric)
-            if stock not in current_positions
-        ]
-
-        # Sort filtered_candidates directly by SORTING_METRIC in descending order
-        sorted_candidates_by_metric = sorted(filtered_candidates, key=lambda x: x[1], reverse=True)
+        stocks = np.array(stock_list)
+        final_candidate_mask &= ~np.isin(stocks, list(current_positions))
 
-        # Extract only the stock names from the sorted list
-        final_sorted_candidates = [stock for stock, metric in sorted_candidates_by_metric]
+        candidate_stocks = stocks[final_candidate_mask]
+        candidate_sorting_metric = np.asarray(sorting_metric, dtype=np.float64)[final_candidate_mask]
 
-        # 매수 가능한 종목 수 만큼만 후보 선택
+        # 매수 가능한 종목 수 만큼만 SORTING_METRIC 내림차순 상위 K 선택 (동률은 입력 순서)
         available_positions = self.MaxStockList - position_cnt
-        new_candidates = final_sorted_candidates[:int(available_positions)]
+        new_candidates = [str(stock) for stock in
+                          select_top_k(candidate_stocks, candidate_sorting_metric, int(available_positions))]
         new_candidates_cnt = len(new_candidates)
 
         return new_candidates, new_candidates_cnt
@@ -485,47 +479,27 @@ class BacktestExecutionServices:
         """
         복합 지표 기준 후보 종목 선정 (Strategy_M.py select_candidate_stocks_multi 기반)
         """
-        # 매수 신호가 1인 종목 선택
-        candidate_mask = buy_signals == 1
-        candidate_stocks = np.array(stock_list)[candidate_mask]
-        candidate_rev = rev_growth[candidate_mask]
-        candidate_eps = eps_growth[candidate_mask]
-
-        # 이미 보유 중인 종목은 제외
-        filtered_candidates = [
-            (stock, rev, eps)
-            for stock, rev, eps in zip(candidate_stocks, candidate_rev, candidate_eps)
-            if stock not in current_positions
-        ]
-
-        if len(filtered_candidates) > 0:
-            # 각 지표별 값을 배열로 추출
-            rev_values = np.array([item[1] for item in filtered_candidates])
-            eps_values = np.array([item[2] for item in filtered_candidates])
-
-            # 높은 값이 더 좋은 순위가 되도록 내림차순 정렬하는 함수 정의
-            def rank_desc(arr):
-                order = np.argsort(-arr)  # 내림차순 정렬 인덱스
-                ranks = np.empty_like(order)
-                ranks[order] = np.arange(1, len(arr) + 1)
-                return ranks
-
-            rev_ranks = rank_desc(rev_values)
-            eps_ranks = rank_desc(eps_values)
-
-            # 두 지표의 순위 합 계산 (합이 낮을수록 전반적으로 우수한 후보)
-            total_ranks = rev_ranks + eps_ranks
+        # 매수 신호가 1이고 보유 중이 아닌 종목 선택
+        stocks = np.array(stock_list)
+        candidate_mask = (buy_signals == 1) & ~np.isin(stocks, list(current_positions))
+        candidate_stocks = stocks[candidate_mask]
+
+        # 매수 가능한 종목 수 (최대 보유 가능 수 - 현재 보유 수)
+        available_positions = self.MaxStockList - position_cnt
+
+        if len(candidate_stocks) > 0:
+            # 높은 값이 더 좋은 순위 (동률은 입력 순서)
+            rev_ranks = rank_descending(rev_growth[candidate_mask])
+            eps_ranks = rank_descending(eps_growth[candidate_mask])
 
-            # 순위 합 기준 오름차순 정렬하여 후보 정렬
-            sorted_indices = np.argsort(total_ranks)
-            sorted_candidates = [filtered_candidates[i] for i in sorted_indices]
-            new_candidates = [stock for stock, _, _ in sorted_candidates]
+            # 두 지표의 순위 합이 낮은 순으로 상위 K 선택
+            total_ranks = rev_ranks + eps_ranks
+            new_candidates = [str(stock) for stock in
+                              select_top_k(candidate_stocks, total_ranks, int(available_positions),
+                                           descending=False)]
         else:
             new_candidates = []
 
-        # 매수 가능한 종목 수 (최대 보유 가능 수 - 현재 보유 수)
-        available_positions = self.MaxStockList - position_cnt
-        new_candidates = new_candidates[:int(available_positions)]
         new_candidates_cnt = len(new_candidates)
 
         return new_candidates, new_candidates_cnt
@@ -597,8 +571,20 @@ class BacktestExecutionServices:
             elif self.Market == 'AMX':
                 str_database_name = 'AmxDataBase_M'
             else:
+                # 종목 디렉토리(로컬 파일)에서 거래소 확인 → 없으면 테이블 존재 여부 체크
+                directory_database = None
+                if self.Area == 'US':
+                    # 지연 import: 종목 디렉토리는 pymongo에 의존 (백테스트 경로는 불필요)
+                    try:
+                        from ..database.symbol_directory import get_symbol_directory
+                        directory_database = get_symbol_directory(max_age=None).database(stockcode, 'M')
+                    except ImportError:
+                        directory_database = None
+
+                if directory_database:
+                    str_database_name = directory_database
                 # DB 연결이 있는 경우만 테이블 존재 여부 체크
-                if self.DB:
+                elif self.DB:
                     if self.DB.ChkTableExist('NasDataBase_M', stockcode, self.Area):
                         str_database_name = 'NasDataBase_M'
                     elif self.DB.ChkTableExist('NysDataBase_M', stockcode, self.Area):
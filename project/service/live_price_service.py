@@ -8,15 +8,15 @@ WebSocket을 통해 KIS API에서 실시간 가격 정보를 받아 처리
 import asyncio
 import logging
 import random
-from typing import Dict, List, Optional, Callable, Any
+from typing import Dict, List, Optional, Callable, Any, Tuple
 from datetime import datetime, timedelta
 import json
-import pymongo
-import yaml
-from pathlib import Path
 
 from ..interfaces.service_interfaces import ILivePriceService, BaseService
 from ..models.trading_models import PriceData, MarketType
+from ..database.minute_bar_store import MinuteBarStore, MinuteBars
+from ..database.connection_registry import get_client
+from ..database.symbol_directory import get_symbol_directory
 
 
 class LivePriceService(BaseService, ILivePriceService):
@@ -44,6 +44,13 @@ class LivePriceService(BaseService, ILivePriceService):
         self.update_count = 0
         self.last_update_time = None
 
+        # 분봉 재생 모드 (minute_store_path + replay_date 설정 시 저장된 분봉을 순서대로 재생)
+        self.replay_date = config.get('replay_date')
+        store_path = config.get('minute_store_path')
+        self.minute_store = MinuteBarStore(store_path) if store_path and self.replay_date else None
+        self._replay_bars: Dict[str, Optional[MinuteBars]] = {}
+        self._replay_cursor: Dict[str, int] = {}
+
     async def start_service(self) -> bool:
         """서비스 시작"""
         try:
@@ -235,21 +242,8 @@ class LivePriceService(BaseService, ILivePriceService):
     async def _fetch_previous_day_from_mongodb(self, symbols: List[str]) -> Dict[str, float]:
         """MongoDB에서 전날 종가 데이터 조회"""
         try:
-            # myStockInfo.yaml에서 MongoDB 설정 로드
-            project_root = Path(__file__).parent.parent.parent
-            stock_info_path = project_root / 'myStockInfo.yaml'
-
-            with open(stock_info_path, 'r', encoding='utf-8') as f:
-                stock_info = yaml.safe_load(f)
-
-            # MongoDB 연결
-            mongo_client = pymongo.MongoClient(
-                host=stock_info["MONGODB_LOCAL"],
-                port=stock_info["MONGODB_PORT"],
-                username=stock_info["MONGODB_ID"],
-                password=stock_info["MONGODB_PW"],
-                serverSelectionTimeoutMS=5000
-            )
+            # 프로세스 공유 MongoDB 연결 (connection_registry)
+            mongo_client = get_client("MONGODB_LOCAL")
 
             previous_data = {}
             # 전날 날짜 계산 (평일만)
@@ -263,26 +257,29 @@ class LivePriceService(BaseService, ILivePriceService):
                     break
                 days_back += 1
 
+            # 종목 디렉토리(로컬 파일)로 일봉 DB 결정
+            directory = get_symbol_directory(max_age=None)
+
             # 각 심볼별로 전날 데이터 조회
             for symbol in symbols:
                 try:
-                    # Nasdaq과 NYSE 데이터베이스 모두 확인
-                    for db_name in ['NasDataBase_D', 'NysDataBase_D']:
-                        db = mongo_client[db_name]
-                        if symbol in db.list_collection_names():
-                            collection = db[symbol]
-                            # 가장 최근 데이터 조회
-                            latest_data = collection.find().sort("date", -1).limit(1)
-                            for doc in latest_data:
-                                if 'Dclose' in doc:
-                                    previous_data[symbol] = float(doc['Dclose'])
-                                    break
-                            break
+                    db_name = directory.database(symbol, 'D')
+                    if db_name is None:
+                        # 디렉토리에 없는 종목: Nasdaq과 NYSE 데이터베이스에서 해당 컬렉션만 확인
+                        db_name = next((name for name in ['NasDataBase_D', 'NysDataBase_D']
+                                        if mongo_client[name].list_collection_names(filter={'name': symbol})), None)
+                    if db_name in ('NasDataBase_D', 'NysDataBase_D'):
+                        collection = mongo_client[db_name][symbol]
+                        # 가장 최근 데이터 조회
+                        latest_data = collection.find().sort("date", -1).limit(1)
+                        for doc in latest_data:
+                            if 'Dclose' in doc:
+                                previous_data[symbol] = float(doc['Dclose'])
+                                break
                 except Exception as symbol_error:
                     self.logger.warning(f"심볼 {symbol} 전날 데이터 조회 실패: {symbol_error}")
                     continue
 
-            mongo_client.close()
             return previous_data
 
         except Exception as e:
@@ -338,10 +335,20 @@ class LivePriceService(BaseService, ILivePriceService):
     async def _simulate_price_update(self, symbol: str):
         """가격 업데이트 시뮬레이션 (마켓 시간 고려)"""
         try:
+            volume = None
+            timestamp = None
+
+            # 분봉 재생 모드: 마켓 시간과 무관하게 저장된 분봉을 한 개씩 진행
+            replay = self._next_replay_bar(symbol) if self.minute_store is not None else None
+
             # 마켓 시간 확인 (미국 시간 기준)
-            is_market_open = self._is_market_open()
+            is_market_open = replay is None and self._is_market_open()
 
-            if is_market_open:
+            if replay is not None:
+                new_price, volume, timestamp = replay
+                source = "minute_store_replay"
+                self.logger.debug(f"[분봉 재생] {symbol} {timestamp}: ${new_price:.2f}")
+            elif is_market_open:
                 # 마켓이 열려있으면 새로운 가격 생성 (웹소켓 데이터 시뮬레이션)
                 new_price = await self._fetch_price_from_api(symbol)
                 if new_price is None:
@@ -379,8 +386,8 @@ class LivePriceService(BaseService, ILivePriceService):
             price_data = PriceData(
                 symbol=symbol,
                 price=new_price,
-                volume=random.randint(1000, 100000),  # 시뮬레이션 거래량
-                timestamp=datetime.now(),
+                volume=volume if volume is not None else random.randint(1000, 100000),  # 시뮬레이션 거래량
+                timestamp=timestamp or datetime.now(),
                 change=change,
                 change_pct=change_pct,  # change_percent -> change_pct로 수정
                 market=self._get_market_type(symbol)
@@ -405,6 +412,23 @@ class LivePriceService(BaseService, ILivePriceService):
         except Exception as e:
             self.log_error(f"가격 업데이트 시뮬레이션 오류 ({symbol}): {e}")
 
+    def _next_replay_bar(self, symbol: str) -> Optional[Tuple[float, int, datetime]]:
+        """재생 중인 종목의 다음 분봉 (종가, 거래량, 시각) - 마지막 분봉 이후에는 마지막 값 유지"""
+        if symbol not in self._replay_bars:
+            self._replay_bars[symbol] = self.minute_store.day_bars(symbol, self.replay_date)
+
+        bars = self._replay_bars[symbol]
+        if bars is None:
+            return None
+
+        i = self._replay_cursor.get(symbol, 0)
+        if i < len(bars):
+            self._replay_cursor[symbol] = i + 1
+        else:
+            i = len(bars) - 1
+
+        return float(bars.close[i]), int(bars.volume[i]), bars.time_at(i).to_pydatetime()
+
     def _is_market_open(self) -> bool:
         """미국 마켓 오픈 시간 확인"""
         try:
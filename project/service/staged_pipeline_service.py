@@ -14,6 +14,7 @@ import logging
 import time
 
 from project.indicator.staged_data_loader import StagedDataLoader
+from project.indicator.data_requirements import signal_config_required_columns
 from project.strategy.staged_signal_service import StagedSignalService
 
 # Setup logging
@@ -34,7 +35,7 @@ class StagedPipelineService:
 
     def __init__(self, config: dict, market: str = 'US', area: str = 'US',
                  start_day: datetime = None, end_day: datetime = None, is_backtest: bool = False,
-                 execution_mode: str = 'live'):
+                 execution_mode: str = 'live', use_price_cache: bool = True):
         """
         Initialize staged pipeline service
 
@@ -47,6 +48,8 @@ class StagedPipelineService:
             is_backtest: True for backtest mode (prevents future reference), False for live trading
             execution_mode: 'live' for real-time trading (menu 3),
                           'analysis' for historical analysis (menu 1, 2, 4)
+            use_price_cache: Read daily/weekly history through the local price cache
+                             (False = always query MongoDB)
         """
         self.config = config
         self.market = market
@@ -56,17 +59,20 @@ class StagedPipelineService:
         self.execution_mode = execution_mode
 
         # Initialize services
+        self.signal_service = StagedSignalService(
+            config=config,
+            execution_mode=execution_mode
+        )
+
+        # Read only the columns the enabled signals (and the backtest conversion) use
         self.data_loader = StagedDataLoader(
             market=market,
             area=area,
             start_day=start_day,
             end_day=end_day,
-            is_backtest=is_backtest
-        )
-
-        self.signal_service = StagedSignalService(
-            config=config,
-            execution_mode=execution_mode
+            is_backtest=is_backtest,
+            required_columns=signal_config_required_columns(self.signal_service.signal_config_loader),
+            use_price_cache=use_price_cache
         )
 
         # Performance tracking
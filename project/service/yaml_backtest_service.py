@@ -17,6 +17,7 @@ from pathlib import Path
 from project.strategy.yaml_strategy_loader import YAMLStrategyLoader, LoadedStrategy
 from project.strategy.yaml_strategy_executor import YAMLStrategyExecutor
 from project.service.daily_backtest_service import DailyBacktestService, BacktestConfig, BacktestResult
+from project.service.backtest_result_cache import BacktestResultCache
 from project.reporting.backtest_result_manager import BacktestResultManager
 
 logger = logging.getLogger(__name__)
@@ -31,13 +32,15 @@ class YAMLBacktestService:
     - Execute strategies to generate signals
     - Convert signals to backtest engine format
     - Run backtest using DailyBacktestService
+    - Reuse identical backtests from BacktestResultCache (optional)
     - Store results in MongoDB using BacktestResultManager
     """
 
     def __init__(self,
                  loader: Optional[YAMLStrategyLoader] = None,
                  executor: Optional[YAMLStrategyExecutor] = None,
-                 result_manager: Optional[BacktestResultManager] = None):
+                 result_manager: Optional[BacktestResultManager] = None,
+                 result_cache: Optional[BacktestResultCache] = None):
         """
         Initialize YAML Backtest Service
 
@@ -45,18 +48,29 @@ class YAMLBacktestService:
             loader: Strategy loader instance
             executor: Strategy executor instance
             result_manager: Result manager instance
+            result_cache: Local result cache (None disables caching)
         """
         self.loader = loader or YAMLStrategyLoader()
         self.executor = executor or YAMLStrategyExecutor()
-        self.result_manager = result_manager or BacktestResultManager()
+        self._result_manager = result_manager
+        self.result_cache = result_cache
 
         logger.info("Initialized YAMLBacktestService")
 
+    @property
+    def result_manager(self) -> BacktestResultManager:
+        """Result manager (MongoDB connection is opened on first use, i.e. when storing results)"""
+        if self._result_manager is None:
+            self._result_manager = BacktestResultManager()
+        return self._result_manager
+
     def backtest_from_file(self,
                           yaml_path: str,
                           data: Dict[str, pd.DataFrame],
                           backtest_config: Optional[BacktestConfig] = None,
-                          store_results: bool = True) -> Dict[str, Any]:
+                          store_results: bool = True,
+                          market: str = 'US',
+                          area: str = 'US') -> Dict[str, Any]:
         """
         Load YAML strategy and run backtest
 
@@ -65,6 +79,8 @@ class YAMLBacktestService:
             data: Dictionary mapping symbol -> DataFrame with OHLCV + indicators
             backtest_config: Backtest configuration (uses defaults if None)
             store_results: Whether to store results in MongoDB
+            market: Market the data was loaded from (NAS, NYS, AMX, US, ...)
+            area: Area code passed to the backtest engine (US, KR, ...)
 
         Returns:
             Dictionary with backtest results and metadata
@@ -88,22 +104,34 @@ class YAMLBacktestService:
             strategy=strategy,
             data=data,
             backtest_config=backtest_config,
-            store_results=store_results
+            store_results=store_results,
+            market=market,
+            area=area
         )
 
     def backtest_strategy(self,
                          strategy: LoadedStrategy,
                          data: Dict[str, pd.DataFrame],
                          backtest_config: Optional[BacktestConfig] = None,
-                         store_results: bool = True) -> Dict[str, Any]:
+                         store_results: bool = True,
+                         market: str = 'US',
+                         area: str = 'US',
+                         data_fingerprint: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """
         Run backtest for loaded strategy
 
+        The caller's DataFrames are not modified (indicators are calculated on
+        shallow copies), so repeated calls on the same data map to the same cache key.
+
         Args:
             strategy: Loaded strategy object
             data: Market data dictionary
             backtest_config: Backtest configuration
             store_results: Whether to store results in MongoDB
+            market: Market the data was loaded from (keys the result cache to its data version)
+            area: Area code passed to the backtest engine
+            data_fingerprint: Precomputed backtest_result_cache.data_fingerprint(data)
+                              (callers running many backtests on the same data)
 
         Returns:
             Dictionary with complete backtest results
@@ -113,22 +141,38 @@ class YAMLBacktestService:
         logger.info(f"Backtesting strategy: {strategy.name} v{strategy.version}")
 
         try:
-            # Step 1: Execute strategy to generate signals
+            # Step 0: Prepare backtest configuration
+            if backtest_config is None:
+                backtest_config = self._create_backtest_config_from_strategy(strategy)
+
+            # Step 1: Reuse an identical earlier backtest (signals are skipped as well)
+            cache_key = None
+            if self.result_cache is not None:
+                cache_key = self.result_cache.make_key(
+                    BacktestResultManager.calculate_config_hash(strategy.raw_yaml),
+                    backtest_config, list(data.keys()), data, market=market,
+                    fingerprint=data_fingerprint
+                )
+                backtest_result = self.result_cache.get(cache_key, backtest_config)
+                if backtest_result is not None:
+                    logger.info("[OK] Backtest result loaded from cache")
+                    return self._package_results(strategy, None, backtest_result, backtest_config,
+                                                 start_time, store_results, cached=True)
+
+            # Step 2: Execute strategy to generate signals
+            # (missing indicators are added to shallow copies, not the caller's frames)
             logger.info("Generating signals from YAML strategy...")
+            signal_data = {symbol: df.copy(deep=False) for symbol, df in data.items()}
             execution_results = self.executor.execute_strategy(
-                strategy, data, calculate_indicators=True
+                strategy, signal_data, calculate_indicators=True
             )
 
-            # Step 2: Convert signals to backtest engine format
+            # Step 3: Convert signals to backtest format
             logger.info("Converting signals to backtest format...")
             backtest_data = self._convert_signals_to_backtest_format(
-                execution_results, data
+                execution_results, signal_data
             )
 
-            # Step 3: Prepare backtest configuration
-            if backtest_config is None:
-                backtest_config = self._create_backtest_config_from_strategy(strategy)
-
             # Step 4: Run backtest using existing engine
             logger.info("Running backtest engine...")
             universe = list(backtest_data.keys())
@@ -136,32 +180,15 @@ class YAMLBacktestService:
             backtest_result = backtest_service.run_backtest(
                 universe=universe,
                 df_data=backtest_data,
-                market='US',
-                area='US'
+                market=market,
+                area=area
             )
 
-            # Step 5: Package results
-            execution_time = (datetime.now() - start_time).total_seconds()
-
-            results = {
-                'success': True,
-                'strategy': strategy,
-                'strategy_name': strategy.name,
-                'strategy_version': strategy.version,
-                'execution_results': execution_results,
-                'backtest_result': backtest_result,
-                'execution_time': execution_time,
-                'backtest_config': backtest_config,
-                'errors': []
-            }
-
-            # Step 6: Store results in MongoDB (if enabled)
-            if store_results:
-                logger.info("Storing results in MongoDB...")
-                self._store_backtest_results(strategy, backtest_result, results)
+            if cache_key is not None:
+                self.result_cache.put(cache_key, backtest_result, market=market)
 
-            logger.info(f"[OK] Backtest completed in {execution_time:.2f}s")
-            return results
+            return self._package_results(strategy, execution_results, backtest_result, backtest_config,
+                                         start_time, store_results)
 
         except Exception as e:
             logger.error(f"Error during backtest: {e}")
@@ -172,6 +199,52 @@ class YAMLBacktestService:
                 'backtest_result': None
             }
 
+    def _package_results(self,
+                         strategy: LoadedStrategy,
+                         execution_results: Optional[Dict[str, Any]],
+                         backtest_result: BacktestResult,
+                         backtest_config: BacktestConfig,
+                         start_time: datetime,
+                         store_results: bool,
+                         cached: bool = False) -> Dict[str, Any]:
+        """
+        Package backtest results (and store them in MongoDB if enabled)
+
+        Args:
+            strategy: Loaded strategy
+            execution_results: Signal generation results (None for cached results)
+            backtest_result: Backtest result from engine or cache
+            backtest_config: Backtest configuration used
+            start_time: Request start time
+            store_results: Whether to store results in MongoDB
+            cached: Result came from BacktestResultCache
+
+        Returns:
+            Dictionary with complete backtest results
+        """
+        execution_time = (datetime.now() - start_time).total_seconds()
+
+        results = {
+            'success': True,
+            'strategy': strategy,
+            'strategy_name': strategy.name,
+            'strategy_version': strategy.version,
+            'execution_results': execution_results,
+            'backtest_result': backtest_result,
+            'execution_time': execution_time,
+            'backtest_config': backtest_config,
+            'cached': cached,
+            'errors': []
+        }
+
+        # Store results in MongoDB (if enabled)
+        if store_results:
+            logger.info("Storing results in MongoDB...")
+            self._store_backtest_results(strategy, backtest_result, results)
+
+        logger.info(f"[OK] Backtest completed in {execution_time:.2f}s")
+        return results
+
     def _convert_signals_to_backtest_format(self,
                                            execution_results: Dict[str, Any],
                                            original_data: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
@@ -0,0 +1,65 @@
+"""
+Candidate Ranking - Strategy Layer Implementation
+
+매수 후보 상위 K개 선정용 순위 함수.
+전략 레이어(position_sizing_service)와 서비스 레이어(백테스트 커널/실행 서비스)가 함께 사용한다.
+
+전체 정렬 대신 np.argpartition으로 상위 K개만 골라 정렬하며,
+동률은 항상 입력 순서(낮은 인덱스 우선)로 정해 결과가 재현 가능하다.
+NaN은 가장 낮은 값으로 취급한다.
+"""
+
+import numpy as np
+from typing import List, Sequence
+
+
+def top_k_indices(values, k: int, descending: bool = True) -> np.ndarray:
+    """
+    상위 K개 인덱스 (순위 순서)
+
+    Args:
+        values: 1차원 점수 배열
+        k: 선택 개수 (len(values) 이상이면 전체 순위)
+        descending: True면 큰 값이 상위
+
+    Returns:
+        순위 순서의 인덱스 배열 (동률은 인덱스 오름차순)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    k = max(min(int(k), n), 0)
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+
+    # 작은 key가 상위가 되도록 변환 (NaN은 최하위)
+    keys = -values if descending else values.copy()
+    keys[np.isnan(keys)] = np.inf
+
+    if k < n:
+        # K번째 key 경계: 경계보다 작은 것은 모두, 경계와 같은 것은 인덱스 순으로 부족분만
+        kth = np.partition(keys, k - 1)[k - 1]
+        better = np.flatnonzero(keys < kth)
+        ties = np.flatnonzero(keys == kth)[:k - len(better)]
+        selected = np.concatenate([better, ties])
+    else:
+        selected = np.arange(n)
+
+    # 선택된 K개만 (key, 인덱스) 순 정렬
+    return selected[np.lexsort((selected, keys[selected]))]
+
+
+def rank_descending(values) -> np.ndarray:
+    """
+    내림차순 순위 (1 = 최대값, 동률은 입력 순서)
+
+    Strategy_M.select_candidate_stocks_multi의 rank_desc와 같은 1부터 시작하는 순위.
+    """
+    order = top_k_indices(values, len(values), descending=True)
+    ranks = np.empty(len(order), dtype=np.int64)
+    ranks[order] = np.arange(1, len(order) + 1)
+    return ranks
+
+
+def select_top_k(items: Sequence, values, k: int, descending: bool = True) -> List:
+    """items 중 values 기준 상위 K개 (순위 순서)"""
+    return [items[i] for i in top_k_indices(values, k, descending)]
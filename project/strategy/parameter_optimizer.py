@@ -4,6 +4,17 @@ Parameter Optimizer - Strategy Agent Management
 Optimizes strategy parameters using grid search and backtest results.
 Finds optimal parameter combinations for YAML strategies.
 
+- The base YAML is parsed once; each combination is applied to a deep copy of
+  the parsed dictionary (no YAML dump/parse per combination)
+- Indicator columns required by any combination are calculated once up front
+  and shared by every backtest
+- parallel=True runs combinations in a process pool (data handed to each
+  worker once at start-up, tasks carry only the parameter dict)
+- Backtests already in the service's BacktestResultCache (if any) are not re-run;
+  the data fingerprint of each evaluation window is hashed once, not per combination
+- search='halving' runs successive halving: all combinations on a short
+  leading window, keeping the best 1/eta on progressively longer windows
+
 Owner: Strategy Agent
 """
 
@@ -12,14 +23,16 @@ import numpy as np
 import logging
 import yaml
 import copy
+import math
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime
 from itertools import product
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor
 import multiprocessing
 
 from project.service.yaml_backtest_service import YAMLBacktestService
+from project.service.backtest_result_cache import BacktestResultCache, data_fingerprint
 from project.strategy.yaml_strategy_loader import YAMLStrategyLoader
 
 logger = logging.getLogger(__name__)
@@ -63,7 +76,10 @@ class ParameterOptimizer:
                 parameter_ranges: Dict[str, List[Any]],
                 optimization_metric: str = 'sharpe_ratio',
                 top_n: int = 10,
-                parallel: bool = False) -> Dict[str, Any]:
+                parallel: bool = False,
+                search: str = 'grid',
+                halving_eta: int = 3,
+                min_window: int = 60) -> Dict[str, Any]:
         """
         Optimize strategy parameters
 
@@ -75,19 +91,27 @@ class ParameterOptimizer:
             optimization_metric: Metric to optimize ('sharpe_ratio', 'total_return', 'max_drawdown')
             top_n: Number of top results to return
             parallel: Use parallel processing
+            search: 'grid' (every combination on the full period) or
+                    'halving' (successive halving over growing leading windows)
+            halving_eta: Fraction of combinations kept per halving round (1/eta)
+            min_window: Minimum window length (trading days) of the first halving round
 
         Returns:
             Dictionary with optimization results
         """
+        if search not in ('grid', 'halving'):
+            raise ValueError(f"Unknown search mode: {search}")
+
         start_time = datetime.now()
 
         logger.info(f"Starting parameter optimization for: {yaml_path}")
         logger.info(f"Parameter ranges: {parameter_ranges}")
         logger.info(f"Optimization metric: {optimization_metric}")
 
-        # Load base strategy
+        # Load base strategy (YAML parsed once)
+        base_dict = self._load_yaml_dict(yaml_path)
         loader = YAMLStrategyLoader()
-        success, base_strategy, errors = loader.load_from_file(yaml_path)
+        success, base_strategy, errors = loader.load_from_dict(copy.deepcopy(base_dict))
 
         if not success:
             raise ValueError(f"Could not load base strategy: {errors}")
@@ -96,15 +120,23 @@ class ParameterOptimizer:
         param_combinations = self._generate_combinations(parameter_ranges)
         logger.info(f"Total combinations to test: {len(param_combinations)}")
 
-        # Run backtests for each combination
-        if parallel and self.max_workers > 1:
-            results = self._run_parallel_backtests(
-                yaml_path, data, param_combinations
-            )
+        # Indicators shared by all combinations - calculated once
+        data = self._precompute_indicators(base_dict, data, param_combinations)
+
+        halving_rounds = []
+        eliminated = []
+        if parallel and self.max_workers > 1 and len(param_combinations) > 1:
+            max_workers = min(self.max_workers, len(param_combinations))
+            with ProcessPoolExecutor(max_workers=max_workers,
+                                     initializer=_init_optimizer_worker,
+                                     initargs=(base_dict, data, self.backtest_service.result_cache)) as executor:
+                run = lambda combos, cutoff: self._run_parallel_backtests(executor, data, combos, cutoff)
+                results = self._search(run, data, param_combinations, optimization_metric,
+                                       search, halving_eta, min_window, halving_rounds, eliminated)
         else:
-            results = self._run_sequential_backtests(
-                yaml_path, data, param_combinations
-            )
+            run = lambda combos, cutoff: self._run_sequential_backtests(base_dict, data, combos, cutoff)
+            results = self._search(run, data, param_combinations, optimization_metric,
+                                   search, halving_eta, min_window, halving_rounds, eliminated)
 
         # Sort results by optimization metric
         results_sorted = self._sort_results(results, optimization_metric)
@@ -120,9 +152,12 @@ class ParameterOptimizer:
             'parameter_ranges': parameter_ranges,
             'total_combinations': len(param_combinations),
             'optimization_metric': optimization_metric,
+            'search': search,
             'top_n': top_n,
             'top_results': top_results,
             'all_results': results_sorted,
+            'halving_rounds': halving_rounds,
+            'eliminated_results': eliminated,
             'execution_time': execution_time,
             'best_parameters': top_results[0]['parameters'] if top_results else None,
             'best_performance': top_results[0]['performance'] if top_results else None
@@ -155,84 +190,223 @@ class ParameterOptimizer:
 
         return combinations
 
+    def _search(self, run, data: Dict[str, pd.DataFrame], param_combinations: List[Dict],
+                metric: str, search: str, eta: int, min_window: int,
+                halving_rounds: List[Dict], eliminated: List[Dict]) -> List[Dict]:
+        """
+        Run grid search or successive halving
+
+        Args:
+            run: Callable (combinations, cutoff) -> results (cutoff None = full period)
+            data: Market data (indicators already calculated)
+            param_combinations: All combinations
+            metric: Optimization metric
+            search: 'grid' or 'halving'
+            eta: Halving factor
+            min_window: Minimum first-round window (trading days)
+            halving_rounds: Filled with per-round summaries
+            eliminated: Filled with results of combinations dropped before the final round
+
+        Returns:
+            Results of the final (full-period) round
+        """
+        if search == 'grid':
+            return run(param_combinations, None)
+
+        cutoffs = self._halving_cutoffs(data, len(param_combinations), eta, min_window)
+        candidates = param_combinations
+
+        for round_index, cutoff in enumerate(cutoffs):
+            results = run(candidates, cutoff)
+            round_info = {
+                'round': round_index,
+                'window_end': cutoff,
+                'evaluated': len(candidates)
+            }
+
+            if cutoff is None:
+                round_info['kept'] = len(candidates)
+                halving_rounds.append(round_info)
+                return results
+
+            # Keep the best 1/eta (failed runs are always dropped)
+            ranked = self._sort_results(results, metric)
+            keep = max(1, math.ceil(len(candidates) / eta))
+            survivors = ranked[:keep]
+
+            kept_ids = {id(result) for result in survivors}
+            for result in results:
+                if id(result) not in kept_ids:
+                    eliminated.append({**result, 'eliminated_round': round_index, 'window_end': cutoff})
+
+            round_info['kept'] = len(survivors)
+            halving_rounds.append(round_info)
+            logger.info(f"Halving round {round_index}: window end {cutoff.date()}, "
+                        f"{len(candidates)} -> {len(survivors)} combinations")
+
+            if not survivors:
+                return []
+            candidates = [result['parameters'] for result in survivors]
+
+        return []
+
+    def _halving_cutoffs(self, data: Dict[str, pd.DataFrame], n_combinations: int,
+                        eta: int, min_window: int) -> List[Optional[pd.Timestamp]]:
+        """
+        Window end dates for successive halving (last entry None = full period)
+
+        Round i of s uses the leading len/eta^(s-i) trading days (at least min_window),
+        where s is the number of rounds needed to narrow n_combinations down to one.
+        """
+        if eta < 2:
+            raise ValueError(f"halving_eta must be >= 2: {eta}")
+
+        dates = pd.DatetimeIndex(sorted(set().union(*(df.index for df in data.values())))) \
+            if data else pd.DatetimeIndex([])
+        # floor(log_eta(n)) with integers (math.log(243, 3) = 4.999...)
+        rounds = 0
+        while eta ** (rounds + 1) <= n_combinations:
+            rounds += 1
+
+        cutoffs = []
+        for i in range(rounds):
+            window = max(min_window, len(dates) // eta ** (rounds - i))
+            if window >= len(dates):
+                break
+            cutoff = dates[window - 1]
+            if not cutoffs or cutoff != cutoffs[-1]:
+                cutoffs.append(cutoff)
+
+        cutoffs.append(None)
+        return cutoffs
+
+    def _precompute_indicators(self, base_dict: Dict, data: Dict[str, pd.DataFrame],
+                               param_combinations: List[Dict]) -> Dict[str, pd.DataFrame]:
+        """
+        Calculate every indicator column used by any combination once
+
+        Indicator values depend only on the column name (e.g. RSI_14), so a column
+        shared by several combinations is calculated a single time. Works on copies;
+        the caller's DataFrames are not modified.
+
+        Returns:
+            New data dictionary with indicator columns added
+        """
+        calculator = self.backtest_service.executor.calculator
+
+        required = []
+        for params in param_combinations or [{}]:
+            strategy_dict = self._apply_parameters(base_dict, params)
+            for indicator in strategy_dict.get('indicators', []) or []:
+                column = indicator.get('output_column')
+                if column and column not in required:
+                    required.append(column)
+
+        prepared = {}
+        for symbol, df in data.items():
+            df = df.copy()
+            missing = [column for column in required if column not in df.columns]
+            if missing and calculator is not None:
+                calculator.calculate_missing_indicators(df, missing, inplace=True)
+            prepared[symbol] = df
+
+        logger.info(f"Prepared {len(required)} indicator columns for {len(prepared)} symbols")
+        return prepared
+
     def _run_sequential_backtests(self,
-                                  yaml_path: str,
+                                  base_dict: Dict,
                                   data: Dict[str, pd.DataFrame],
-                                  param_combinations: List[Dict]) -> List[Dict]:
+                                  param_combinations: List[Dict],
+                                  cutoff: Optional[pd.Timestamp] = None) -> List[Dict]:
         """
         Run backtests sequentially
 
         Args:
-            yaml_path: Base YAML path
+            base_dict: Parsed base strategy dictionary
             data: Market data
             param_combinations: List of parameter combinations
+            cutoff: Last date of the evaluation window (None = full period)
 
         Returns:
             List of result dictionaries
         """
         results = []
+        window_data = self._slice_window(data, cutoff)
+        fingerprint = self._window_fingerprint(window_data)
 
         for i, params in enumerate(param_combinations):
             logger.info(f"Testing combination {i+1}/{len(param_combinations)}: {params}")
-
-            try:
-                result = self._run_single_backtest(yaml_path, data, params)
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Error testing {params}: {e}")
-                results.append({
-                    'parameters': params,
-                    'performance': {},
-                    'error': str(e)
-                })
+            results.append(self._evaluate_combination(base_dict, window_data, params, fingerprint))
 
         return results
 
     def _run_parallel_backtests(self,
-                                yaml_path: str,
+                                executor: ProcessPoolExecutor,
                                 data: Dict[str, pd.DataFrame],
-                                param_combinations: List[Dict]) -> List[Dict]:
+                                param_combinations: List[Dict],
+                                cutoff: Optional[pd.Timestamp] = None) -> List[Dict]:
         """
         Run backtests in parallel
 
+        Workers already hold the base strategy and market data (see
+        _init_optimizer_worker); each task sends only (parameters, cutoff,
+        window data fingerprint).
+
         Args:
-            yaml_path: Base YAML path
-            data: Market data
+            executor: Process pool initialized with _init_optimizer_worker
+            data: Market data the workers were initialized with
             param_combinations: List of parameter combinations
+            cutoff: Last date of the evaluation window (None = full period)
 
         Returns:
-            List of result dictionaries
+            List of result dictionaries (same order as param_combinations)
         """
-        results = []
-
-        # Note: Parallel processing with DataFrames can be complex
-        # For simplicity, we'll run sequentially for now
-        # A production implementation would serialize data or use shared memory
-
-        logger.warning("Parallel processing not fully implemented - using sequential")
-        return self._run_sequential_backtests(yaml_path, data, param_combinations)
+        chunksize = max(1, len(param_combinations) // (self.max_workers * 4))
+        fingerprint = self._window_fingerprint(self._slice_window(data, cutoff))
+        tasks = [(params, cutoff, fingerprint) for params in param_combinations]
+
+        logger.info(f"Testing {len(tasks)} combinations on {self.max_workers} workers")
+        return list(executor.map(_optimizer_task, tasks, chunksize=chunksize))
+
+    def _window_fingerprint(self, window_data: Dict[str, pd.DataFrame]) -> Optional[Dict[str, str]]:
+        """Result-cache data fingerprint of one evaluation window (None without a cache)"""
+        if self.backtest_service.result_cache is None:
+            return None
+        return data_fingerprint(window_data)
+
+    def _evaluate_combination(self, base_dict: Dict, data: Dict[str, pd.DataFrame],
+                              params: Dict, fingerprint: Optional[Dict[str, str]] = None) -> Dict:
+        """Run one combination, returning an error result instead of raising"""
+        try:
+            return self._run_single_backtest(base_dict, data, params, fingerprint)
+        except Exception as e:
+            logger.error(f"Error testing {params}: {e}")
+            return {
+                'parameters': params,
+                'performance': {},
+                'error': str(e)
+            }
 
     def _run_single_backtest(self,
-                            yaml_path: str,
+                            base_dict: Dict,
                             data: Dict[str, pd.DataFrame],
-                            parameters: Dict) -> Dict:
+                            parameters: Dict,
+                            fingerprint: Optional[Dict[str, str]] = None) -> Dict:
         """
         Run backtest with specific parameters
 
         Args:
-            yaml_path: Base YAML path
+            base_dict: Parsed base strategy dictionary
             data: Market data
             parameters: Parameter dictionary
+            fingerprint: Precomputed data fingerprint of data (result cache key)
 
         Returns:
             Result dictionary
         """
-        # Modify YAML with new parameters
-        modified_yaml_content = self._apply_parameters_to_yaml(yaml_path, parameters)
-
-        # Create temporary modified strategy
-        loader = YAMLStrategyLoader()
-        success, strategy, errors = loader.load_from_string(modified_yaml_content)
+        # Create modified strategy from the parsed dictionary
+        loader = self.backtest_service.loader
+        success, strategy, errors = loader.load_from_dict(self._apply_parameters(base_dict, parameters))
 
         if not success:
             raise ValueError(f"Could not load modified strategy: {errors}")
@@ -241,7 +415,8 @@ class ParameterOptimizer:
         backtest_results = self.backtest_service.backtest_strategy(
             strategy=strategy,
             data=data,
-            store_results=False  # Don't store intermediate results
+            store_results=False,  # Don't store intermediate results
+            data_fingerprint=fingerprint
         )
 
         if not backtest_results['success']:
@@ -258,6 +433,27 @@ class ParameterOptimizer:
             'strategy_name': strategy.name
         }
 
+    @staticmethod
+    def _slice_window(data: Dict[str, pd.DataFrame],
+                      cutoff: Optional[pd.Timestamp]) -> Dict[str, pd.DataFrame]:
+        """Leading window of the market data (up to and including cutoff)"""
+        if cutoff is None:
+            return data
+        return {symbol: df.loc[:cutoff] for symbol, df in data.items()}
+
+    def _load_yaml_dict(self, yaml_path: str) -> Dict:
+        """Parse base YAML file once"""
+        with open(yaml_path, 'r', encoding='utf-8') as f:
+            return yaml.safe_load(f)
+
+    def _apply_parameters(self, base_dict: Dict, parameters: Dict) -> Dict:
+        """Deep copy of the parsed strategy with parameter modifications applied"""
+        strategy_dict = copy.deepcopy(base_dict)
+        for param_path, value in parameters.items():
+            # Parse parameter path (e.g., "entry.conditions.0.rules.0.value")
+            self._set_nested_value(strategy_dict, param_path, value)
+        return strategy_dict
+
     def _apply_parameters_to_yaml(self, yaml_path: str, parameters: Dict) -> str:
         """
         Apply parameter modifications to YAML content
@@ -269,14 +465,7 @@ class ParameterOptimizer:
         Returns:
             Modified YAML content as string
         """
-        # Load YAML
-        with open(yaml_path, 'r', encoding='utf-8') as f:
-            yaml_content = yaml.safe_load(f)
-
-        # Apply parameter modifications
-        for param_path, value in parameters.items():
-            # Parse parameter path (e.g., "entry.conditions.0.rules.0.value")
-            self._set_nested_value(yaml_content, param_path, value)
+        yaml_content = self._apply_parameters(self._load_yaml_dict(yaml_path), parameters)
 
         # Convert back to YAML string
         return yaml.dump(yaml_content, default_flow_style=False)
@@ -357,6 +546,34 @@ class ParameterOptimizer:
         logger.info(f"[OK] Created optimized YAML: {output_path}")
 
 
+# ===== OPTIMIZATION WORKER (process pool) =====
+_worker_optimizer: Optional[ParameterOptimizer] = None
+_worker_context: Optional[Tuple[Dict, Dict[str, pd.DataFrame]]] = None
+_worker_windows: Dict[Optional[pd.Timestamp], Dict[str, pd.DataFrame]] = {}
+
+
+def _init_optimizer_worker(base_dict: Dict, data: Dict[str, pd.DataFrame],
+                           result_cache: Optional[BacktestResultCache] = None):
+    """Worker start-up: keep base strategy and prepared market data (received once)"""
+    global _worker_optimizer, _worker_context
+    logging.getLogger('project').setLevel(logging.WARNING)
+    # Results are never stored from workers, so no MongoDB connection is opened
+    _worker_optimizer = ParameterOptimizer(
+        backtest_service=YAMLBacktestService(result_cache=result_cache), max_workers=1
+    )
+    _worker_context = (base_dict, data)
+
+
+def _optimizer_task(task: Tuple[Dict, Optional[pd.Timestamp], Optional[Dict[str, str]]]) -> Dict:
+    """Run one (parameters, cutoff, fingerprint) task -> result dictionary"""
+    params, cutoff, fingerprint = task
+    base_dict, data = _worker_context
+    window_data = _worker_windows.get(cutoff)
+    if window_data is None:
+        window_data = _worker_windows[cutoff] = ParameterOptimizer._slice_window(data, cutoff)
+    return _worker_optimizer._evaluate_combination(base_dict, window_data, params, fingerprint)
+
+
 if __name__ == "__main__":
     # Setup logging
     logging.basicConfig(
@@ -15,6 +15,8 @@ import logging
 from dataclasses import dataclass
 from enum import Enum
 
+from project.strategy.candidate_ranking import rank_descending, select_top_k
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -325,24 +327,18 @@ class PositionSizingService:
             # 최종 후보 마스크
             final_mask = signal_mask & price_mask
 
-            # 후보 종목 추출
-            candidate_stocks = np.array(stock_list)[final_mask]
-            candidate_metrics = sorting_metric[final_mask]
-
             # 현재 보유 종목 제외
-            filtered_candidates = [
-                (stock, metric)
-                for stock, metric in zip(candidate_stocks, candidate_metrics)
-                if stock not in current_positions
-            ]
+            stocks = np.array(stock_list)
+            final_mask &= ~np.isin(stocks, list(current_positions))
 
-            # 정렬 기준 지표 기준 내림차순 정렬
-            sorted_candidates = sorted(filtered_candidates, key=lambda x: x[1], reverse=True)
-            final_candidates = [stock for stock, _ in sorted_candidates]
+            # 후보 종목 추출
+            candidate_stocks = stocks[final_mask]
+            candidate_metrics = np.asarray(sorting_metric, dtype=np.float64)[final_mask]
 
-            # 매수 가능한 종목 수만큼 선택
+            # 매수 가능한 종목 수만큼 정렬 기준 지표 내림차순 상위 K 선택 (동률은 입력 순서)
             available_positions = self.max_stock_list - position_count
-            selected_candidates = final_candidates[:int(available_positions)]
+            selected_candidates = [str(stock) for stock in
+                                   select_top_k(candidate_stocks, candidate_metrics, int(available_positions))]
 
             return selected_candidates, len(selected_candidates)
 
@@ -365,47 +361,26 @@ class PositionSizingService:
             (후보 종목 리스트, 후보 종목 수)
         """
         try:
-            # 매수 신호가 있는 종목 선택
-            signal_mask = buy_signals == 1
-            candidate_stocks = np.array(stock_list)[signal_mask]
-            candidate_rev = rev_growth[signal_mask]
-            candidate_eps = eps_growth[signal_mask]
-
-            # 현재 보유 종목 제외
-            filtered_candidates = [
-                (stock, rev, eps)
-                for stock, rev, eps in zip(candidate_stocks, candidate_rev, candidate_eps)
-                if stock not in current_positions
-            ]
+            # 매수 신호가 있고 현재 보유 중이 아닌 종목 선택
+            stocks = np.array(stock_list)
+            signal_mask = (buy_signals == 1) & ~np.isin(stocks, list(current_positions))
+            candidate_stocks = stocks[signal_mask]
 
-            if len(filtered_candidates) > 0:
-                # 각 지표별 순위 계산
-                rev_values = np.array([item[1] for item in filtered_candidates])
-                eps_values = np.array([item[2] for item in filtered_candidates])
-
-                def rank_descending(arr):
-                    """내림차순 순위 계산"""
-                    order = np.argsort(-arr)
-                    ranks = np.empty_like(order)
-                    ranks[order] = np.arange(1, len(arr) + 1)
-                    return ranks
+            # 매수 가능한 종목 수
+            available_positions = self.max_stock_list - position_count
 
-                rev_ranks = rank_descending(rev_values)
-                eps_ranks = rank_descending(eps_values)
+            if len(candidate_stocks) > 0:
+                # 각 지표별 내림차순 순위 (동률은 입력 순서)
+                rev_ranks = rank_descending(rev_growth[signal_mask])
+                eps_ranks = rank_descending(eps_growth[signal_mask])
 
-                # 순위 합계 계산 (낮을수록 좋음)
+                # 순위 합계(낮을수록 좋음) 기준 상위 K 선택
                 total_ranks = rev_ranks + eps_ranks
-
-                # 순위 합계 기준 오름차순 정렬
-                sorted_indices = np.argsort(total_ranks)
-                sorted_candidates = [filtered_candidates[i] for i in sorted_indices]
-                final_candidates = [stock for stock, _, _ in sorted_candidates]
+                selected_candidates = [str(stock) for stock in
+                                       select_top_k(candidate_stocks, total_ranks, int(available_positions),
+                                                    descending=False)]
             else:
-                final_candidates = []
-
-            # 매수 가능한 종목 수만큼 선택
-            available_positions = self.max_stock_list - position_count
-            selected_candidates = final_candidates[:int(available_positions)]
+                selected_candidates = []
 
             return selected_candidates, len(selected_candidates)
 
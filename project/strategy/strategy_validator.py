@@ -385,8 +385,6 @@ class StrategyValidator:
         Returns:
             Tuple of (is_valid, error_messages, parsed_strategy)
         """
-        errors = []
-
         # Parse YAML string
         try:
             strategy = yaml.safe_load(yaml_string)
@@ -394,6 +392,20 @@ class StrategyValidator:
             error_msg = f"YAML parsing error: {e}"
             return False, [error_msg], None
 
+        return self.validate_dict(strategy)
+
+    def validate_dict(self, strategy: Dict) -> Tuple[bool, List[str], Optional[Dict]]:
+        """
+        Validate an already-parsed strategy dictionary (no YAML round trip)
+
+        Args:
+            strategy: Strategy dictionary (e.g. yaml.safe_load output)
+
+        Returns:
+            Tuple of (is_valid, error_messages, parsed_strategy)
+        """
+        errors = []
+
         # Validate schema
         is_valid, schema_errors = self._validate_schema(strategy)
         errors.extend(schema_errors)
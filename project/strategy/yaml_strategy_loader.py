@@ -227,6 +227,32 @@ class YAMLStrategyLoader:
         except Exception as e:
             return False, None, [str(e)]
 
+    def load_from_dict(self, strategy_dict: Dict) -> Tuple[bool, Optional[LoadedStrategy], List[str]]:
+        """
+        Load strategy from an already-parsed dictionary
+
+        Used when many variants of one strategy are built in memory
+        (e.g. parameter optimization) to skip YAML dump/parse per variant.
+
+        Args:
+            strategy_dict: Strategy dictionary
+
+        Returns:
+            Tuple of (success, loaded_strategy, error_messages)
+        """
+        # Validate
+        is_valid, errors, strategy_dict = self.validator.validate_dict(strategy_dict)
+
+        if not is_valid:
+            return False, None, errors
+
+        # Parse
+        try:
+            loaded_strategy = self._parse_strategy(strategy_dict)
+            return True, loaded_strategy, []
+        except Exception as e:
+            return False, None, [str(e)]
+
     def _parse_strategy(self, strategy_dict: Dict) -> LoadedStrategy:
         """
         Parse strategy dictionary into LoadedStrategy object
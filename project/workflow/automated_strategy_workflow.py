@@ -23,6 +23,7 @@ import pandas as pd
 from project.strategy.strategy_generator import StrategyGenerator
 from project.strategy.yaml_strategy_loader import YAMLStrategyLoader
 from project.service.yaml_backtest_service import YAMLBacktestService
+from project.service.backtest_result_cache import BacktestResultCache
 from project.reporting.strategy_report_generator import StrategyReportGenerator
 
 logger = logging.getLogger(__name__)
@@ -48,7 +49,8 @@ class AutomatedStrategyWorkflow:
     def __init__(
         self,
         strategy_output_dir: Optional[str] = None,
-        report_output_dir: Optional[str] = None
+        report_output_dir: Optional[str] = None,
+        result_cache: Optional[BacktestResultCache] = None
     ):
         """
         Initialize Automated Workflow
@@ -56,10 +58,11 @@ class AutomatedStrategyWorkflow:
         Args:
             strategy_output_dir: Directory to save generated strategies
             report_output_dir: Directory to save reports
+            result_cache: Backtest result cache (identical re-runs skip simulation)
         """
         self.generator = StrategyGenerator(output_dir=strategy_output_dir)
         self.loader = YAMLStrategyLoader()
-        self.backtest_service = YAMLBacktestService()
+        self.backtest_service = YAMLBacktestService(result_cache=result_cache)
         self.report_generator = StrategyReportGenerator(output_dir=report_output_dir)
 
         logger.info("Initialized AutomatedStrategyWorkflow")